@@ -0,0 +1,54 @@
+"""
+In-process HTTP clients for the benchmarks.
+
+`wsgi_get` calls a WSGI application directly (run it on a thread pool to
+emulate a threaded worker) and `asgi_get` sends a raw ASGI http scope, so a
+run measures Django and the database rather than a network stack.
+"""
+import asyncio
+import io
+import sys
+from urllib.parse import urlsplit
+
+def wsgi_get(app, url, headers=None):
+    parts = urlsplit(url)
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': parts.path, 'QUERY_STRING': parts.query,
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': 'localhost',
+        'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    for name, value in (headers or {}).items():
+        environ['HTTP_' + name.upper().replace('-', '_')] = value
+    statuses = []
+    body = app(environ, lambda status, headers, exc_info=None: statuses.append(int(status.split()[0])))
+    try:
+        for _ in body:
+            pass
+    finally:
+        body.close()
+    return statuses[0]
+
+async def asgi_get(app, url, headers=None):
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': parts.path, 'raw_path': parts.path.encode(), 'query_string': parts.query.encode(), 'root_path': '',
+        'headers': [(b'host', b'localhost')] + [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+    }
+    requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    statuses = []
+    
+    async def receive():
+        if requests:
+            return requests.pop()
+        # The client never disconnects
+        return await asyncio.Future()
+    
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+    
+    await app(scope, receive, send)
+    return statuses[0]
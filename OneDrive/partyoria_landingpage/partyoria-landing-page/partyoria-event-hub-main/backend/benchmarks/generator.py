@@ -0,0 +1,240 @@
+"""
+Deterministic synthetic data for benchmarks.
+
+`generate()` bulk-inserts users, venues (an events.Venue and a
+venues.VenueDetails row each) spread over every city in LOCATIONS_DATA,
+events with guests, and media rows. The same seed and sizes always produce
+the same rows. bulk_create skips Model.save() and signals, so the derived
+columns and RSVP counters are filled in here, and the stats rollup, search
+index, popularity rollup and caches are rebuilt once at the end.
+
+Generated rows are marked (usernames start with USERNAME_PREFIX, venue
+images with IMAGE_PREFIX) so `clear()` removes them and nothing else.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from events import stats
+from events.facets import facet_index
+from events.models import Event, EventGuest, Venue
+from locations.catalog import location_catalog, resolve_city, resolve_location_text
+from locations.data import LOCATIONS_DATA
+from locations.models import Location
+from locations.popularity import refresh_popularity
+from media_uploads.models import MediaUpload
+from partyoria_backend import geo
+from partyoria_backend.pricing import parse_price_range
+from partyoria_backend.response_cache import invalidate_tags
+from users.models import User
+from venues.models import VenueDetails
+from venues.search import rebuild_index
+
+USERNAME_PREFIX = 'bench-'
+IMAGE_PREFIX = 'https://images.example.com/bench/'
+PASSWORD = 'bench-password'
+BASE_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+VENUE_TYPES = ['Banquet Hall', 'Garden Venue', 'Hotel', 'Beach Resort', 'Conference Center', 'Rooftop', 'Farmhouse']
+VENUE_WORDS = ['Grand', 'Royal', 'Sunset', 'Heritage', 'Lotus', 'Emerald', 'Silver', 'Palm', 'Orchid', 'Crystal']
+AREAS = ['Downtown', 'Old Town', 'Lake View', 'Ring Road', 'Station Road', 'Civil Lines', 'MG Road', 'Hill Side']
+SUITABILITY = ['Weddings', 'Corporate Events', 'Birthday Parties', 'Anniversaries', 'Festivals', 'Conferences']
+BADGES = ['Premium', 'AC', 'Parking', 'Garden', 'Catering', 'Decoration', 'Luxury', 'Outdoor', 'Valet']
+ROLES = [role for role, _ in User.ROLE_CHOICES]
+EVENT_TYPES = [event_type for event_type, _ in Event.EVENT_TYPES]
+EVENT_STATUSES = [status for status, _ in Event.STATUS_CHOICES]
+RSVP_STATUSES = ['accepted', 'pending', 'declined']
+RSVP_WEIGHTS = [5, 3, 2]
+MEDIA_TYPES = {'image': 'jpg', 'video': 'mp4', 'document': 'pdf'}
+
+def cities():
+    return [(state, city) for state, state_cities in LOCATIONS_DATA.items() for city in state_cities]
+
+def city_centers(rng):
+    """A made-up centre inside India for every city, so nearby queries have neighbours"""
+    return {city: (round(rng.uniform(8.5, 32.5), 6), round(rng.uniform(69.0, 94.0), 6)) for _, city in cities()}
+
+def ensure_locations():
+    Location.objects.bulk_create(
+        [Location(state=state, city=city) for state, city in cities()], ignore_conflicts=True, batch_size=1000
+    )
+    location_catalog.invalidate()
+
+def build_users(rng, count):
+    # Hashing once keeps generation fast; every generated user logs in with PASSWORD
+    password = make_password(PASSWORD)
+    users = []
+    for i in range(count):
+        username = f'{USERNAME_PREFIX}user-{i:06d}'
+        users.append(User(
+            username=username,
+            email=f'{username}@example.com',
+            password=password,
+            first_name=f'User{i}',
+            # The first user is staff so the harness can reach the admin-only endpoints
+            role='organizer' if i == 0 else rng.choice(ROLES),
+            is_staff=i == 0,
+            phone=f'9{rng.randrange(10 ** 9):09d}',
+        ))
+    return users
+
+def build_venues(rng, count, centers):
+    all_cities = cities()
+    venues = []
+    details = []
+    for i in range(count):
+        _, city = all_cities[i % len(all_cities)]
+        lat, lng = centers[city]
+        lat = round(lat + rng.uniform(-0.15, 0.15), 6)
+        lng = round(lng + rng.uniform(-0.15, 0.15), 6)
+        low = rng.randrange(10, 200) * 1000
+        price = f'₹{low:,} - ₹{low + rng.randrange(5, 100) * 1000:,}'
+        name = f'{rng.choice(VENUE_WORDS)} {rng.choice(VENUE_TYPES)} {i}'
+        area = rng.choice(AREAS)
+        image = f'{IMAGE_PREFIX}venues/{i:06d}.jpg'
+    
+        venue = Venue(
+            name=name,
+            type=rng.choice(VENUE_TYPES),
+            location=area,
+            city=city,
+            price=price,
+            latitude=lat,
+            longitude=lng,
+            rating=Decimal(rng.randrange(30, 51)) / 10,
+            reviews=rng.randrange(500),
+            image=image,
+            suitability=rng.sample(SUITABILITY, rng.randrange(1, 4)),
+            badges=rng.sample(BADGES, rng.randrange(1, 4)),
+        )
+        venue.city_location_id = resolve_city(city)
+        venue.price_min, venue.price_max = parse_price_range(price)
+        venue.geocell = geo.cell_for(lat, lng)
+        venues.append(venue)
+    
+        detail = VenueDetails(
+            venue_name=name,
+            location=f'{area}, {city}',
+            capacity=rng.randrange(50, 2000, 50),
+            price_range=price,
+            latitude=lat,
+            longitude=lng,
+            image_url=image,
+            description=f'{name} in {area}, {city}.',
+        )
+        detail.city_location_id = resolve_location_text(detail.location)
+        detail.price_min, detail.price_max = parse_price_range(price)
+        detail.geocell = geo.cell_for(lat, lng)
+        details.append(detail)
+    return venues, details
+
+def build_events(rng, count, guests_per_event, users, venues):
+    """Events with their guests; the RSVP counters are set from the guests as they are built"""
+    events = []
+    guests = []
+    for i in range(count):
+        venue = venues[rng.randrange(len(venues))]
+        event = Event(
+            title=f'{rng.choice(EVENT_TYPES).title()} {i}',
+            description=f'Synthetic event {i}',
+            event_type=rng.choice(EVENT_TYPES),
+            status=rng.choice(EVENT_STATUSES),
+            date=BASE_DATE + timedelta(days=rng.randrange(730), hours=rng.randrange(9, 22)),
+            location=f'{venue.name}, {venue.city}',
+            budget=Decimal(rng.randrange(50, 5000) * 1000),
+            attendees_count=rng.randrange(10, 1000),
+            organizer=users[rng.randrange(len(users))],
+        )
+        event_guests = []
+        for j in range(guests_per_event):
+            rsvp_status = rng.choices(RSVP_STATUSES, RSVP_WEIGHTS)[0]
+            setattr(event, f'rsvp_{rsvp_status}', getattr(event, f'rsvp_{rsvp_status}') + 1)
+            event_guests.append(EventGuest(
+                name=f'Guest {j}',
+                email=f'guest-{i:06d}-{j:04d}@example.com',
+                phone=f'8{rng.randrange(10 ** 9):09d}',
+                rsvp_status=rsvp_status,
+            ))
+        events.append(event)
+        guests.append(event_guests)
+    return events, guests
+
+def build_media(rng, count, users, events):
+    media = []
+    for i in range(count):
+        media_type = rng.choice(list(MEDIA_TYPES))
+        media.append(MediaUpload(
+            title=f'Media {i}',
+            file=f'uploads/bench/{i:06d}.{MEDIA_TYPES[media_type]}',
+            media_type=media_type,
+            file_size=rng.randrange(10_000, 5_000_000),
+            uploaded_by=users[rng.randrange(len(users))],
+            event=events[rng.randrange(len(events))] if events and rng.random() < 0.7 else None,
+        ))
+    return media
+
+def generate(users=100, venues=1000, events=500, guests_per_event=20, media=200, seed=0, batch_size=1000):
+    """Insert a synthetic data set; returns the number of rows created per model"""
+    if events and not (users and venues):
+        raise ValueError('Events need at least one user and one venue')
+    if media and not users:
+        raise ValueError('Media rows need at least one user')
+    rng = random.Random(seed)
+    ensure_locations()
+    centers = city_centers(rng)
+    
+    with transaction.atomic():
+        user_rows = User.objects.bulk_create(build_users(rng, users), batch_size=batch_size)
+        venue_rows, detail_rows = build_venues(rng, venues, centers)
+        Venue.objects.bulk_create(venue_rows, batch_size=batch_size)
+        VenueDetails.objects.bulk_create(detail_rows, batch_size=batch_size)
+    
+        event_rows, guest_rows = build_events(rng, events, guests_per_event, user_rows, venue_rows) if events else ([], [])
+        Event.objects.bulk_create(event_rows, batch_size=batch_size)
+        for event, event_guests in zip(event_rows, guest_rows):
+            for guest in event_guests:
+                guest.event = event
+        EventGuest.objects.bulk_create(
+            [guest for event_guests in guest_rows for guest in event_guests], batch_size=batch_size
+        )
+        MediaUpload.objects.bulk_create(build_media(rng, media, user_rows, event_rows), batch_size=batch_size)
+    
+    refresh_derived()
+    return {
+        'users': len(user_rows),
+        'venues': len(venue_rows),
+        'venue_details': len(detail_rows),
+        'events': len(event_rows),
+        'guests': sum(len(event_guests) for event_guests in guest_rows),
+        'media': media,
+    }
+
+def clear():
+    """
+    Delete previously generated rows and what cascades from them; returns the
+    number deleted per model. Deletes go through the ORM so signals keep the
+    remaining data consistent, which makes this slow for large data sets.
+    """
+    deleted = {}
+    for queryset in [
+        User.objects.filter(username__startswith=USERNAME_PREFIX),
+        Venue.objects.filter(image__startswith=IMAGE_PREFIX),
+        VenueDetails.objects.filter(image_url__startswith=IMAGE_PREFIX),
+    ]:
+        for label, count in queryset.delete()[1].items():
+            deleted[label] = deleted.get(label, 0) + count
+    refresh_derived()
+    return deleted
+
+def refresh_derived():
+    """Rebuild what the skipped save() methods and signals would have maintained"""
+    stats.rebuild()
+    rebuild_index()
+    refresh_popularity(full=True)
+    facet_index.invalidate()
+    invalidate_tags(
+        'venue:list', 'venue-details', 'location', *(f'venue:city:{city.lower()}' for _, city in cities())
+    )
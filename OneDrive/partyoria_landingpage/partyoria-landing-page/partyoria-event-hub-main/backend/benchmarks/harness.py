@@ -0,0 +1,295 @@
+"""
+Endpoint benchmark harness.
+
+`discover()` walks ROOT_URLCONF and turns every named route that answers GET
+into a concrete URL, taking path parameters from rows in the database and
+adding the query strings some endpoints require (SAMPLE_QUERIES). `run()`
+sends requests to each URL in turn from concurrent in-process clients and
+records latency percentiles, throughput and SQL queries per request (read
+from the MetricsMiddleware registry). Reports are plain dicts written as
+JSON, and `compare()` lists what got slower or chattier than a baseline.
+"""
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+from django.urls import NoReverseMatch, URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+from events.models import Event, EventGuest, Venue
+from media_uploads.models import MediaUpload, UploadSession
+from partyoria_backend.metrics import registry
+from partyoria_backend.profiling import entry_ids
+from users.models import User
+from users.tokens import issue_tokens
+from venues.models import VenueDetails
+from .clients import asgi_get, wsgi_get
+
+# Django admin pages are not part of the API
+EXCLUDED_NAMESPACES = {'admin'}
+
+def nearby_query(venue):
+    return f'lat={venue.latitude}&lng={venue.longitude}&radius_km=25'
+
+SAMPLE_QUERIES = {
+    'venue-nearby': nearby_query,
+    'venue-details-nearby': nearby_query,
+    'venue-search': lambda venue: f'q={venue.name.split()[0]}',
+    'venue-suggest': lambda venue: f'q={venue.name[:3]}',
+}
+
+# Settings
+
+def delayed_execute(delay):
+    """Execute wrapper adding `delay` seconds per query, emulating a database across the network"""
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+    return wrapper
+
+def add_db_latency(delay):
+    wrapper = delayed_execute(delay)
+    
+    def install(connection, **kwargs):
+        # Connection objects are reused across reconnects
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+    connection_created.connect(install, weak=False)
+    for connection in connections.all(initialized_only=True):
+        install(connection)
+
+def uncached_overrides():
+    """Settings that point the response cache at a DummyCache"""
+    caches = dict(getattr(settings, 'CACHES', {}))
+    caches.setdefault('default', {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'})
+    caches['benchmark-dummy'] = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+    return {'CACHES': caches, 'RESPONSE_CACHE_ALIAS': 'benchmark-dummy'}
+
+def auth_headers(user):
+    if user is None:
+        return {}
+    return {'Authorization': f'Bearer {issue_tokens(user)["access"]}'}
+
+def benchmark_user(username=None):
+    """The named user, else the first staff user (so admin-only endpoints are measured), else the first user"""
+    users = User.objects.order_by('pk')
+    if username:
+        return users.get(username=username)
+    return users.filter(is_staff=True).first() or users.first()
+
+# Discovery
+
+def iter_routes(resolver, namespace=''):
+    for entry in resolver.url_patterns:
+        if isinstance(entry, URLResolver):
+            if entry.namespace in EXCLUDED_NAMESPACES:
+                continue
+            yield from iter_routes(entry, f'{namespace}{entry.namespace}:' if entry.namespace else namespace)
+        elif entry.name:
+            yield f'{namespace}{entry.name}', entry
+
+def route_params(entry):
+    converters = getattr(entry.pattern, 'converters', None)
+    if converters is not None:
+        return set(converters)
+    return set(entry.pattern.regex.groupindex)
+
+def allows_get(callback):
+    actions = getattr(callback, 'actions', None)
+    if actions is not None:
+        return 'get' in actions
+    view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+    return view_class is None or hasattr(view_class, 'get')
+
+def path_kwargs(user):
+    """Path parameters for the routes that take them, from rows in the database"""
+    kwargs = {}
+    events = Event.objects.order_by('pk')
+    event = (events.filter(organizer=user).first() if user else None) or events.first()
+    if event is not None:
+        for name in ('event-detail', 'event-guests', 'event-export-guests'):
+            kwargs[name] = {'pk': event.pk}
+    venue = Venue.objects.order_by('pk').first()
+    if venue is not None:
+        kwargs['venue-detail'] = {'pk': venue.pk}
+    busiest = Venue.objects.values('city').annotate(count=Count('pk')).order_by('-count', 'city').first()
+    if busiest is not None:
+        kwargs['venues-by-city'] = {'city': busiest['city']}
+    if user is not None:
+        kwargs['user-detail'] = {'pk': user.pk}
+    media = MediaUpload.objects.order_by('pk').first()
+    if media is not None:
+        kwargs['media-detail'] = {'pk': media.pk}
+    session = UploadSession.objects.order_by('created_at').first()
+    if session is not None:
+        kwargs['upload-session-detail'] = {'session_id': session.pk}
+    profiles = entry_ids()
+    if profiles:
+        for name in ('profile-detail', 'profile-stacks'):
+            kwargs[name] = {'entry_id': profiles[0]}
+    return kwargs
+
+def discover(user=None, names=None):
+    """([{'name', 'url'}], [{'name', 'reason'}]): the routes to benchmark and the ones left out"""
+    kwargs = path_kwargs(user)
+    venue = Venue.objects.exclude(latitude=None).order_by('pk').first()
+    targets = []
+    skipped = []
+    seen = set()
+    for name, entry in iter_routes(get_resolver()):
+        params = route_params(entry)
+        # The router's format-suffix variants duplicate the plain routes
+        if name in seen or 'format' in params or (names and name not in names):
+            continue
+        seen.add(name)
+        if not allows_get(entry.callback):
+            skipped.append({'name': name, 'reason': 'does not answer GET'})
+            continue
+        missing = params - set(kwargs.get(name, {}))
+        if missing:
+            skipped.append({'name': name, 'reason': f'no sample value for {", ".join(sorted(missing))}'})
+            continue
+        try:
+            url = reverse(name, kwargs=kwargs.get(name))
+        except NoReverseMatch as e:
+            skipped.append({'name': name, 'reason': str(e)})
+            continue
+        if name in SAMPLE_QUERIES:
+            if venue is None:
+                skipped.append({'name': name, 'reason': 'no venue to build the query from'})
+                continue
+            url = f'{url}?{SAMPLE_QUERIES[name](venue)}'
+        targets.append({'name': name, 'url': url})
+    return targets, skipped
+
+# Measurement
+
+def percentile(ordered, fraction):
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+def query_totals(name):
+    """(queries, requests) recorded so far for the view `name`"""
+    values = registry.snapshot().get(('db_queries_per_request', (('view', name),)))
+    if values is None:
+        return 0, 0
+    return values[-1], sum(values[:-1])
+
+def summarize(target, timings, elapsed, before, after):
+    latencies = sorted(latency for latency, _ in timings)
+    queries, requests = after[0] - before[0], after[1] - before[1]
+    return {
+        'name': target['name'],
+        'url': target['url'],
+        'requests': len(timings),
+        'errors': sum(1 for _, status in timings if status >= 400),
+        'statuses': dict(sorted(Counter(str(status) for _, status in timings).items())),
+        'requests_per_second': round(len(timings) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        # None when MetricsMiddleware is not installed
+        'queries_per_request': round(queries / requests, 2) if requests else None,
+    }
+
+async def measure(target, get, total, concurrency):
+    """Send `total` requests from `concurrency` clients after one warm-up request"""
+    await get(target['url'])
+    slots = asyncio.Semaphore(concurrency)
+    
+    async def timed():
+        async with slots:
+            start = time.perf_counter()
+            status = await get(target['url'])
+            return time.perf_counter() - start, status
+    
+    before = query_totals(target['name'])
+    start = time.perf_counter()
+    timings = await asyncio.gather(*(timed() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return summarize(target, timings, elapsed, before, query_totals(target['name']))
+
+async def run_targets(targets, mode, total, concurrency, threads, user):
+    results = []
+    if mode == 'asgi':
+        app = get_asgi_application()
+        for target in targets:
+            headers = auth_headers(user)
+            results.append(await measure(target, lambda url: asgi_get(app, url, headers), total, concurrency))
+        return results
+    
+    app = get_wsgi_application()
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for target in targets:
+            # A fresh token per endpoint, so long runs outlive ACCESS_TOKEN_TTL
+            headers = auth_headers(user)
+            results.append(await measure(
+                target, lambda url: loop.run_in_executor(pool, wsgi_get, app, url, headers), total, concurrency
+            ))
+    return results
+
+def dataset():
+    return {
+        'users': User.objects.count(),
+        'venues': Venue.objects.count(),
+        'venue_details': VenueDetails.objects.count(),
+        'events': Event.objects.count(),
+        'guests': EventGuest.objects.count(),
+        'media': MediaUpload.objects.count(),
+    }
+
+def run(targets, mode='wsgi', requests=200, concurrency=10, threads=8, user=None):
+    """Benchmark every target in turn; returns the report"""
+    if mode not in ('wsgi', 'asgi'):
+        raise ValueError(f'Unknown mode {mode!r}')
+    started_at = timezone.now()
+    results = asyncio.run(run_targets(targets, mode, requests, concurrency, threads, user))
+    return {
+        'started_at': started_at.isoformat(),
+        'mode': mode,
+        'requests': requests,
+        'concurrency': concurrency,
+        'threads': threads if mode == 'wsgi' else None,
+        'user': user.username if user is not None else None,
+        'dataset': dataset(),
+        'endpoints': results,
+    }
+
+# Comparison
+
+def compare(baseline, current, threshold=0.2, min_latency_ms=1.0, query_tolerance=0.5):
+    """
+    Regressions of `current` against `baseline`, per endpoint present in both:
+    latency up or throughput down by more than `threshold` (latency also by at
+    least `min_latency_ms`, so sub-millisecond noise is ignored), queries per
+    request up by at least `query_tolerance`, or errors where there were none.
+    """
+    previous = {endpoint['name']: endpoint for endpoint in baseline['endpoints']}
+    regressions = []
+    
+    def flag(name, metric, before, after):
+        regressions.append({'endpoint': name, 'metric': metric, 'baseline': before, 'current': after})
+    
+    for endpoint in current['endpoints']:
+        name = endpoint['name']
+        before = previous.get(name)
+        if before is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if endpoint[metric] > before[metric] * (1 + threshold) and endpoint[metric] - before[metric] >= min_latency_ms:
+                flag(name, metric, before[metric], endpoint[metric])
+        if endpoint['requests_per_second'] < before['requests_per_second'] * (1 - threshold):
+            flag(name, 'requests_per_second', before['requests_per_second'], endpoint['requests_per_second'])
+        if None not in (endpoint['queries_per_request'], before['queries_per_request']):
+            if endpoint['queries_per_request'] - before['queries_per_request'] >= query_tolerance:
+                flag(name, 'queries_per_request', before['queries_per_request'], endpoint['queries_per_request'])
+        if endpoint['errors'] and not before['errors']:
+            flag(name, 'errors', before['errors'], endpoint['errors'])
+    return regressions
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import generator
+
+class Command(BaseCommand):
+    help = (
+        'Replace the synthetic benchmark data set: users, venues in every LOCATIONS_DATA city, '
+        'events with guests and media rows, identical for the same seed and sizes'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Users (default 100)')
+        parser.add_argument('--venues', type=int, default=1000, help='Venues, each with a venue details row (default 1000)')
+        parser.add_argument('--events', type=int, default=500, help='Events (default 500)')
+        parser.add_argument('--guests-per-event', type=int, default=20, help='Guests per event (default 20)')
+        parser.add_argument('--media', type=int, default=200, help='Media rows (default 200)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default 0)')
+        parser.add_argument('--keep', action='store_true', help='Keep previously generated rows instead of deleting them first')
+    
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in ('users', 'venues', 'events', 'guests_per_event', 'media')}
+        if min(sizes.values()) < 0:
+            raise CommandError('Sizes cannot be negative')
+        if not options['keep']:
+            deleted = generator.clear()
+            if deleted:
+                self.stdout.write('Deleted ' + ', '.join(f'{count} {label}' for label, count in sorted(deleted.items())))
+        try:
+            created = generator.generate(seed=options['seed'], **sizes)
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS('Created ' + ', '.join(f'{count} {name}' for name, count in created.items())))
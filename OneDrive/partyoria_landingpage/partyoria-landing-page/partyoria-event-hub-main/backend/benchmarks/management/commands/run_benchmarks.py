@@ -0,0 +1,86 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from benchmarks import harness
+from users.models import User
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every GET endpoint in the urlconf with concurrent in-process clients and report '
+        'p50/p95/p99 latency, throughput and queries per request, optionally against a baseline report'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['wsgi', 'asgi'], default='wsgi', help='Application to drive (default wsgi)')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint (default 200)')
+        parser.add_argument('--concurrency', type=int, default=10, help='Clients with a request in flight (default 10)')
+        parser.add_argument('--threads', type=int, default=8, help='Threads of the WSGI worker (default 8)')
+        parser.add_argument('--db-latency', type=float, default=0, help='Milliseconds added to every query')
+        parser.add_argument('--uncached', action='store_true', help='Bypass the response cache')
+        parser.add_argument('--endpoint', action='append', dest='endpoints', help='URL name to benchmark (repeatable)')
+        parser.add_argument('--user', help='Username to authenticate as (default: first staff user)')
+        parser.add_argument('--output', help='Write the report to this JSON file')
+        parser.add_argument('--baseline', help='Report to compare against; regressions make the command fail')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Allowed latency/throughput change (default 0.2)')
+    
+    def handle(self, *args, **options):
+        if min(options['requests'], options['concurrency'], options['threads']) < 1:
+            raise CommandError('--requests, --concurrency and --threads must be positive')
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not read {options["baseline"]}: {e}')
+        try:
+            user = harness.benchmark_user(options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'No user named {options["user"]}')
+        
+        targets, skipped = harness.discover(user, options['endpoints'])
+        if not targets:
+            raise CommandError('No endpoints to benchmark')
+        if options['db_latency'] > 0:
+            harness.add_db_latency(options['db_latency'] / 1000)
+        with override_settings(**(harness.uncached_overrides() if options['uncached'] else {})):
+            report = harness.run(
+                targets, options['mode'], options['requests'], options['concurrency'], options['threads'], user
+            )
+        report['uncached'] = options['uncached']
+        report['db_latency_ms'] = options['db_latency']
+        report['skipped'] = skipped
+        
+        self.write_table(report)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f'Report written to {options["output"]}')
+        if baseline is None:
+            return
+        
+        if baseline.get('dataset') != report['dataset']:
+            self.stdout.write(self.style.WARNING('The baseline was run on a different data set'))
+        regressions = harness.compare(baseline, report, options['threshold'])
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(
+                f'{regression["endpoint"]}: {regression["metric"]} {regression["baseline"]} -> {regression["current"]}'
+            ))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regressions against {options["baseline"]}')
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {options["baseline"]}'))
+    
+    def write_table(self, report):
+        self.stdout.write(
+            f'{"endpoint":<28} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"queries":>8} {"errors":>7}'
+        )
+        for endpoint in report['endpoints']:
+            queries = endpoint['queries_per_request']
+            self.stdout.write(
+                f'{endpoint["name"]:<28} {endpoint["requests_per_second"]:>8} {endpoint["p50_ms"]:>8} '
+                f'{endpoint["p95_ms"]:>8} {endpoint["p99_ms"]:>8} {"-" if queries is None else queries:>8} {endpoint["errors"]:>7}'
+            )
+        for entry in report['skipped']:
+            self.stdout.write(f'skipped {entry["name"]}: {entry["reason"]}')
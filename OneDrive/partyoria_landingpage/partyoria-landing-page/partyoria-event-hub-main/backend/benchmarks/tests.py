@@ -0,0 +1,95 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from events.models import Event, EventGuest, Venue
+from events.rsvp import reconcile
+from locations.data import LOCATIONS_DATA
+from locations.models import Location
+from users.models import User
+from venues.models import VenueDetails, VenueSearchEntry
+from . import generator, harness
+
+SIZES = {'users': 4, 'venues': 12, 'events': 5, 'guests_per_event': 3, 'media': 4}
+
+def fingerprint():
+    return (
+        list(Venue.objects.order_by('image').values_list('name', 'city', 'price', 'latitude', 'badges')),
+        list(Event.objects.order_by('title').values_list('title', 'event_type', 'date', 'location', 'budget')),
+        list(EventGuest.objects.order_by('email').values_list('email', 'rsvp_status')),
+    )
+
+class GeneratorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+    
+    def test_same_seed_same_rows(self):
+        generator.generate(seed=3, **SIZES)
+        first = fingerprint()
+        generator.clear()
+        self.assertFalse(Venue.objects.exists())
+        self.assertFalse(User.objects.exists())
+    
+        generator.generate(seed=3, **SIZES)
+        self.assertEqual(fingerprint(), first)
+        generator.clear()
+        generator.generate(seed=4, **SIZES)
+        self.assertNotEqual(fingerprint(), first)
+    
+    def test_derived_data_is_consistent(self):
+        created = generator.generate(seed=1, **SIZES)
+        self.assertEqual(created['guests'], 15)
+        self.assertEqual(Location.objects.count(), sum(len(cities) for cities in LOCATIONS_DATA.values()))
+        self.assertFalse(Venue.objects.filter(city_location=None).exists())
+        self.assertFalse(VenueDetails.objects.filter(city_location=None).exists())
+        self.assertFalse(Venue.objects.filter(geocell='').exists())
+        self.assertEqual(reconcile(), [])
+        self.assertEqual(VenueSearchEntry.objects.count(), 24)
+        self.assertEqual(self.client.get('/api/events/stats/').json()['totals']['count'], 5)
+
+class HarnessTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        generator.generate(seed=0, **SIZES)
+    
+    def test_discover_and_run(self):
+        user = harness.benchmark_user()
+        self.assertTrue(user.is_staff)
+        targets, skipped = harness.discover(user)
+        urls = {target['name']: target['url'] for target in targets}
+        self.assertEqual(urls['venue-detail'], f'/api/venues/{Venue.objects.order_by("pk").first().pk}/')
+        self.assertTrue(urls['venue-nearby'].startswith('/api/venues/nearby/?lat='))
+        reasons = {entry['name']: entry['reason'] for entry in skipped}
+        self.assertEqual(reasons['user-login'], 'does not answer GET')
+        self.assertEqual(reasons['media-file'], 'no sample value for path')
+        self.assertFalse(any(name.startswith('admin:') for name in list(urls) + list(reasons)))
+    
+        selected = [target for target in targets if target['name'] in ('event-list', 'location-list')]
+        report = harness.run(selected, requests=6, concurrency=2, threads=2, user=user)
+        self.assertEqual(report['dataset']['events'], 5)
+        for endpoint in report['endpoints']:
+            self.assertEqual(endpoint['statuses'], {'200': 6})
+            self.assertLessEqual(endpoint['p50_ms'], endpoint['p99_ms'])
+        queries = {endpoint['name']: endpoint['queries_per_request'] for endpoint in report['endpoints']}
+        self.assertGreaterEqual(queries['event-list'], 1)
+
+class CompareTests(SimpleTestCase):
+    def endpoint(self, **values):
+        endpoint = {
+            'name': 'event-list', 'errors': 0, 'requests_per_second': 100.0,
+            'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 30.0, 'queries_per_request': 1.0,
+        }
+        endpoint.update(values)
+        return {'endpoints': [endpoint]}
+    
+    def test_flags_slower_and_chattier_endpoints(self):
+        baseline = self.endpoint()
+        self.assertEqual(harness.compare(baseline, self.endpoint(p95_ms=22.0, requests_per_second=90.0)), [])
+        regressions = harness.compare(baseline, self.endpoint(p99_ms=45.0, queries_per_request=21.0, errors=2))
+        self.assertEqual(
+            [(regression['metric'], regression['baseline'], regression['current']) for regression in regressions],
+            [('p99_ms', 30.0, 45.0), ('queries_per_request', 1.0, 21.0), ('errors', 0, 2)],
+        )
+    
+    def test_ignores_sub_millisecond_noise(self):
+        baseline = self.endpoint(p50_ms=0.5)
+        self.assertEqual(harness.compare(baseline, self.endpoint(p50_ms=0.9)), [])
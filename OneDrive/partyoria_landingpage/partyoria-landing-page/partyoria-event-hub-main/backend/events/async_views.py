@@ -0,0 +1,43 @@
+"""Async versions of the venue catalog views, served under ASGI (see partyoria_backend.async_api)"""
+from django.db.models.functions import Lower
+
+from locations.catalog import alocation_ids_for_city
+from partyoria_backend.async_api import async_api_view, render
+from .columnar import agrouped_venues
+from .facets import facet_index, selected_facets
+from .models import Venue
+from .serializers import VenueSerializer
+from .views import cities_with_venues, filter_venues, venue_sort_ordering
+
+@async_api_view(tags=lambda request, city: [f'venue:city:{city.strip().lower()}', 'location'])
+async def venues_by_city(request, city):
+    location_ids = await alocation_ids_for_city(city)
+    if location_ids:
+        venues = Venue.objects.filter(city_location_id__in=location_ids)
+    else:
+        venues = Venue.objects.alias(city_lower=Lower('city')).filter(city_lower=city.lower())
+    index = await facet_index.aget() if selected_facets(request.query_params) else None
+    venues = filter_venues(request, venues, index=index)
+    ordering = venue_sort_ordering(request)
+    if ordering:
+        venues = venues.order_by(*ordering)
+    return VenueSerializer([venue async for venue in venues], many=True).data
+
+@async_api_view(tags=['venue:list'])
+async def all_venues(request):
+    cities = [city.strip() for city in request.query_params.get('cities', '').split(',') if city.strip()]
+    
+    limit = request.query_params.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return render({'error': 'limit must be an integer'}, status=400)
+        if limit < 1:
+            return render({'error': 'limit must be positive'}, status=400)
+    
+    return await agrouped_venues(cities=cities or None, limit=limit)
+
+@async_api_view(tags=['venue:list'])
+async def cities_list(request):
+    return [city async for city in cities_with_venues()]
@@ -0,0 +1,73 @@
+"""
+Columnar read path for venue listings.
+
+Venues are fetched as `values_list()` tuples in a single ordered query and
+encoded with the field objects of one shared `VenueSerializer`, so the output
+matches `VenueSerializer(venue).data` without building a model instance or a
+serializer per row.
+"""
+from itertools import groupby
+from operator import itemgetter
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from rest_framework.relations import PKOnlyObject, RelatedField
+
+from .models import Venue
+from .serializers import VenueSerializer
+
+def venue_columns():
+    """Return (field_name, source, encoder) for each VenueSerializer field"""
+    columns = []
+    for name, field in VenueSerializer().fields.items():
+        if field.write_only:
+            continue
+        encode = field.to_representation
+        if isinstance(field, RelatedField):
+            encode = lambda value, encode=encode: encode(PKOnlyObject(pk=value))
+        columns.append((name, field.source, encode))
+    return columns
+
+def row_encoder(columns):
+    """Return (sources, encode), where encode turns a values_list(*sources) row into a venue dict"""
+    names = [name for name, _, _ in columns]
+    encoders = [encode for _, _, encode in columns]
+    
+    def encode_row(row):
+        return dict(zip(names, [None if value is None else encode(value) for encode, value in zip(encoders, row)]))
+    return [source for _, source, _ in columns], encode_row
+
+def iter_venue_rows(queryset, columns):
+    """Yield serialized venue dicts from a values_list() pass over queryset"""
+    sources, encode_row = row_encoder(columns)
+    for row in queryset.values_list(*sources).iterator(chunk_size=2000):
+        yield encode_row(row)
+
+def grouped_venues_queryset(cities=None, limit=None):
+    queryset = Venue.objects.order_by('city', 'name')
+    if cities:
+        queryset = queryset.filter(city__in=cities)
+    if limit is not None:
+        queryset = queryset.annotate(
+            city_rank=Window(RowNumber(), partition_by=[F('city')], order_by=[F('name').asc()])
+        ).filter(city_rank__lte=limit)
+    return queryset
+
+def grouped_venues(cities=None, limit=None):
+    """
+    Venues grouped by city, ordered by city then name.
+    
+    `cities` restricts the result to the given city names and `limit` caps
+    the number of venues returned per city.
+    """
+    # Rows arrive ordered by city, so grouping is a single streaming pass
+    rows = iter_venue_rows(grouped_venues_queryset(cities, limit), venue_columns())
+    return {city: list(venues) for city, venues in groupby(rows, key=itemgetter('city'))}
+
+async def agrouped_venues(cities=None, limit=None):
+    """`grouped_venues()` through the async ORM"""
+    sources, encode_row = row_encoder(venue_columns())
+    queryset = grouped_venues_queryset(cities, limit).values_list(*sources)
+    # Django 4.2's values_list().aiterator() runs the query on the event loop, so fetch via __aiter__
+    rows = [encode_row(row) async for row in queryset]
+    return {city: list(venues) for city, venues in groupby(rows, key=itemgetter('city'))}
@@ -0,0 +1,25 @@
+"""Columns and querysets for the streaming event, guest and venue exports"""
+from .models import Event, EventGuest, Venue
+
+EVENT_COLUMNS = (
+    'id', 'title', 'event_type', 'status', 'date', 'location', 'budget', 'attendees_count', 'organizer_id',
+    'rsvp_accepted', 'rsvp_declined', 'rsvp_pending', 'created_at',
+)
+# Starts with the guest import columns, so an export can be re-imported
+GUEST_COLUMNS = ('name', 'email', 'phone', 'rsvp_status', 'id', 'event_id', 'created_at')
+VENUE_COLUMNS = (
+    'id', 'name', 'type', 'location', 'city', 'price', 'price_min', 'price_max', 'rating', 'reviews',
+    'latitude', 'longitude', 'suitability', 'badges', 'created_at',
+)
+
+def event_export(organizer_id=None):
+    events = Event.objects.order_by('pk')
+    if organizer_id is not None:
+        events = events.filter(organizer_id=organizer_id)
+    return events, EVENT_COLUMNS
+
+def guest_export(event_id):
+    return EventGuest.objects.filter(event_id=event_id).order_by('pk'), GUEST_COLUMNS
+
+def venue_export():
+    return Venue.objects.order_by('pk'), VENUE_COLUMNS
@@ -0,0 +1,158 @@
+"""
+In-memory facet index over venues.
+
+For every facet value (a city, type, badge, suitability or price bucket) the
+index keeps a bitset of the venues carrying it, stored as a Python int with
+one bit per venue. Filtering ORs the bitsets of the selected values within a
+facet and ANDs across facets, and counting is a popcount, so multi-facet
+queries never touch the database. The index is a `VersionedSnapshot`
+rebuilt after venue writes.
+
+`filter_by_facets()` hands the match to the database as a primary-key list
+while it is small; past FACET_ID_LIMIT ids it filters with the equivalent SQL
+predicates instead, so a broad selection never builds a huge IN (...) list.
+"""
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+
+from partyoria_backend.snapshots import VersionedSnapshot
+from .models import Venue
+
+FACETS = ('city', 'type', 'badge', 'suitability', 'price')
+
+# Venue field behind each list-valued facet
+LIST_FIELDS = {'badge': 'badges', 'suitability': 'suitability'}
+
+# (bucket name, lower bound inclusive, upper bound exclusive) on price_min
+PRICE_BUCKETS = [
+    ('under-25k', 0, 25_000),
+    ('25k-50k', 25_000, 50_000),
+    ('50k-1l', 50_000, 1_00_000),
+    ('1l-2l', 1_00_000, 2_00_000),
+    ('over-2l', 2_00_000, None),
+]
+
+def price_bucket(price_min):
+    if price_min is None:
+        return None
+    for name, lower, upper in PRICE_BUCKETS:
+        if price_min >= lower and (upper is None or price_min < upper):
+            return name
+    return None
+
+def to_bitset(positions, size):
+    bitmap = bytearray((size + 7) // 8)
+    for position in positions:
+        bitmap[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bitmap, 'little')
+
+def iter_set_bits(bits):
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        while byte:
+            lowest = byte & -byte
+            yield byte_index * 8 + lowest.bit_length() - 1
+            byte ^= lowest
+
+class FacetIndex:
+    def __init__(self, rows):
+        self.venue_ids = []
+        positions = {facet: {} for facet in FACETS}
+        for position, (venue_id, city, venue_type, badges, suitability, price_min) in enumerate(rows):
+            self.venue_ids.append(venue_id)
+            values = {
+                'city': [city],
+                'type': [venue_type],
+                'badge': badges or [],
+                'suitability': suitability or [],
+                'price': [price_bucket(price_min)],
+            }
+            for facet, facet_values in values.items():
+                for value in set(facet_values):
+                    if value:
+                        positions[facet].setdefault(value, []).append(position)
+        
+        size = len(self.venue_ids)
+        self.all = (1 << size) - 1
+        self.bitsets = {
+            facet: {value: to_bitset(value_positions, size) for value, value_positions in values.items()}
+            for facet, values in positions.items()
+        }
+    
+    def matching(self, selected, exclude=None):
+        """Bitset of venues matching every selected facet except `exclude`"""
+        bits = self.all
+        for facet, values in selected.items():
+            if facet == exclude or not values:
+                continue
+            facet_bits = 0
+            for value in values:
+                facet_bits |= self.bitsets[facet].get(value, 0)
+            bits &= facet_bits
+        return bits
+    
+    def counts(self, selected):
+        """
+        Counts per facet value for the current selection. Each facet is
+        counted against the other facets' filters so that selecting one
+        value still shows the alternatives within that facet.
+        """
+        result = {}
+        for facet in FACETS:
+            bits = self.matching(selected, exclude=facet)
+            counts = {value: (value_bits & bits).bit_count() for value, value_bits in self.bitsets[facet].items()}
+            result[facet] = {value: count for value, count in sorted(counts.items()) if count}
+        return result
+    
+    def venue_ids_for(self, bits):
+        return [self.venue_ids[position] for position in iter_set_bits(bits)]
+
+def build_facet_index():
+    rows = Venue.objects.order_by('id').values_list('id', 'city', 'type', 'badges', 'suitability', 'price_min')
+    return FacetIndex(rows.iterator(chunk_size=2000))
+
+facet_index = VersionedSnapshot('venues:facets:version', build_facet_index)
+
+def facet_id_limit():
+    return getattr(settings, 'FACET_ID_LIMIT', 1000)
+
+def facet_condition(facet, values):
+    """SQL predicate for one facet: the venue carries any of `values`"""
+    condition = Q(pk__in=[])
+    for value in values:
+        if facet == 'city':
+            condition |= Q(city=value)
+        elif facet == 'type':
+            condition |= Q(type=value)
+        elif facet == 'price':
+            for name, lower, upper in PRICE_BUCKETS:
+                if name == value:
+                    bounds = {'price_min__gte': lower}
+                    if upper is not None:
+                        bounds['price_min__lt'] = upper
+                    condition |= Q(**bounds)
+        else:
+            condition |= Q(**{f'{LIST_FIELDS[facet]}__contains': [value]})
+    return condition
+
+def filter_by_facets(queryset, selected, index):
+    """Restrict a venue queryset to the venues matching `selected`"""
+    bits = index.matching(selected)
+    # JSON containment (Postgres jsonb @>) is needed for the list facets;
+    # backends without it always take the id list
+    sql_ready = connections[queryset.db].features.supports_json_field_contains or not (set(selected) & set(LIST_FIELDS))
+    if bits.bit_count() <= facet_id_limit() or not sql_ready:
+        return queryset.filter(id__in=index.venue_ids_for(bits))
+    for facet, values in selected.items():
+        queryset = queryset.filter(facet_condition(facet, values))
+    return queryset
+
+def selected_facets(params):
+    """Facet selections from query params, e.g. ?badge=AC,Parking&city=Mumbai"""
+    selected = {}
+    for facet in FACETS:
+        values = [value.strip() for raw in params.getlist(facet) for value in raw.split(',') if value.strip()]
+        if values:
+            selected[facet] = values
+    return selected
@@ -0,0 +1,146 @@
+"""
+Bulk guest import from CSV or NDJSON.
+
+Rows are decoded and validated as the upload streams in, deduplicated by
+email (the last row for an address wins), and written with batched upserts
+on the (event, email) unique constraint inside one transaction. Invalid rows
+are skipped and reported by row number; they never abort the import.
+"""
+import codecs
+import csv
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from .models import EventGuest
+from .rsvp import apply_deltas, lock_events, transition_deltas
+
+FORMATS = ('csv', 'ndjson')
+MAX_ROWS = 20000
+MAX_REPORTED_ERRORS = 1000
+BATCH_SIZE = 1000
+
+RSVP_STATUSES = {value for value, label in EventGuest._meta.get_field('rsvp_status').choices}
+NAME_MAX_LENGTH = EventGuest._meta.get_field('name').max_length
+PHONE_MAX_LENGTH = EventGuest._meta.get_field('phone').max_length
+
+class GuestImportError(Exception):
+    """The upload as a whole cannot be imported (bad format, unreadable header, too many rows)"""
+
+def iter_text_lines(chunks):
+    """Decode an iterable of byte lines as UTF-8, dropping a leading BOM"""
+    return codecs.iterdecode(chunks, 'utf-8-sig')
+
+def iter_csv_records(lines):
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames:
+        raise GuestImportError('CSV upload has no header row.')
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    if 'email' not in reader.fieldnames or 'name' not in reader.fieldnames:
+        raise GuestImportError('CSV header must include name and email columns.')
+    # Row 1 is the header
+    for row_number, record in enumerate(reader, start=2):
+        yield row_number, record, None
+
+def iter_ndjson_records(lines):
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_number, None, {'non_field_errors': ['Invalid JSON.']}
+            continue
+        if not isinstance(record, dict):
+            yield row_number, None, {'non_field_errors': ['Expected a JSON object.']}
+            continue
+        yield row_number, record, None
+
+def clean_guest(record):
+    """Return (cleaned values, errors) for one row"""
+    errors = {}
+    name = str(record.get('name') or '').strip()
+    email = str(record.get('email') or '').strip().lower()
+    phone = str(record.get('phone') or '').strip()
+    rsvp_status = str(record.get('rsvp_status') or '').strip().lower() or None
+    
+    if not name:
+        errors['name'] = ['This field is required.']
+    elif len(name) > NAME_MAX_LENGTH:
+        errors['name'] = [f'Ensure this field has no more than {NAME_MAX_LENGTH} characters.']
+    if not email:
+        errors['email'] = ['This field is required.']
+    else:
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors['email'] = ['Enter a valid email address.']
+    if len(phone) > PHONE_MAX_LENGTH:
+        errors['phone'] = [f'Ensure this field has no more than {PHONE_MAX_LENGTH} characters.']
+    if rsvp_status is not None and rsvp_status not in RSVP_STATUSES:
+        errors['rsvp_status'] = [f'Must be one of: {", ".join(sorted(RSVP_STATUSES))}.']
+    
+    return {'name': name, 'email': email, 'phone': phone, 'rsvp_status': rsvp_status}, errors
+
+def import_guests(event, lines, fmt, dry_run=False):
+    """
+    Import guests for `event` from decoded text `lines`.
+    
+    Returns a report with created/updated/duplicate counts and per-row errors.
+    An RSVP status column only overwrites existing guests' statuses on rows
+    that set it; other rows keep the current status.
+    """
+    if fmt not in FORMATS:
+        raise GuestImportError(f'Format must be one of: {", ".join(FORMATS)}.')
+    records = iter_csv_records(lines) if fmt == 'csv' else iter_ndjson_records(lines)
+    
+    guests = {}
+    errors = []
+    error_count = 0
+    rows = 0
+    duplicates = 0
+    for row_number, record, row_errors in records:
+        rows += 1
+        if rows > MAX_ROWS:
+            raise GuestImportError(f'Uploads are limited to {MAX_ROWS} rows.')
+        if row_errors is None:
+            values, row_errors = clean_guest(record)
+        if row_errors:
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'row': row_number, 'errors': row_errors})
+            continue
+        if values['email'] in guests:
+            duplicates += 1
+        guests[values['email']] = values
+    
+    with transaction.atomic():
+        # Serialize with other writers to this event's guests and RSVP counters
+        lock_events(event.pk)
+        existing = dict(event.guests.values_list('email', 'rsvp_status'))
+        created = [email for email in guests if email not in existing]
+        if not dry_run:
+            objs = []
+            for email, values in guests.items():
+                rsvp_status = values['rsvp_status'] or existing.get(email, 'pending')
+                objs.append(EventGuest(
+                    event=event, name=values['name'], email=email, phone=values['phone'], rsvp_status=rsvp_status,
+                ))
+            EventGuest.objects.bulk_create(
+                objs, batch_size=BATCH_SIZE,
+                update_conflicts=True, unique_fields=['event', 'email'], update_fields=['name', 'phone', 'rsvp_status'],
+            )
+            # bulk_create skips the counter signals
+            apply_deltas(transition_deltas((event.pk, existing.get(obj.email), obj.rsvp_status) for obj in objs))
+    
+    return {
+        'rows': rows,
+        'created': len(created),
+        'updated': len(guests) - len(created),
+        'duplicates': duplicates,
+        'error_count': error_count,
+        'errors': errors,
+        'dry_run': dry_run,
+    }
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from events.models import Venue
+from partyoria_backend.pricing import parse_price_range
+from venues.models import VenueDetails
+
+class Command(BaseCommand):
+    help = 'Parse venue price strings into the numeric price_min/price_max columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model, price_field in [(Venue, 'price'), (VenueDetails, 'price_range')]:
+            updated = 0
+            unparsed = 0
+            batch = []
+            for venue in model.objects.only('id', price_field, 'price_min', 'price_max').iterator(chunk_size=batch_size):
+                price_range = parse_price_range(getattr(venue, price_field))
+                if price_range[0] is None:
+                    unparsed += 1
+                if price_range != (venue.price_min, venue.price_max):
+                    venue.price_min, venue.price_max = price_range
+                    batch.append(venue)
+                if len(batch) >= batch_size:
+                    model.objects.bulk_update(batch, ['price_min', 'price_max'])
+                    updated += len(batch)
+                    batch = []
+            model.objects.bulk_update(batch, ['price_min', 'price_max'])
+            updated += len(batch)
+            self.stdout.write(f'{model.__name__}: updated {updated}, unparseable {unparsed}')
+
+        self.stdout.write(self.style.SUCCESS('Price backfill complete'))
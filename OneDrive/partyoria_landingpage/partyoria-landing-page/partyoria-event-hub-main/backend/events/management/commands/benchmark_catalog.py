@@ -0,0 +1,98 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+
+from benchmarks.clients import asgi_get, wsgi_get
+from benchmarks.harness import add_db_latency, percentile, uncached_overrides
+
+DEFAULT_PATHS = [
+    '/api/venues/all/',
+    '/api/venues/city/Mumbai/',
+    '/api/cities/',
+    '/api/locations/',
+    '/api/venue-details/',
+]
+
+def summarize(mode, timings, elapsed):
+    latencies = sorted(latency for latency, _ in timings)
+    return {
+        'mode': mode,
+        'requests': len(timings),
+        'errors': sum(1 for _, status in timings if status != 200),
+        'requests_per_second': round(len(timings) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+    }
+
+class Command(BaseCommand):
+    help = (
+        'Compare catalog endpoint throughput of one WSGI worker (sync views on a fixed thread pool) '
+        'and one ASGI worker (async views), driven in-process by concurrent clients'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per mode (default 2000)')
+        parser.add_argument('--concurrency', type=int, default=50, help='Clients with a request in flight (default 50)')
+        parser.add_argument('--wsgi-threads', type=int, default=8, help='Threads of the WSGI worker (default 8)')
+        parser.add_argument('--db-latency', type=float, default=0, help='Milliseconds added to every query')
+        parser.add_argument('--path', action='append', dest='paths', help='Path to request (repeatable)')
+        parser.add_argument('--uncached', action='store_true', help='Bypass the response cache')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    
+    def handle(self, *args, **options):
+        if min(options['requests'], options['concurrency'], options['wsgi_threads']) < 1:
+            raise CommandError('--requests, --concurrency and --wsgi-threads must be positive')
+        urls = options['paths'] or DEFAULT_PATHS
+        if options['db_latency'] > 0:
+            add_db_latency(options['db_latency'] / 1000)
+    
+        with override_settings(**(uncached_overrides() if options['uncached'] else {})):
+            for url in urls:
+                # Warm snapshots and the response cache, and fail early on a broken path
+                status = wsgi_get(get_wsgi_application(), url)
+                if status != 200:
+                    raise CommandError(f'GET {url} returned {status}')
+            results = [
+                asyncio.run(self.run_wsgi(urls, options['requests'], options['concurrency'], options['wsgi_threads'])),
+                asyncio.run(self.run_asgi(urls, options['requests'], options['concurrency'])),
+            ]
+    
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{"mode":<6} {"requests":>9} {"errors":>7} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8}')
+        for result in results:
+            self.stdout.write(
+                f'{result["mode"]:<6} {result["requests"]:>9} {result["errors"]:>7} '
+                f'{result["requests_per_second"]:>9} {result["p50_ms"]:>8} {result["p95_ms"]:>8}'
+            )
+    
+    async def drive(self, mode, urls, total, concurrency, get):
+        """Send `total` requests from `concurrency` clients; latency includes time queued at the worker"""
+        slots = asyncio.Semaphore(concurrency)
+    
+        async def timed(i):
+            async with slots:
+                start = time.perf_counter()
+                status = await get(urls[i % len(urls)])
+                return time.perf_counter() - start, status
+    
+        start = time.perf_counter()
+        timings = await asyncio.gather(*(timed(i) for i in range(total)))
+        return summarize(mode, timings, time.perf_counter() - start)
+    
+    async def run_wsgi(self, urls, total, concurrency, threads):
+        app = get_wsgi_application()
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return await self.drive('wsgi', urls, total, concurrency, lambda url: loop.run_in_executor(pool, wsgi_get, app, url))
+    
+    async def run_asgi(self, urls, total, concurrency):
+        app = get_asgi_application()
+        return await self.drive('asgi', urls, total, concurrency, lambda url: asgi_get(app, url))
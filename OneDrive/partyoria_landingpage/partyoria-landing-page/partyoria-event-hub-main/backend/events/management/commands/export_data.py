@@ -0,0 +1,41 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from events import exports
+from partyoria_backend.streaming import EXPORT_FORMATS, iter_export
+
+class Command(BaseCommand):
+    help = 'Stream events, an event\'s guests or venues to a CSV/NDJSON file (optionally gzipped) in constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=['events', 'guests', 'venues'])
+        parser.add_argument('--fmt', choices=list(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output')
+        parser.add_argument('--event', type=int, help='Event id (required for guests)')
+        parser.add_argument('--organizer', type=int, help='Only export this organizer\'s events')
+        parser.add_argument('--output', '-o', default='-', help='Output file (default: stdout)')
+
+    def handle(self, *args, **options):
+        dataset = options['dataset']
+        if dataset == 'events':
+            queryset, columns = exports.event_export(options['organizer'])
+        elif dataset == 'guests':
+            if options['event'] is None:
+                raise CommandError('--event is required for guest exports')
+            queryset, columns = exports.guest_export(options['event'])
+        else:
+            queryset, columns = exports.venue_export()
+
+        chunks = iter_export(queryset, columns, options['fmt'], compress=options['gzip'])
+        if options['output'] == '-':
+            output = sys.stdout.buffer
+            for chunk in chunks:
+                output.write(chunk)
+            output.flush()
+            return
+        written = 0
+        with open(options['output'], 'wb') as output:
+            for chunk in chunks:
+                output.write(chunk)
+                written += len(chunk)
+        self.stderr.write(f'Wrote {written} bytes to {options["output"]}')
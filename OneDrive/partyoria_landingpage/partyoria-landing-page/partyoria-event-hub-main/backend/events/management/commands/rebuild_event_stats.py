@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from events.stats import rebuild
+
+class Command(BaseCommand):
+    help = 'Recompute the event stats rollup from the events table (for backfills or after bulk writes)'
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt event stats ({rows} rows)'))
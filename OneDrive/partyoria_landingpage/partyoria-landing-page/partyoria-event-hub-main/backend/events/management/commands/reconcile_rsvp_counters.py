@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from events.rsvp import reconcile
+
+class Command(BaseCommand):
+    help = 'Recount event RSVP counters from guest rows and repair any that have drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, action='append', dest='events', help='Only check this event id (repeatable)')
+
+    def handle(self, *args, **options):
+        repaired = reconcile(options['events'])
+        for event_id in repaired:
+            self.stdout.write(f'Repaired RSVP counters for event {event_id}')
+        self.stdout.write(self.style.SUCCESS(f'Reconciled RSVP counters ({len(repaired)} repaired)'))
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.text
+
+
+def link_venue_locations(apps, schema_editor):
+    Location = apps.get_model('locations', 'Location')
+    Venue = apps.get_model('events', 'Venue')
+    
+    location_ids = {}
+    for location_id, city in Location.objects.order_by('state', 'city').values_list('id', 'city'):
+        location_ids.setdefault(city.lower(), location_id)
+    
+    for city in Venue.objects.values_list('city', flat=True).distinct():
+        location_id = location_ids.get(city.strip().lower())
+        if location_id:
+            Venue.objects.filter(city=city).update(city_location_id=location_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_citypopularity'),
+        ('events', '0003_event_event_created_id_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='city_location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='venues', to='locations.location'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['city'], name='venue_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(django.db.models.functions.text.Lower('city'), name='venue_city_lower_idx'),
+        ),
+        migrations.RunPython(link_venue_locations, migrations.RunPython.noop),
+    ]
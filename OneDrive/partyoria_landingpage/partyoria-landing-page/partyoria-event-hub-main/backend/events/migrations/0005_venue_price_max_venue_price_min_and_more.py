@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_venue_city_location_venue_venue_city_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='price_max',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='price_min',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['price_min', 'price_max'], name='venue_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['city_location', 'price_min'], name='venue_city_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['-rating', '-id'], name='venue_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+def dedupe_guest_emails(apps, schema_editor):
+    # Lowercase emails and keep the earliest guest per (event, email)
+    EventGuest = apps.get_model('events', 'EventGuest')
+    seen = set()
+    duplicate_ids = []
+    for guest in EventGuest.objects.order_by('event_id', 'id').only('id', 'event_id', 'email').iterator():
+        email = guest.email.strip().lower()
+        if (guest.event_id, email) in seen:
+            duplicate_ids.append(guest.id)
+            continue
+        seen.add((guest.event_id, email))
+        if email != guest.email:
+            EventGuest.objects.filter(pk=guest.pk).update(email=email)
+    EventGuest.objects.filter(pk__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_venue_geocell_venue_latitude_venue_longitude'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_guest_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='eventguest',
+            constraint=models.UniqueConstraint(fields=('event', 'email'), name='event_guest_email_unique'),
+        ),
+    ]
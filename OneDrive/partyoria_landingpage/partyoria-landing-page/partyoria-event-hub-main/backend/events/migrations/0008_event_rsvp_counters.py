@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:20
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_rsvp_counters(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventGuest = apps.get_model('events', 'EventGuest')
+    
+    counts = {}
+    for event_id, rsvp_status, total in EventGuest.objects.values_list('event_id', 'rsvp_status').annotate(total=Count('id')).order_by():
+        counts.setdefault(event_id, {})[f'rsvp_{rsvp_status}'] = total
+    for event_id, fields in counts.items():
+        Event.objects.filter(pk=event_id).update(**fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_eventguest_email_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='rsvp_accepted',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rsvp_declined',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rsvp_pending',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_rsvp_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0008_event_rsvp_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('event_type', 'Event type'), ('status', 'Status'), ('month', 'Month')], max_length=20)),
+                ('key', models.CharField(max_length=20)),
+                ('event_count', models.IntegerField(default=0)),
+                ('total_budget', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_attendees', models.BigIntegerField(default=0)),
+                ('organizer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='event_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'event_stats',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='eventstat',
+            constraint=models.UniqueConstraint(fields=('organizer', 'dimension', 'key'), name='event_stats_organizer_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventstat',
+            constraint=models.UniqueConstraint(condition=models.Q(('organizer__isnull', True)), fields=('dimension', 'key'), name='event_stats_global_unique'),
+        ),
+    ]
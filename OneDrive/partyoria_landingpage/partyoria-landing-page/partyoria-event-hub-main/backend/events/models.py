@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import DatabaseError, models, transaction
+from django.db.models.functions import Lower
 from django.conf import settings
+from partyoria_backend import geo
+from partyoria_backend.pricing import parse_price_range
 
 class Venue(models.Model):
     name = models.CharField(max_length=200)
@@ -7,15 +10,41 @@ class Venue(models.Model):
     location = models.CharField(max_length=300)
     city = models.CharField(max_length=100)
     price = models.CharField(max_length=100)
+    price_min = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    price_max = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geocell = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     rating = models.DecimalField(max_digits=3, decimal_places=1, default=0.0)
     reviews = models.IntegerField(default=0)
     image = models.URLField()
     suitability = models.JSONField(default=list)
     badges = models.JSONField(default=list)
+    city_location = models.ForeignKey(
+        'locations.Location', on_delete=models.SET_NULL, null=True, blank=True, related_name='venues'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='venue_created_id_idx'),
+            models.Index(fields=['city'], name='venue_city_idx'),
+            models.Index(Lower('city'), name='venue_city_lower_idx'),
+            models.Index(fields=['price_min', 'price_max'], name='venue_price_idx'),
+            models.Index(fields=['city_location', 'price_min'], name='venue_city_price_idx'),
+            models.Index(fields=['-rating', '-id'], name='venue_rating_idx'),
+        ]
+    
     def __str__(self):
         return self.name
+    
+    def save(self, *args, **kwargs):
+        # city stays the source of truth; the FK follows it through the in-memory location catalog
+        from locations.catalog import resolve_city
+        self.city_location_id = resolve_city(self.city)
+        self.price_min, self.price_max = parse_price_range(self.price)
+        self.geocell = geo.cell_for(self.latitude, self.longitude)
+        super().save(*args, **kwargs)
 
 class Event(models.Model):
     EVENT_TYPES = [
@@ -43,12 +72,83 @@ class Event(models.Model):
     location = models.CharField(max_length=300)
     budget = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     attendees_count = models.IntegerField(default=0)
+    # Guest counts per RSVP status, maintained by events.rsvp
+    rsvp_accepted = models.PositiveIntegerField(default=0, editable=False)
+    rsvp_declined = models.PositiveIntegerField(default=0, editable=False)
+    rsvp_pending = models.PositiveIntegerField(default=0, editable=False)
     organizer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='organized_events')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='event_created_id_idx'),
+        ]
+    
     def __str__(self):
         return self.title
+    
+    RSVP_COUNTER_FIELDS = ('rsvp_accepted', 'rsvp_declined', 'rsvp_pending')
+    
+    @property
+    def guest_count(self):
+        return self.rsvp_accepted + self.rsvp_declined + self.rsvp_pending
+    
+    def save(self, *args, **kwargs):
+        # The counters only change through F() updates (events.rsvp); an update
+        # from an instance loaded earlier must not write its stale counts back
+        limit_fields = not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert')
+        if limit_fields:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.RSVP_COUNTER_FIELDS
+            ]
+        # The stats signals lock the row, read the stored values and update the rollup in one transaction
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except DatabaseError as e:
+            if not limit_fields or 'did not affect any rows' not in str(e):
+                raise
+            # The row was deleted since this instance was loaded; re-insert it
+            # as a plain save() would. Its guests went with it, so the
+            # counters start from zero.
+            for name in self.RSVP_COUNTER_FIELDS:
+                setattr(self, name, 0)
+            del kwargs['update_fields']
+            with transaction.atomic():
+                super().save(*args, force_insert=True, **kwargs)
+
+class EventStat(models.Model):
+    """
+    Incrementally maintained event rollup: count, budget and attendees for one
+    event_type, status or month, per organizer (organizer=None for all events)
+    """
+    DIMENSIONS = [
+        ('event_type', 'Event type'),
+        ('status', 'Status'),
+        ('month', 'Month'),
+    ]
+    
+    organizer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='event_stats', null=True, blank=True)
+    dimension = models.CharField(max_length=20, choices=DIMENSIONS)
+    key = models.CharField(max_length=20)
+    event_count = models.IntegerField(default=0)
+    total_budget = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_attendees = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'event_stats'
+        constraints = [
+            models.UniqueConstraint(fields=['organizer', 'dimension', 'key'], name='event_stats_organizer_unique'),
+            # NULLs never collide in a unique index, so the all-events rows need their own
+            models.UniqueConstraint(
+                fields=['dimension', 'key'], condition=models.Q(organizer__isnull=True), name='event_stats_global_unique',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.dimension}={self.key} ({self.event_count})"
 
 class EventGuest(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='guests')
@@ -60,4 +160,19 @@ class EventGuest(models.Model):
         ('accepted', 'Accepted'),
         ('declined', 'Declined'),
     ], default='pending')
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            # Emails are stored lowercased, so this also dedupes case variants
+            models.UniqueConstraint(fields=['event', 'email'], name='event_guest_email_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} <{self.email}>"
+    
+    def save(self, *args, **kwargs):
+        self.email = self.email.strip().lower()
+        # The RSVP counter signals lock and update the event in the same transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Denormalized RSVP counters on Event.
+
+`Event.rsvp_accepted/rsvp_declined/rsvp_pending` hold the number of guests
+in each status. Every write that changes a guest's status takes the event
+row lock first, reads the guest's current status under it, and applies the
+difference with F() updates in the same transaction, so concurrent RSVPs
+cannot lose or double-count a change. `reconcile` repairs any drift from
+writes that bypass this (raw SQL, QuerySet.update elsewhere).
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Event, EventGuest
+
+RSVP_FIELDS = {
+    'accepted': 'rsvp_accepted',
+    'declined': 'rsvp_declined',
+    'pending': 'rsvp_pending',
+}
+
+def lock_events(*event_ids):
+    """Take the row locks for the given events, in id order to avoid deadlocks"""
+    ids = sorted({event_id for event_id in event_ids if event_id is not None})
+    if ids:
+        list(Event.objects.select_for_update().filter(pk__in=ids).order_by('pk').values_list('pk', flat=True))
+
+def apply_deltas(deltas):
+    """Apply a Counter of {(event_id, status): change} to the event counters"""
+    by_event = {}
+    for (event_id, rsvp_status), change in deltas.items():
+        if change:
+            by_event.setdefault(event_id, {})[RSVP_FIELDS[rsvp_status]] = F(RSVP_FIELDS[rsvp_status]) + change
+    for event_id, updates in by_event.items():
+        Event.objects.filter(pk=event_id).update(**updates)
+
+def transition_deltas(transitions):
+    """Counter of counter changes for (event_id, old status or None, new status or None) transitions"""
+    deltas = Counter()
+    for event_id, old_status, new_status in transitions:
+        if old_status == new_status:
+            continue
+        if old_status is not None:
+            deltas[(event_id, old_status)] -= 1
+        if new_status is not None:
+            deltas[(event_id, new_status)] += 1
+    return deltas
+
+def counts_for(event_ids=None):
+    """{event_id: {status: count}} counted from EventGuest"""
+    guests = EventGuest.objects.all()
+    if event_ids is not None:
+        guests = guests.filter(event_id__in=event_ids)
+    counts = {}
+    for event_id, rsvp_status, total in guests.values_list('event_id', 'rsvp_status').annotate(total=Count('id')).order_by():
+        counts.setdefault(event_id, {})[rsvp_status] = total
+    return counts
+
+def bulk_rsvp(event, rsvp_status, guest_ids=None, emails=None):
+    """
+    Set `rsvp_status` for the event's guests selected by id or email in one
+    UPDATE, adjusting the counters in the same transaction. Returns the
+    number of guests whose status changed.
+    """
+    with transaction.atomic():
+        lock_events(event.pk)
+        guests = event.guests.all()
+        if guest_ids is not None:
+            guests = guests.filter(pk__in=guest_ids)
+        if emails is not None:
+            guests = guests.filter(email__in=[email.strip().lower() for email in emails])
+        changing = guests.exclude(rsvp_status=rsvp_status)
+        before = dict(changing.values_list('rsvp_status').annotate(total=Count('id')).order_by())
+        updated = changing.update(rsvp_status=rsvp_status)
+        deltas = Counter()
+        for old_status, total in before.items():
+            deltas[(event.pk, old_status)] -= total
+            deltas[(event.pk, rsvp_status)] += total
+        apply_deltas(deltas)
+    return updated
+
+def reconcile(event_ids=None):
+    """Recount drifted counters from EventGuest; returns the ids of events that were repaired"""
+    counts = counts_for(event_ids)
+    events = Event.objects.all()
+    if event_ids is not None:
+        events = events.filter(pk__in=event_ids)
+    fields = list(RSVP_FIELDS.values())
+    
+    repaired = []
+    for event_id, *stored in events.values_list('pk', *fields).iterator():
+        expected = [counts.get(event_id, {}).get(rsvp_status, 0) for rsvp_status in RSVP_FIELDS]
+        if stored == expected:
+            continue
+        with transaction.atomic():
+            # Recount under the lock so concurrent RSVPs are not overwritten
+            lock_events(event_id)
+            current = counts_for([event_id]).get(event_id, {})
+            Event.objects.filter(pk=event_id).update(**{
+                field: current.get(rsvp_status, 0) for rsvp_status, field in RSVP_FIELDS.items()
+            })
+        repaired.append(event_id)
+    return repaired
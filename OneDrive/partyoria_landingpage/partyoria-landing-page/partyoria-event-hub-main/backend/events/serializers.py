@@ -1,6 +1,17 @@
 from rest_framework import serializers
 from .models import Event, Venue, EventGuest
 
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer that accepts a `fields` argument to limit the output fields"""
+    
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
 class VenueSerializer(serializers.ModelSerializer):
     class Meta:
         model = Venue
@@ -10,10 +21,33 @@ class EventGuestSerializer(serializers.ModelSerializer):
     class Meta:
         model = EventGuest
         fields = '__all__'
+        read_only_fields = ['event']
+    
+    def validate_email(self, value):
+        value = value.strip().lower()
+        event = self.context.get('event')
+        guests = EventGuest.objects.filter(event=event, email=value)
+        if self.instance is not None:
+            guests = guests.exclude(pk=self.instance.pk)
+        if event is not None and guests.exists():
+            raise serializers.ValidationError('This guest is already on the list.')
+        return value
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(DynamicFieldsModelSerializer):
     guests = EventGuestSerializer(many=True, read_only=True)
+    guest_count = serializers.IntegerField(read_only=True)
+    organizer_name = serializers.CharField(source='organizer.get_full_name', read_only=True)
     
     class Meta:
         model = Event
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class BulkRSVPSerializer(serializers.Serializer):
+    rsvp_status = serializers.ChoiceField(choices=EventGuest._meta.get_field('rsvp_status').choices)
+    guest_ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=10000)
+    emails = serializers.ListField(child=serializers.EmailField(), required=False, max_length=10000)
+    
+    def validate(self, data):
+        if 'guest_ids' not in data and 'emails' not in data:
+            raise serializers.ValidationError('Provide guest_ids or emails.')
+        return data
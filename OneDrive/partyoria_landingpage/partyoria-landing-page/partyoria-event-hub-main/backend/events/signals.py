@@ -0,0 +1,94 @@
+from collections import Counter
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from partyoria_backend.response_cache import invalidate_tags_on_commit
+from .facets import facet_index
+from . import stats
+from .models import Event, EventGuest, Venue
+from .rsvp import apply_deltas, lock_events
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+def invalidate_facet_index(sender, **kwargs):
+    facet_index.invalidate()
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+def invalidate_venue_responses(sender, instance, **kwargs):
+    # _previous_city_text is set by the locations pre_save handler
+    cities = {instance.city, getattr(instance, '_previous_city_text', None)}
+    invalidate_tags_on_commit('venue:list', *(f'venue:city:{city.strip().lower()}' for city in cities if city))
+
+# RSVP counters: lock the event(s) and read the guest's stored state before
+# the write, then apply the difference after it, all in the write's transaction.
+# Guests deleted along with their event need no counter work.
+
+def stored_rsvp_state(guest):
+    if guest.pk is None:
+        return None
+    return EventGuest.objects.filter(pk=guest.pk).values_list('event_id', 'rsvp_status').first()
+
+@receiver(pre_save, sender=EventGuest)
+def lock_rsvp_counters_for_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = stored_rsvp_state(instance)
+    lock_events(instance.event_id, previous[0] if previous else None)
+    # Re-read under the lock in case a concurrent RSVP changed it
+    instance._stored_rsvp_state = stored_rsvp_state(instance) if previous else None
+
+@receiver(post_save, sender=EventGuest)
+def update_rsvp_counters_for_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = Counter()
+    previous = instance.__dict__.pop('_stored_rsvp_state', None)
+    if previous:
+        deltas[previous] -= 1
+    deltas[(instance.event_id, instance.rsvp_status)] += 1
+    apply_deltas(deltas)
+
+def deleted_with_event(origin):
+    """Whether a guest delete cascades from another model, which can only be through its event"""
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is not EventGuest
+
+@receiver(pre_delete, sender=EventGuest)
+def lock_rsvp_counters_for_delete(sender, instance, origin=None, **kwargs):
+    if deleted_with_event(origin):
+        return
+    lock_events(instance.event_id)
+    instance._stored_rsvp_state = stored_rsvp_state(instance)
+
+@receiver(post_delete, sender=EventGuest)
+def update_rsvp_counters_for_delete(sender, instance, **kwargs):
+    previous = instance.__dict__.pop('_stored_rsvp_state', None)
+    if previous:
+        apply_deltas(Counter({previous: -1}))
+
+# Event stats rollup: lock the event and remember its stored values before a
+# save, then move the event's contribution from them to the new values
+# afterwards, in the save's transaction so concurrent saves cannot both start
+# from the same stored values.
+
+@receiver(pre_save, sender=Event)
+def remember_stat_values(sender, instance, raw=False, **kwargs):
+    instance._stored_stat_values = None
+    if not raw and not instance._state.adding and instance.pk:
+        events = Event.objects.select_for_update().filter(pk=instance.pk)
+        instance._stored_stat_values = events.values_list(*stats.STAT_FIELDS).first()
+
+@receiver(post_save, sender=Event)
+def update_event_stats_for_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    stats.apply_change(instance.__dict__.pop('_stored_stat_values', None), stats.event_values(instance))
+
+@receiver(post_delete, sender=Event)
+def update_event_stats_for_delete(sender, instance, **kwargs):
+    stats.apply_change(stats.event_values(instance), None)
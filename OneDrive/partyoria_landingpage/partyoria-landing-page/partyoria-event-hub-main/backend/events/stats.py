@@ -0,0 +1,118 @@
+"""
+Event statistics rollup.
+
+`EventStat` holds the event count, total budget and total attendees for each
+event_type, status and month, per organizer and for all events
+(organizer=None). Event saves and deletes apply their difference to the
+affected rows, so `/api/events/stats/` reads a few dozen rows instead of
+grouping the events table. `rebuild_event_stats` recomputes everything for
+backfills or after bulk writes that skip the signals.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Event, EventStat
+
+STAT_FIELDS = ('organizer_id', 'event_type', 'status', 'date', 'budget', 'attendees_count')
+
+def month_key(date):
+    if timezone.is_aware(date):
+        date = timezone.localtime(date)
+    return date.strftime('%Y-%m')
+
+def stat_keys(values):
+    """The (organizer_id, dimension, key) rows an event with these STAT_FIELDS values counts towards"""
+    organizer_id, event_type, status, date = values[:4]
+    keys = [('event_type', event_type), ('status', status), ('month', month_key(date))]
+    for scope in (organizer_id, None):
+        for dimension, key in keys:
+            yield scope, dimension, key
+
+def event_values(event):
+    return tuple(getattr(event, field) for field in STAT_FIELDS)
+
+def accumulate(totals, values, sign=1):
+    budget = Decimal(str(values[4])) if values[4] is not None else Decimal('0')
+    attendees = values[5] or 0
+    for key in stat_keys(values):
+        row = totals.setdefault(key, [0, Decimal('0'), 0])
+        row[0] += sign
+        row[1] += sign * budget
+        row[2] += sign * attendees
+
+def bump(key, count, budget, attendees):
+    organizer_id, dimension, stat_key = key
+    rows = EventStat.objects.filter(organizer_id=organizer_id, dimension=dimension, key=stat_key)
+    changes = {
+        'event_count': F('event_count') + count,
+        'total_budget': F('total_budget') + budget,
+        'total_attendees': F('total_attendees') + attendees,
+    }
+    if rows.update(**changes):
+        return
+    if count < 0:
+        # Nothing to subtract from: the organizer's rows were cascade-deleted along with the organizer
+        return
+    try:
+        with transaction.atomic():
+            EventStat.objects.create(
+                organizer_id=organizer_id, dimension=dimension, key=stat_key,
+                event_count=count, total_budget=budget, total_attendees=attendees,
+            )
+    except IntegrityError:
+        # Created concurrently since the UPDATE
+        rows.update(**changes)
+
+def apply_change(old_values, new_values):
+    """Move an event's contribution from `old_values` to `new_values` (either may be None)"""
+    totals = {}
+    if old_values is not None:
+        accumulate(totals, old_values, sign=-1)
+    if new_values is not None:
+        accumulate(totals, new_values)
+    with transaction.atomic():
+        for key, (count, budget, attendees) in sorted(totals.items(), key=lambda item: (item[0][0] or 0, item[0][1:])):
+            if count or budget or attendees:
+                bump(key, count, budget, attendees)
+
+def rebuild():
+    """Recompute every rollup row from the events table; returns the number of rows written"""
+    totals = {}
+    for values in Event.objects.values_list(*STAT_FIELDS).iterator(chunk_size=2000):
+        accumulate(totals, values)
+    with transaction.atomic():
+        EventStat.objects.all().delete()
+        EventStat.objects.bulk_create([
+            EventStat(
+                organizer_id=organizer_id, dimension=dimension, key=key,
+                event_count=count, total_budget=budget, total_attendees=attendees,
+            )
+            for (organizer_id, dimension, key), (count, budget, attendees) in totals.items()
+        ], batch_size=1000)
+    return len(totals)
+
+def stats_for(organizer_id=None):
+    """Totals plus breakdowns by event_type, status and month, for one organizer or all events"""
+    breakdowns = {dimension: {} for dimension, label in EventStat.DIMENSIONS}
+    rows = EventStat.objects.filter(organizer_id=organizer_id, event_count__gt=0).order_by('dimension', 'key')
+    for dimension, key, count, budget, attendees in rows.values_list(
+        'dimension', 'key', 'event_count', 'total_budget', 'total_attendees',
+    ):
+        breakdowns[dimension][key] = {'count': count, 'total_budget': str(budget), 'total_attendees': attendees}
+    
+    # Every event has exactly one status, so the status rows sum to the totals
+    by_status = breakdowns['status'].values()
+    return {
+        'organizer': organizer_id,
+        'totals': {
+            'count': sum(row['count'] for row in by_status),
+            'total_budget': str(sum((Decimal(row['total_budget']) for row in by_status), Decimal('0.00'))),
+            'total_attendees': sum(row['total_attendees'] for row in by_status),
+        },
+        'by_event_type': breakdowns['event_type'],
+        'by_status': breakdowns['status'],
+        'by_month': breakdowns['month'],
+    }
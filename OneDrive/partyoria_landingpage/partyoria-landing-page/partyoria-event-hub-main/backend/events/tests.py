@@ -0,0 +1,765 @@
+import csv
+import gzip
+import io
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.http import QueryDict
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from locations.models import Location
+from partyoria_backend.pricing import parse_price_range
+from users.models import User
+from venues.models import VenueDetails
+from .facets import build_facet_index, filter_by_facets, selected_facets
+from .models import Event, EventGuest, EventStat, Venue
+from .serializers import VenueSerializer
+
+class EventListQueryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', email='organizer@example.com', password='secret123')
+    
+    def create_events(self, count, guests_per_event=3):
+        for i in range(count):
+            event = Event.objects.create(
+                title=f'Event {i}',
+                description='Test event',
+                event_type='wedding',
+                date=timezone.now() + timedelta(days=i),
+                location='Mumbai',
+                organizer=self.organizer,
+            )
+            for j in range(guests_per_event):
+                EventGuest.objects.create(event=event, name=f'Guest {j}', email=f'guest{j}@example.com')
+    
+    def test_list_query_count_is_constant(self):
+        self.create_events(3)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/events/')
+        self.create_events(10)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/events/')
+        
+        event = response.json()['results'][0]
+        self.assertEqual(event['guest_count'], 3)
+        self.assertNotIn('guests', event)
+    
+    def test_expanded_guests_query_count_is_constant(self):
+        self.create_events(3)
+        with self.assertNumQueries(2):
+            self.client.get('/api/events/?expand=guests')
+        self.create_events(10)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/events/?expand=guests')
+        
+        self.assertEqual(len(response.json()['results'][0]['guests']), 3)
+    
+    def test_sparse_fieldset(self):
+        self.create_events(2)
+        response = self.client.get('/api/events/?fields=id,title,guest_count')
+        for event in response.json()['results']:
+            self.assertEqual(set(event), {'id', 'title', 'guest_count'})
+    
+    def test_detail_includes_guests(self):
+        self.create_events(1)
+        event = Event.objects.get()
+        response = self.client.get(f'/api/events/{event.id}/')
+        self.assertEqual(len(response.json()['guests']), 3)
+        self.assertEqual(response.json()['organizer_name'], '')
+
+class PaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', email='organizer@example.com', password='secret123')
+    
+    def create_event(self, title):
+        return Event.objects.create(
+            title=title, description='Test event', event_type='wedding', date=timezone.now(),
+            location='Mumbai', organizer=self.organizer,
+        )
+    
+    def titles(self, url):
+        data = self.client.get(url).json()
+        return [event['title'] for event in data['results']], data['next']
+    
+    def test_cursor_is_stable_across_inserts(self):
+        for i in range(5):
+            self.create_event(f'Event {i}')
+    
+        first, next_url = self.titles('/api/events/?page_size=2')
+        self.assertEqual(first, ['Event 4', 'Event 3'])
+        self.create_event('Newer')
+        second, next_url = self.titles(next_url)
+        third, next_url = self.titles(next_url)
+        self.assertEqual(second + third, ['Event 2', 'Event 1', 'Event 0'])
+        self.assertIsNone(next_url)
+    
+    def test_page_size_is_clamped(self):
+        Event.objects.bulk_create([
+            Event(title=f'Event {i}', description='Test event', event_type='wedding', date=timezone.now(), location='Mumbai', organizer=self.organizer)
+            for i in range(205)
+        ])
+        self.assertEqual(len(self.client.get('/api/events/').json()['results']), 50)
+        self.assertEqual(len(self.client.get('/api/events/?page_size=500').json()['results']), 200)
+    
+    def test_view_cursor_ordering(self):
+        for name, price in [('C', '₹30,000'), ('A', '₹10,000'), ('B', '₹20,000'), ('B2', '₹20,000'), ('Unpriced', 'On request')]:
+            Venue.objects.create(name=name, type='Hall', location='Centre', city='Mumbai', price=price, image='https://example.com/v.jpg')
+    
+        names = []
+        url = '/api/venues/?sort=price&page_size=2'
+        while url:
+            data = self.client.get(url).json()
+            names += [venue['name'] for venue in data['results']]
+            url = data['next']
+        self.assertEqual(names, ['A', 'B', 'B2', 'C'])
+        self.assertEqual(self.client.get('/api/venues/?sort=name').status_code, 400)
+
+class AllVenuesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Location.objects.create(state='Maharashtra', city='Mumbai')
+        for city, names in [('Mumbai', ['Sea Lounge', 'Grand Hall', 'Rooftop']), ('Pune', ['Garden Court']), ('Delhi', ['Imperial'])]:
+            for name in names:
+                Venue.objects.create(
+                    name=name, type='Banquet Hall', location=f'Central {city}', city=city,
+                    price='₹50,000 - ₹80,000', rating=4.5, reviews=10,
+                    image='https://example.com/venue.jpg', suitability=['Weddings'], badges=['AC'],
+                )
+    
+    def test_output_matches_per_row_serializer(self):
+        expected = {}
+        for venue in Venue.objects.order_by('city', 'name'):
+            expected.setdefault(venue.city, []).append(VenueSerializer(venue).data)
+        
+        response = self.client.get('/api/venues/all/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+    
+    def test_cities_filter_and_limit(self):
+        response = self.client.get('/api/venues/all/?cities=Mumbai,Pune&limit=2')
+        data = response.json()
+        self.assertEqual(list(data), ['Mumbai', 'Pune'])
+        self.assertEqual([venue['name'] for venue in data['Mumbai']], ['Grand Hall', 'Rooftop'])
+
+class VenuesByCityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.mumbai = Location.objects.create(state='Maharashtra', city='Mumbai')
+        for city in ['Mumbai', 'mumbai', 'Atlantis']:
+            Venue.objects.create(name=f'{city} Hall', type='Hall', location='Centre', city=city, price='₹10,000', image='https://example.com/v.jpg')
+    
+    def test_catalog_city_uses_location_fk(self):
+        self.assertEqual(Venue.objects.filter(city_location=self.mumbai).count(), 2)
+        response = self.client.get('/api/venues/city/MUMBAI/')
+        self.assertEqual(sorted(venue['name'] for venue in response.json()), ['Mumbai Hall', 'mumbai Hall'])
+    
+    def test_unknown_city_falls_back_to_case_insensitive_match(self):
+        response = self.client.get('/api/venues/city/atlantis/')
+        self.assertEqual([venue['name'] for venue in response.json()], ['Atlantis Hall'])
+    
+    def test_new_location_links_existing_venues(self):
+        atlantis = Location.objects.create(state='Ocean', city='Atlantis')
+        self.assertEqual(Venue.objects.get(city='Atlantis').city_location, atlantis)
+    
+    def test_cities_come_from_the_catalog(self):
+        self.assertEqual(self.client.get('/api/cities/').json(), ['Mumbai'])
+    
+    def test_venue_details_city_filter_includes_unresolved_rows(self):
+        for name, location in [('Linked', 'Bandra, Mumbai'), ('Unlinked', 'Andheri East Mumbai'), ('Elsewhere', 'Fort Kochi')]:
+            VenueDetails.objects.create(
+                venue_name=name, location=location, capacity=100, price_range='₹10,000',
+                image_url='https://example.com/v.jpg', description='Venue',
+            )
+        self.assertIsNone(VenueDetails.objects.get(venue_name='Unlinked').city_location_id)
+        response = self.client.get('/api/venue-details/?city=Mumbai')
+        self.assertEqual(sorted(venue['venue_name'] for venue in response.json()['results']), ['Linked', 'Unlinked'])
+
+class VenuePriceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for name, price, rating in [('Budget Hall', '₹25,000 - ₹45,000', 4.1), ('Royal Hotel', '₹70,000 - ₹1,20,000', 4.9), ('Open Lawn', '₹40,000 onwards', 4.5), ('Mystery', 'On request', 3.0)]:
+            Venue.objects.create(name=name, type='Hall', location='Centre', city='Mumbai', price=price, rating=rating, image='https://example.com/v.jpg')
+    
+    def test_parse_price_range(self):
+        self.assertEqual(parse_price_range('₹70,000 - ₹1,20,000'), (70000, 120000))
+        self.assertEqual(parse_price_range('Rs 1.5 - 2 Lakh'), (150000, 200000))
+        self.assertEqual(parse_price_range('Up to ₹40,000'), (0, 40000))
+        self.assertEqual(parse_price_range('₹2 Cr'), (20000000, 20000000))
+        self.assertEqual(parse_price_range('25k onwards'), (25000, None))
+        self.assertEqual(parse_price_range('On request'), (None, None))
+    
+    def test_budget_filter_and_price_sort(self):
+        response = self.client.get('/api/venues/?budget_min=50000&budget_max=100000&sort=price')
+        self.assertEqual([venue['name'] for venue in response.json()['results']], ['Open Lawn', 'Royal Hotel'])
+    
+    def test_rating_sort_by_city(self):
+        response = self.client.get('/api/venues/city/Mumbai/?sort=rating')
+        self.assertEqual([venue['name'] for venue in response.json()], ['Royal Hotel', 'Open Lawn', 'Budget Hall', 'Mystery'])
+    
+    def test_invalid_params_are_rejected(self):
+        self.assertEqual(self.client.get('/api/venues/?budget_min=cheap').status_code, 400)
+        self.assertEqual(self.client.get('/api/venues/?sort=name').status_code, 400)
+
+class VenueFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        venues = [
+            ('Palace', 'Mumbai', 'Banquet Hall', '₹60,000', ['Weddings', 'Corporate Events'], ['AC', 'Parking']),
+            ('Garden', 'Mumbai', 'Garden Venue', '₹30,000', ['Weddings', 'Birthday Parties'], ['Garden']),
+            ('Hub', 'Pune', 'Conference Hall', '₹20,000', ['Corporate Events'], ['AC']),
+        ]
+        for name, city, venue_type, price, suitability, badges in venues:
+            Venue.objects.create(
+                name=name, type=venue_type, location='Centre', city=city, price=price,
+                image='https://example.com/v.jpg', suitability=suitability, badges=badges,
+            )
+    
+    def test_counts_for_selection(self):
+        data = self.client.get('/api/venues/facets/?suitability=Weddings').json()
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['facets']['city'], {'Mumbai': 2})
+        self.assertEqual(data['facets']['badge'], {'AC': 1, 'Garden': 1, 'Parking': 1})
+        self.assertEqual(data['facets']['price'], {'25k-50k': 1, '50k-1l': 1})
+        # The selected facet is counted without its own filter
+        self.assertEqual(data['facets']['suitability'], {'Birthday Parties': 1, 'Corporate Events': 2, 'Weddings': 2})
+    
+    def test_list_filters_by_facets_and_follows_writes(self):
+        response = self.client.get('/api/venues/?badge=AC&city=Pune,Mumbai')
+        self.assertEqual(sorted(venue['name'] for venue in response.json()['results']), ['Hub', 'Palace'])
+        
+        Venue.objects.filter(name='Hub').delete()
+        response = self.client.get('/api/venues/?badge=AC')
+        self.assertEqual([venue['name'] for venue in response.json()['results']], ['Palace'])
+    
+    @override_settings(FACET_ID_LIMIT=1)
+    def test_broad_selection_filters_in_sql(self):
+        params = QueryDict('city=Mumbai,Pune&type=Banquet Hall,Conference Hall&price=50k-1l,under-25k')
+        queryset = filter_by_facets(Venue.objects.all(), selected_facets(params), build_facet_index())
+        self.assertNotIn(' IN (', str(queryset.query))
+        self.assertEqual(sorted(queryset.values_list('name', flat=True)), ['Hub', 'Palace'])
+        
+        response = self.client.get('/api/venues/?badge=AC&city=Pune,Mumbai')
+        self.assertEqual(sorted(venue['name'] for venue in response.json()['results']), ['Hub', 'Palace'])
+
+class VenueNearbyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for name, lat, lng in [('Bandra', 19.0596, 72.8295), ('Thane', 19.2183, 72.9781), ('Pune', 18.5204, 73.8567), ('Unmapped', None, None)]:
+            Venue.objects.create(
+                name=name, type='Hall', location=name, city='Mumbai', price='₹10,000',
+                image='https://example.com/v.jpg', latitude=lat, longitude=lng,
+            )
+    
+    def test_nearby_sorted_by_distance(self):
+        response = self.client.get('/api/venues/nearby/?lat=19.076&lng=72.8777&radius_km=25')
+        results = response.json()['results']
+        self.assertEqual([venue['name'] for venue in results], ['Bandra', 'Thane'])
+        self.assertLess(results[0]['distance_km'], results[1]['distance_km'])
+    
+    def test_large_radius_uses_coarser_cells(self):
+        response = self.client.get('/api/venues/nearby/?lat=19.076&lng=72.8777&radius_km=100')
+        self.assertEqual([venue['name'] for venue in response.json()['results']], ['Bandra', 'Thane'])
+        response = self.client.get('/api/venues/nearby/?lat=19.076&lng=72.8777&radius_km=100&limit=1')
+        self.assertEqual([venue['name'] for venue in response.json()['results']], ['Bandra'])
+    
+    def test_requires_coordinates(self):
+        self.assertEqual(self.client.get('/api/venues/nearby/?lat=19.07').status_code, 400)
+
+class GuestImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', email='organizer@example.com', password='secret123')
+        self.event = Event.objects.create(
+            title='Wedding', description='Test event', event_type='wedding',
+            date=timezone.now(), location='Mumbai', organizer=self.organizer,
+        )
+        self.url = f'/api/events/{self.event.pk}/guests/import/'
+    
+    def test_csv_import_dedupes_and_reports_bad_rows(self):
+        EventGuest.objects.create(event=self.event, name='Asha', email='asha@example.com', rsvp_status='accepted')
+        body = (
+            'Name,Email,Phone\n'
+            'Asha Rao,ASHA@example.com,98200\n'
+            'Ravi,ravi@example.com,\n'
+            'Ravi Kumar,ravi@example.com,99300\n'
+            ',nobody@example.com,\n'
+            'Meena,not-an-email,\n'
+        )
+        response = self.client.generic('POST', self.url, body.encode(), content_type='text/csv')
+        self.assertEqual(response.status_code, 200, response.content)
+        report = response.json()
+        self.assertEqual((report['rows'], report['created'], report['updated'], report['duplicates']), (5, 1, 1, 1))
+        self.assertEqual([(error['row'], list(error['errors'])) for error in report['errors']], [(5, ['name']), (6, ['email'])])
+        
+        guests = {guest.email: guest for guest in self.event.guests.all()}
+        self.assertEqual(set(guests), {'asha@example.com', 'ravi@example.com'})
+        self.assertEqual((guests['asha@example.com'].name, guests['asha@example.com'].rsvp_status), ('Asha Rao', 'accepted'))
+        self.assertEqual(guests['ravi@example.com'].phone, '99300')
+    
+    def test_ndjson_file_upload_and_dry_run(self):
+        lines = '\n'.join([
+            '{"name": "Guest 1", "email": "g1@example.com", "rsvp_status": "accepted"}',
+            '{"name": "Guest 2", "email": "g2@example.com", "rsvp_status": "maybe"}',
+            'not json',
+        ])
+        upload = SimpleUploadedFile('guests.ndjson', lines.encode())
+        response = self.client.post(self.url + '?dry_run=true', {'file': upload}, format='multipart')
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual([error['row'] for error in response.json()['errors']], [2, 3])
+        self.assertFalse(self.event.guests.exists())
+        
+        upload = SimpleUploadedFile('guests.ndjson', lines.encode())
+        self.client.post(self.url, {'file': upload}, format='multipart')
+        self.assertEqual(list(self.event.guests.values_list('email', 'rsvp_status')), [('g1@example.com', 'accepted')])
+    
+    def test_unknown_format_is_rejected(self):
+        response = self.client.generic('POST', self.url, b'name,email\n', content_type='text/plain')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_guest_list_and_create(self):
+        url = f'/api/events/{self.event.pk}/guests/'
+        response = self.client.post(url, {'name': 'Asha', 'email': 'Asha@Example.com'}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['event'], self.event.pk)
+        self.assertEqual(self.client.post(url, {'name': 'Asha', 'email': 'asha@example.com'}, format='json').status_code, 400)
+        self.assertEqual([guest['email'] for guest in self.client.get(url).json()['results']], ['asha@example.com'])
+
+class RSVPCounterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', email='organizer@example.com', password='secret123')
+        self.event = Event.objects.create(
+            title='Wedding', description='Test event', event_type='wedding',
+            date=timezone.now(), location='Mumbai', organizer=self.organizer,
+        )
+    
+    def counts(self):
+        self.event.refresh_from_db()
+        return (self.event.rsvp_accepted, self.event.rsvp_declined, self.event.rsvp_pending)
+    
+    def test_counters_follow_guest_writes(self):
+        asha = EventGuest.objects.create(event=self.event, name='Asha', email='asha@example.com')
+        ravi = EventGuest.objects.create(event=self.event, name='Ravi', email='ravi@example.com')
+        self.assertEqual(self.counts(), (0, 0, 2))
+        
+        asha.rsvp_status = 'accepted'
+        asha.save()
+        # A stale copy still moves the counter from the stored status
+        stale = EventGuest.objects.get(pk=ravi.pk)
+        ravi.rsvp_status = 'declined'
+        ravi.save()
+        stale.rsvp_status = 'accepted'
+        stale.save()
+        self.assertEqual(self.counts(), (2, 0, 0))
+        
+        asha.delete()
+        self.assertEqual(self.counts(), (1, 0, 0))
+        self.assertEqual(self.client.get(f'/api/events/{self.event.pk}/').json()['guest_count'], 1)
+    
+    def test_bulk_rsvp_and_import_adjust_counters(self):
+        self.client.generic(
+            'POST', f'/api/events/{self.event.pk}/guests/import/',
+            ''.join(f'Guest {i},guest{i}@example.com\n' for i in range(5)).join(['name,email\n', '']).encode(),
+            content_type='text/csv',
+        )
+        self.assertEqual(self.counts(), (0, 0, 5))
+        
+        response = self.client.post(f'/api/events/{self.event.pk}/guests/rsvp/', {
+            'rsvp_status': 'accepted', 'emails': ['GUEST0@example.com', 'guest1@example.com', 'guest2@example.com'],
+        }, format='json')
+        self.assertEqual(response.json(), {'updated': 3, 'rsvp_counts': {'accepted': 3, 'declined': 0, 'pending': 2}})
+        
+        guest_ids = list(self.event.guests.filter(email__in=['guest2@example.com', 'guest3@example.com']).values_list('id', flat=True))
+        response = self.client.post(f'/api/events/{self.event.pk}/guests/rsvp/', {'rsvp_status': 'declined', 'guest_ids': guest_ids}, format='json')
+        self.assertEqual(response.json()['rsvp_counts'], {'accepted': 2, 'declined': 2, 'pending': 1})
+        
+        response = self.client.post(f'/api/events/{self.event.pk}/guests/rsvp/', {'rsvp_status': 'declined'}, format='json')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_reconcile_repairs_drift(self):
+        EventGuest.objects.create(event=self.event, name='Asha', email='asha@example.com')
+        EventGuest.objects.filter(event=self.event).update(rsvp_status='accepted')
+        self.assertEqual(self.counts(), (0, 0, 1))
+        
+        call_command('reconcile_rsvp_counters', stdout=StringIO())
+        self.assertEqual(self.counts(), (1, 0, 0))
+    
+    def test_event_saves_keep_the_counters(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        EventGuest.objects.create(event=self.event, name='Asha', email='asha@example.com')
+        stale.title = 'Sangeet'
+        stale.save()
+        self.assertEqual(self.counts(), (0, 0, 1))
+        self.assertEqual(self.event.title, 'Sangeet')
+    
+    def test_saving_a_deleted_event_inserts_it_again(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        EventGuest.objects.create(event=self.event, name='Asha', email='asha@example.com')
+        self.event.delete()
+        stale.title = 'Sangeet'
+        stale.save()
+        
+        event = Event.objects.get(pk=stale.pk)
+        self.assertEqual((event.title, event.rsvp_accepted, event.rsvp_declined, event.rsvp_pending), ('Sangeet', 0, 0, 0))
+        self.assertEqual(EventStat.objects.get(organizer=None, dimension='event_type', key='wedding').event_count, 1)
+    
+    def test_event_delete_skips_per_guest_counter_updates(self):
+        def delete_queries(guests):
+            event = Event.objects.create(
+                title='Party', description='Test event', event_type='birthday',
+                date=timezone.now(), location='Pune', organizer=self.organizer,
+            )
+            for i in range(guests):
+                EventGuest.objects.create(event=event, name=f'Guest {i}', email=f'guest{i}@example.com')
+            with CaptureQueriesContext(connection) as queries:
+                event.delete()
+            return len(queries)
+        
+        self.assertEqual(delete_queries(2), delete_queries(20))
+        self.assertFalse(EventGuest.objects.exists())
+
+class EventStatsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.asha = User.objects.create_user(username='asha', email='asha@example.com', password='secret123')
+        self.ravi = User.objects.create_user(username='ravi', email='ravi@example.com', password='secret123')
+    
+    def create_event(self, organizer, event_type, date, budget=None, attendees=0, **extra):
+        return Event.objects.create(
+            title='Event', description='Test event', event_type=event_type, date=date, location='Mumbai',
+            budget=budget, attendees_count=attendees, organizer=organizer, **extra,
+        )
+    
+    def test_rollup_follows_saves_and_deletes(self):
+        march = timezone.make_aware(timezone.datetime(2026, 3, 14, 18))
+        april = timezone.make_aware(timezone.datetime(2026, 4, 2, 18))
+        wedding = self.create_event(self.asha, 'wedding', march, budget=500000, attendees=300)
+        self.create_event(self.asha, 'birthday', april, budget=20000, attendees=40)
+        self.create_event(self.ravi, 'wedding', april, attendees=100)
+        
+        stats = self.client.get('/api/events/stats/').json()
+        self.assertEqual(stats['totals'], {'count': 3, 'total_budget': '520000.00', 'total_attendees': 440})
+        self.assertEqual(stats['by_event_type']['wedding']['count'], 2)
+        self.assertEqual(stats['by_month']['2026-04']['total_attendees'], 140)
+        
+        wedding.status = 'confirmed'
+        wedding.date = april
+        wedding.save()
+        stats = self.client.get(f'/api/events/stats/?organizer={self.asha.pk}').json()
+        self.assertEqual(stats['by_status'], {
+            'confirmed': {'count': 1, 'total_budget': '500000.00', 'total_attendees': 300},
+            'planning': {'count': 1, 'total_budget': '20000.00', 'total_attendees': 40},
+        })
+        self.assertEqual(list(stats['by_month']), ['2026-04'])
+        
+        wedding.delete()
+        stats = self.client.get('/api/events/stats/').json()
+        self.assertEqual(stats['totals']['count'], 2)
+        self.assertNotIn('confirmed', stats['by_status'])
+    
+    def test_deleting_an_organizer_removes_their_rollup(self):
+        self.create_event(self.asha, 'wedding', timezone.now(), budget=1000, attendees=10)
+        self.create_event(self.ravi, 'corporate', timezone.now(), budget=2500, attendees=25)
+    
+        asha_id = self.asha.pk
+        self.asha.delete()
+        self.assertFalse(EventStat.objects.filter(organizer_id=asha_id).exists())
+        stats = self.client.get('/api/events/stats/').json()
+        self.assertEqual(stats['totals'], {'count': 1, 'total_budget': '2500.00', 'total_attendees': 25})
+    
+    def test_rebuild_matches_incremental_rollup(self):
+        date = timezone.now()
+        self.create_event(self.asha, 'wedding', date, budget=1000, attendees=10)
+        self.create_event(self.ravi, 'corporate', date, budget=2500, attendees=25)
+        incremental = self.client.get('/api/events/stats/').json()
+        
+        EventStat.objects.all().delete()
+        call_command('rebuild_event_stats', stdout=StringIO())
+        self.assertEqual(self.client.get('/api/events/stats/').json(), incremental)
+
+class ExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(username='organizer', email='organizer@example.com', password='secret123')
+        self.event = Event.objects.create(
+            title='Wedding, Mumbai', description='Test event', event_type='wedding',
+            date=timezone.now(), location='Mumbai', budget=250000, organizer=self.organizer,
+        )
+        for i in range(3):
+            EventGuest.objects.create(event=self.event, name=f'Guest {i}', email=f'guest{i}@example.com')
+    
+    def test_guest_csv_export_round_trips_through_import(self):
+        response = self.client.get(f'/api/events/{self.event.pk}/guests/export/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="event-{self.event.pk}-guests.csv"')
+        body = b''.join(response.streaming_content)
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual([row['email'] for row in rows], ['guest0@example.com', 'guest1@example.com', 'guest2@example.com'])
+        
+        other = Event.objects.create(
+            title='Reception', description='Test event', event_type='wedding',
+            date=timezone.now(), location='Mumbai', organizer=self.organizer,
+        )
+        report = self.client.generic('POST', f'/api/events/{other.pk}/guests/import/', body, content_type='text/csv').json()
+        self.assertEqual((report['created'], report['error_count']), (3, 0))
+    
+    def test_gzipped_ndjson_event_export(self):
+        response = self.client.get('/api/events/export/?fmt=ndjson&gzip=true')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        event = json.loads(lines[0])
+        self.assertEqual((event['title'], event['budget'], event['rsvp_pending']), ('Wedding, Mumbai', '250000.00', 3))
+    
+    def test_export_command_and_bad_format(self):
+        Venue.objects.create(name='Palace', type='Banquet', location='Andheri', city='Mumbai', price='₹50,000', image='https://example.com/a.jpg')
+        with tempfile.NamedTemporaryFile(suffix='.csv') as output:
+            call_command('export_data', 'venues', '--output', output.name, stderr=StringIO())
+            rows = list(csv.DictReader(open(output.name, encoding='utf-8')))
+        self.assertEqual((rows[0]['name'], rows[0]['price']), ('Palace', '₹50,000'))
+        self.assertEqual(self.client.get('/api/venues/export/?fmt=xml').status_code, 400)
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Location.objects.create(state='Maharashtra', city='Mumbai')
+        self.venue = Venue.objects.create(name='Sea Lounge', type='Hall', location='Bandra', city='Mumbai', price='₹10,000', image='https://example.com/v.jpg')
+        Venue.objects.create(name='Garden Court', type='Hall', location='Kothrud', city='Pune', price='₹10,000', image='https://example.com/v.jpg')
+    
+    def test_repeat_read_is_served_from_cache(self):
+        first = self.client.get('/api/venues/all/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/venues/all/')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+    
+    def test_query_parameter_order_shares_an_entry(self):
+        self.client.get('/api/venues/all/?cities=Mumbai&limit=1')
+        self.assertEqual(self.client.get('/api/venues/all/?limit=1&cities=Mumbai')['X-Cache'], 'HIT')
+    
+    def test_venue_write_invalidates_list_and_city(self):
+        self.client.get('/api/venues/all/')
+        self.client.get('/api/venues/city/mumbai/')
+        self.venue.name = 'Harbour Lounge'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.venue.save()
+        
+        response = self.client.get('/api/venues/all/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['Mumbai'][0]['name'], 'Harbour Lounge')
+        self.assertEqual(self.client.get('/api/venues/city/mumbai/')['X-Cache'], 'MISS')
+    
+    def test_city_tags_are_independent(self):
+        self.client.get('/api/venues/city/pune/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.venue.save()
+        self.assertEqual(self.client.get('/api/venues/city/pune/')['X-Cache'], 'HIT')
+    
+    def test_moving_a_venue_invalidates_its_previous_city(self):
+        self.client.get('/api/venues/city/mumbai/')
+        self.venue.city = 'Pune'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.venue.save()
+        response = self.client.get('/api/venues/city/mumbai/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json(), [])
+    
+    def test_stale_entry_is_served_while_another_request_rebuilds(self):
+        from partyoria_backend.response_cache import response_key
+        
+        first = self.client.get('/api/venues/all/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.venue.save()
+        key = response_key(first.wsgi_request)
+        cache.add(f'{key}:lock', 1)
+        response = self.client.get('/api/venues/all/')
+        self.assertEqual(response['X-Cache'], 'STALE')
+        self.assertEqual(response.content, first.content)
+    
+    def test_invalidation_waits_for_commit(self):
+        self.client.get('/api/venues/all/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.venue.save()
+            # Until the write commits, other connections would still read the old rows
+            self.assertEqual(self.client.get('/api/venues/all/')['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get('/api/venues/all/')['X-Cache'], 'MISS')
+
+class AsyncCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Location.objects.create(state='Maharashtra', city='Mumbai')
+        for name, city, badges in [('Sea Lounge', 'Mumbai', ['AC']), ('Grand Hall', 'Mumbai', []), ('Garden Court', 'Pune', ['AC'])]:
+            Venue.objects.create(
+                name=name, type='Hall', location='Centre', city=city, price='₹10,000 - ₹20,000',
+                rating=4.0, image='https://example.com/v.jpg', badges=badges,
+            )
+        for name, price in [('Lakeside Pavilion', '₹40,000'), ('Harbour Deck', '₹25,000')]:
+            VenueDetails.objects.create(
+                venue_name=name, location='Bandra, Mumbai', capacity=100, price_range=price,
+                image_url='https://example.com/v.jpg', description='Venue',
+            )
+    
+    def async_request(self, method, path):
+        async def send():
+            return await getattr(self.async_client, method)(path)
+        return async_to_sync(send)()
+    
+    def test_async_views_match_sync_views(self):
+        paths = [
+            '/api/venues/city/mumbai/', '/api/venues/city/MUMBAI/?sort=price&badge=AC', '/api/venues/city/atlantis/',
+            '/api/venues/all/', '/api/venues/all/?cities=Pune&limit=1', '/api/venues/all/?limit=zero',
+            '/api/cities/', '/api/locations/', '/api/venue-details/?sort=price&city=Mumbai', '/api/venue-details/?sort=name',
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                cache.clear()
+                expected = self.client.get(path)
+                cache.clear()
+                response = self.async_request('get', path)
+                self.assertTrue(iscoroutinefunction(response.resolver_match.func))
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+    
+    def test_async_views_share_the_response_cache(self):
+        self.client.get('/api/cities/')
+        response = self.async_request('get', '/api/cities/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Location.objects.create(state='Delhi', city='Delhi')
+            Venue.objects.create(name='Imperial', type='Hall', location='Centre', city='Delhi', price='₹10,000', image='https://example.com/v.jpg')
+        response = self.async_request('get', '/api/cities/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json(), ['Delhi', 'Mumbai'])
+    
+    def test_in_process_cache_is_read_inline(self):
+        self.client.get('/api/cities/')
+        with mock.patch('partyoria_backend.response_cache.sync_to_async') as thread_hop:
+            response = self.async_request('get', '/api/cities/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        thread_hop.assert_not_called()
+    
+    def test_other_endpoints_fall_through_to_sync_views(self):
+        response = self.async_request('get', '/api/venues/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(iscoroutinefunction(response.resolver_match.func))
+        response = self.async_request('post', '/api/cities/')
+        self.assertEqual(response.status_code, 405)
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        from partyoria_backend.metrics import registry
+        
+        cache.clear()
+        registry.reset()
+        self.client = APIClient()
+        Venue.objects.create(name='Sea Lounge', type='Hall', location='Bandra', city='Mumbai', price='₹10,000', image='https://example.com/v.jpg')
+    
+    def scrape(self):
+        response = self.client.get('/api/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+    
+    def test_requests_are_recorded_per_view(self):
+        self.client.get('/api/venues/all/')
+        self.client.get('/api/venues/all/')
+        self.client.get('/api/nowhere/')
+        body = self.scrape()
+        self.assertIn('http_requests_total{view="all-venues",method="GET",status="200"} 2', body)
+        self.assertIn('http_requests_total{view="<unresolved>",method="GET",status="404"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="all-venues",le="+Inf"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{view="all-venues"} 2', body)
+        # The first request queries the database, the second is a response cache hit
+        self.assertIn('db_queries_per_request_bucket{view="all-venues",le="0"} 1', body)
+        self.assertIn('db_queries_per_request_count{view="all-venues"} 2', body)
+        self.assertIn('db_query_duration_seconds_total{view="all-venues"}', body)
+    
+    def test_worker_files_are_summed(self):
+        with tempfile.TemporaryDirectory() as directory, self.settings(METRICS_MULTIPROC_DIR=directory):
+            self.client.get('/api/cities/')
+            with open(f'{directory}/999999.json', 'w') as f:
+                json.dump([['http_requests_total', [['view', 'cities-list'], ['method', 'GET'], ['status', '200']], 4]], f)
+            body = self.scrape()
+        self.assertIn('http_requests_total{view="cities-list",method="GET",status="200"} 5', body)
+    
+    def test_token_is_required_when_configured(self):
+        with self.settings(METRICS_TOKEN='s3cret'):
+            self.assertEqual(self.client.get('/api/metrics').status_code, 401)
+            self.client.credentials(HTTP_AUTHORIZATION='Bearer s3cret')
+            self.assertEqual(self.client.get('/api/metrics').status_code, 200)
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        overrides = self.settings(PROFILE_DIR=self.directory.name, PROFILE_MAX_ENTRIES=2)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='secret123', is_staff=True)
+        Venue.objects.create(name='Sea Lounge', type='Hall', location='Bandra', city='Mumbai', price='₹10,000', image='https://example.com/v.jpg')
+    
+    def profile_token(self):
+        self.client.force_authenticate(self.admin)
+        token = self.client.post('/api/admin/profiles/token/').json()['token']
+        self.client.force_authenticate(None)
+        return token
+    
+    def profiles(self):
+        self.client.force_authenticate(self.admin)
+        return self.client.get('/api/admin/profiles/').json()['results']
+    
+    def test_signed_header_profiles_the_request(self):
+        token = self.profile_token()
+        response = self.client.get('/api/venues/city/mumbai/', HTTP_X_PROFILE=token)
+        self.assertEqual(response.status_code, 200)
+        
+        [entry] = self.profiles()
+        self.assertEqual((entry['view'], entry['trigger'], entry['status']), ('venues-by-city', 'header', 200))
+        summary = self.client.get(f'/api/admin/profiles/{entry["id"]}/').json()
+        self.assertTrue(summary['top_functions'])
+        venue_query = next(statement for statement in summary['sql'] if 'events_venue' in statement['sql'])
+        self.assertIn('explain', venue_query)
+        
+        stacks = b''.join(self.client.get(f'/api/admin/profiles/{entry["id"]}/stacks/').streaming_content)
+        for line in stacks.decode().splitlines():
+            self.assertRegex(line, r' \d+$')
+    
+    def test_unsigned_or_unsampled_requests_are_not_profiled(self):
+        self.client.get('/api/cities/', HTTP_X_PROFILE='forged')
+        self.client.get('/api/cities/')
+        self.assertEqual(self.profiles(), [])
+    
+    def test_sampling_keeps_only_the_newest_entries(self):
+        with self.settings(PROFILE_SAMPLE_RATE=1):
+            for path in ['/api/cities/', '/api/venues/all/', '/api/locations/']:
+                self.client.get(path)
+        self.assertEqual([entry['view'] for entry in self.profiles()], ['location-list', 'all-venues'])
+    
+    def test_profiles_are_admin_only(self):
+        self.assertEqual(self.client.get('/api/admin/profiles/').status_code, 401)
+        self.assertEqual(self.client.post('/api/admin/profiles/token/').status_code, 401)
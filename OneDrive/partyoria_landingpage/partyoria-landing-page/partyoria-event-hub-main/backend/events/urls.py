@@ -6,10 +6,11 @@ router = DefaultRouter()
 router.register(r'events', views.EventViewSet)
 router.register(r'venues', views.VenueViewSet)
 
+# Explicit routes come before the router so /api/venues/all/ is not
+# captured by the venue detail route
 urlpatterns = [
-    path('api/', include(router.urls)),
     path('api/venues/city/<str:city>/', views.venues_by_city, name='venues-by-city'),
     path('api/venues/all/', views.all_venues, name='all-venues'),
     path('api/cities/', views.cities_list, name='cities-list'),
-    path('api/locations/', views.locations, name='locations'),
+    path('api/', include(router.urls)),
 ]
\ No newline at end of file
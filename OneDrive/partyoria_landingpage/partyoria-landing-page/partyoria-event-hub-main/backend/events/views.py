@@ -1,72 +1,280 @@
+import os
+
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Lower
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from locations.catalog import location_ids_for_city
+from locations.models import Location
+from partyoria_backend import geo
+from partyoria_backend.pricing import budget_filter
+from partyoria_backend.response_cache import CachedResponseMixin, cache_response
+from partyoria_backend.streaming import export_options, export_response
 from .models import Event, Venue
-from .serializers import EventSerializer, VenueSerializer
+from .columnar import grouped_venues
+from .facets import facet_index, filter_by_facets, selected_facets
+from .guest_import import GuestImportError, import_guests, iter_text_lines
+from . import exports, stats as event_stats
+from .rsvp import RSVP_FIELDS, bulk_rsvp
+from .serializers import BulkRSVPSerializer, EventGuestSerializer, EventSerializer, VenueSerializer
+
+GUEST_IMPORT_CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+GUEST_IMPORT_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+def organizer_param(request):
+    organizer = request.query_params.get('organizer')
+    if organizer is None:
+        return None
+    try:
+        return int(organizer)
+    except ValueError:
+        raise ValidationError({'organizer': 'Must be a user id.'})
 
 class EventViewSet(viewsets.ModelViewSet):
+    """
+    Events with sparse fieldsets.
+    
+    `?fields=id,title,...` limits the returned fields. List responses carry
+    `guest_count` (from the RSVP counters) and only include full guest lists
+    with `?expand=guests`; detail responses always include guests.
+    """
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    
+    def get_expand(self):
+        expand = {name.strip() for name in self.request.query_params.get('expand', '').split(',') if name.strip()}
+        if self.action != 'list':
+            expand.add('guests')
+        return expand
+    
+    def get_queryset(self):
+        queryset = Event.objects.select_related('organizer')
+        if 'guests' in self.get_expand():
+            queryset = queryset.prefetch_related('guests')
+        return queryset
+    
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            kwargs.setdefault('fields', self.get_serializer_fields())
+        return super().get_serializer(*args, **kwargs)
+    
+    def get_serializer_fields(self):
+        requested = self.request.query_params.get('fields')
+        if requested:
+            fields = {name.strip() for name in requested.split(',') if name.strip()}
+        else:
+            fields = set(self.get_serializer_class()().fields)
+        if 'guests' not in self.get_expand():
+            fields.discard('guests')
+        return fields
+    
+    @action(detail=False)
+    def stats(self, request):
+        """Event counts, budget and attendees by event_type, status and month, for ?organizer= or all events"""
+        return Response(event_stats.stats_for(organizer_param(request)))
+    
+    @action(detail=False)
+    def export(self, request):
+        """Stream all events (or ?organizer='s) as ?fmt=csv|ndjson, optionally ?gzip=true"""
+        fmt, compress = export_options(request.query_params)
+        queryset, columns = exports.event_export(organizer_param(request))
+        return export_response(queryset, columns, fmt, 'events', compress=compress)
+    
+    def get_event(self, pk):
+        # The detail queryset annotates and prefetches guests, which the guest endpoints don't need
+        event = get_object_or_404(Event.objects.all(), pk=pk)
+        self.check_object_permissions(self.request, event)
+        return event
+    
+    @action(detail=True, methods=['get', 'post'])
+    def guests(self, request, pk=None):
+        """List an event's guests, or add one"""
+        event = self.get_event(pk)
+        if request.method == 'POST':
+            serializer = EventGuestSerializer(data=request.data, context={'request': request, 'event': event})
+            serializer.is_valid(raise_exception=True)
+            serializer.save(event=event)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        
+        page = self.paginate_queryset(event.guests.all())
+        return self.get_paginated_response(EventGuestSerializer(page, many=True).data)
+    
+    @action(detail=True, methods=['post'], url_path='guests/import')
+    def import_guests(self, request, pk=None):
+        """
+        Bulk import guests from a CSV (name,email,phone,rsvp_status columns) or
+        NDJSON upload, sent as the raw body or as a multipart `file`.
+        
+        The format comes from ?fmt=csv|ndjson, the Content-Type or the file
+        extension. ?dry_run=true validates without saving.
+        """
+        event = self.get_event(pk)
+        fmt = request.query_params.get('fmt')
+        if request.content_type.startswith('multipart/form-data'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                raise ValidationError({'file': 'No file was submitted.'})
+            fmt = fmt or GUEST_IMPORT_EXTENSIONS.get(os.path.splitext(upload.name)[1].lower())
+            chunks = upload
+        else:
+            fmt = fmt or GUEST_IMPORT_CONTENT_TYPES.get(request.content_type.split(';')[0].strip())
+            chunks = request.stream or []
+        
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        try:
+            report = import_guests(event, iter_text_lines(chunks), fmt, dry_run=dry_run)
+        except GuestImportError as e:
+            raise ValidationError({'error': str(e)})
+        except UnicodeDecodeError:
+            raise ValidationError({'error': 'Upload must be UTF-8 encoded.'})
+        return Response(report)
+    
+    @action(detail=True, url_path='guests/export')
+    def export_guests(self, request, pk=None):
+        """Stream the event's guests as ?fmt=csv|ndjson, optionally ?gzip=true"""
+        event = self.get_event(pk)
+        fmt, compress = export_options(request.query_params)
+        queryset, columns = exports.guest_export(event.pk)
+        return export_response(queryset, columns, fmt, f'event-{event.pk}-guests', compress=compress)
+    
+    @action(detail=True, methods=['post'], url_path='guests/rsvp')
+    def bulk_rsvp(self, request, pk=None):
+        """Set one RSVP status for many guests (by `guest_ids` or `emails`) in a single update"""
+        event = self.get_event(pk)
+        serializer = BulkRSVPSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = bulk_rsvp(
+            event, serializer.validated_data['rsvp_status'],
+            guest_ids=serializer.validated_data.get('guest_ids'),
+            emails=serializer.validated_data.get('emails'),
+        )
+        event.refresh_from_db(fields=list(RSVP_FIELDS.values()))
+        return Response({
+            'updated': updated,
+            'rsvp_counts': {rsvp_status: getattr(event, field) for rsvp_status, field in RSVP_FIELDS.items()},
+        })
+
+VENUE_SORT_ORDERINGS = {
+    'price': ('price_min', 'id'),
+    'rating': ('-rating', '-id'),
+}
 
-class VenueViewSet(viewsets.ModelViewSet):
+def venue_sort_ordering(request):
+    sort = request.query_params.get('sort')
+    if not sort:
+        return None
+    if sort not in VENUE_SORT_ORDERINGS:
+        raise ValidationError({'sort': f'Must be one of: {", ".join(VENUE_SORT_ORDERINGS)}.'})
+    return VENUE_SORT_ORDERINGS[sort]
+
+def filter_venues(request, queryset, index=None):
+    """Apply facet filters, ?budget_min=/?budget_max= and ?sort=price|rating to a venue queryset"""
+    selected = selected_facets(request.query_params)
+    if selected:
+        queryset = filter_by_facets(queryset, selected, facet_index.get() if index is None else index)
+    condition = budget_filter(request.query_params)
+    if condition is not None:
+        queryset = queryset.filter(condition)
+    ordering = venue_sort_ordering(request)
+    if ordering and ordering[0] == 'price_min':
+        # Venues without a parseable price cannot be placed on a price keyset
+        queryset = queryset.filter(price_min__isnull=False)
+    return queryset
+
+class VenueViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    """Venues, filterable by ?budget_min=/?budget_max= and sortable by ?sort=price|rating"""
     queryset = Venue.objects.all()
     serializer_class = VenueSerializer
+    cache_tags = ['venue:list']
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = filter_venues(self.request, queryset)
+        return queryset
+    
+    def get_cursor_ordering(self):
+        return venue_sort_ordering(self.request)
+    
+    @action(detail=False)
+    def nearby(self, request):
+        """Venues within ?radius_km= (default 10) of ?lat=&lng=, nearest first"""
+        results = []
+        for distance, venue in geo.nearby(Venue.objects.all(), request.query_params):
+            data = VenueSerializer(venue).data
+            data['distance_km'] = distance
+            results.append(data)
+        return Response({'results': results})
+    
+    @action(detail=False)
+    def export(self, request):
+        """Stream all venues as ?fmt=csv|ndjson, optionally ?gzip=true"""
+        fmt, compress = export_options(request.query_params)
+        queryset, columns = exports.venue_export()
+        return export_response(queryset, columns, fmt, 'venues', compress=compress)
+    
+    @action(detail=False)
+    def facets(self, request):
+        """Venue counts per city, type, badge, suitability and price bucket for the selected facets"""
+        index = facet_index.get()
+        selected = selected_facets(request.query_params)
+        return Response({
+            'total': index.matching(selected).bit_count(),
+            'selected': selected,
+            'facets': index.counts(selected),
+        })
 
 @api_view(['GET'])
+@cache_response(tags=lambda request, city: [f'venue:city:{city.strip().lower()}', 'location'])
 def venues_by_city(request, city):
     """Get venues by city name"""
-    venues = Venue.objects.filter(city__iexact=city)
+    location_ids = location_ids_for_city(city)
+    if location_ids:
+        venues = Venue.objects.filter(city_location_id__in=location_ids)
+    else:
+        # Cities outside the locations table go through the lower(city) expression index
+        venues = Venue.objects.alias(city_lower=Lower('city')).filter(city_lower=city.lower())
+    venues = filter_venues(request, venues)
+    ordering = venue_sort_ordering(request)
+    if ordering:
+        venues = venues.order_by(*ordering)
     serializer = VenueSerializer(venues, many=True)
     return Response(serializer.data)
 
 @api_view(['GET'])
+@cache_response(tags=['venue:list'])
 def all_venues(request):
-    """Get all venues grouped by city"""
-    venues = Venue.objects.all().order_by('city', 'name')
+    """Get all venues grouped by city, optionally filtered by ?cities= and capped per city by ?limit="""
+    cities = [city.strip() for city in request.query_params.get('cities', '').split(',') if city.strip()]
     
-    # Group venues by city
-    venues_by_city = {}
-    for venue in venues:
-        if venue.city not in venues_by_city:
-            venues_by_city[venue.city] = []
-        venues_by_city[venue.city].append(VenueSerializer(venue).data)
+    limit = request.query_params.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({'error': 'limit must be positive'}, status=status.HTTP_400_BAD_REQUEST)
     
-    return Response(venues_by_city)
+    return Response(grouped_venues(cities=cities or None, limit=limit))
 
-@api_view(['GET'])
-def cities_list(request):
-    """Get list of all cities with venues"""
-    cities = Venue.objects.values_list('city', flat=True).distinct().order_by('city')
-    return Response(list(cities))
+def cities_with_venues():
+    """Names of catalog cities linked to at least one venue (a city in two states is listed once)"""
+    return (
+        Location.objects.filter(Exists(Venue.objects.filter(city_location=OuterRef('pk'))))
+        .values_list('city', flat=True).distinct().order_by('city')
+    )
 
 @api_view(['GET'])
-def locations(request):
-    """Get states and cities data from locations table"""
-    from locations.models import Location
-    
-    try:
-        # Get all states
-        states = Location.objects.values_list('state', flat=True).distinct().order_by('state')
-        
-        # Get cities grouped by state
-        cities_by_state = {}
-        for state in states:
-            cities = Location.objects.filter(state=state).values_list('city', flat=True).order_by('city')
-            cities_by_state[state] = list(cities)
-        
-        # Get popular cities (first 15 cities alphabetically)
-        popular_cities = Location.objects.values_list('city', flat=True).distinct().order_by('city')[:15]
-        
-        return Response({
-            'states': list(states),
-            'cities_by_state': cities_by_state,
-            'popular_cities': list(popular_cities)
-        })
-        
-    except Exception as e:
-        return Response({
-            'error': f'Failed to fetch locations: {str(e)}',
-            'states': [],
-            'cities_by_state': {},
-            'popular_cities': []
-        }, status=500)
\ No newline at end of file
+@cache_response(tags=['venue:list'])
+def cities_list(request):
+    """Catalog cities that have at least one venue, through the city_location FK"""
+    return Response(list(cities_with_venues()))
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""Async version of the location catalog view, served under ASGI (see partyoria_backend.async_api)"""
+from partyoria_backend.async_api import async_api_view
+from .catalog import location_catalog
+
+@async_api_view(tags=['location'])
+async def location_list(request):
+    catalog = await location_catalog.aget()
+    return {
+        'states': catalog['states'],
+        'cities_by_state': catalog['cities_by_state'],
+        'popular_cities': catalog['popular_cities'],
+    }
@@ -0,0 +1,48 @@
+from partyoria_backend.snapshots import VersionedSnapshot
+from .models import Location
+from .popularity import match_city, popular_cities
+
+POPULAR_CITIES_LIMIT = 15
+
+def build_catalog():
+    """Build the state -> cities tree and popular cities served by /api/locations/"""
+    cities_by_state = {}
+    city_ids = {}
+    for location_id, state, city in Location.objects.order_by('state', 'city').values_list('id', 'state', 'city'):
+        cities_by_state.setdefault(state, []).append(city)
+        city_ids.setdefault(city.lower(), []).append(location_id)
+    
+    all_cities = sorted({city for cities in cities_by_state.values() for city in cities})
+    
+    # Until the popularity rollup has been refreshed, fall back to alphabetical order
+    popular = popular_cities(all_cities, POPULAR_CITIES_LIMIT) or all_cities[:POPULAR_CITIES_LIMIT]
+    
+    return {
+        'states': list(cities_by_state),
+        'cities_by_state': cities_by_state,
+        'popular_cities': popular,
+        'city_lookup': {city.lower(): city for city in all_cities},
+        'city_ids': city_ids,
+    }
+
+location_catalog = VersionedSnapshot('locations:catalog:version', build_catalog)
+
+def location_ids_for_city(city):
+    """Ids of the Location rows named `city` (case-insensitive), empty when unknown"""
+    if not city:
+        return []
+    return location_catalog.get()['city_ids'].get(city.strip().lower(), [])
+
+async def alocation_ids_for_city(city):
+    if not city:
+        return []
+    return (await location_catalog.aget())['city_ids'].get(city.strip().lower(), [])
+
+def resolve_city(city):
+    """Location id for a city name, or None when the city is not in the catalog"""
+    ids = location_ids_for_city(city)
+    return ids[0] if ids else None
+
+def resolve_location_text(text):
+    """Location id for a free-text location such as 'Bandra West, Mumbai'"""
+    return resolve_city(match_city(text, location_catalog.get()['city_lookup']))
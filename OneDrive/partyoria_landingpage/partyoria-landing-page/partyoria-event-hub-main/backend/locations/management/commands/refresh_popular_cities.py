@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from locations.popularity import refresh_popularity
+
+class Command(BaseCommand):
+    help = 'Recount venue and event totals for stale popular-city rollup rows (run periodically, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recount every city in the locations table')
+
+    def handle(self, *args, **options):
+        refreshed = refresh_popularity(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Refreshed popularity for {refreshed} cities'))
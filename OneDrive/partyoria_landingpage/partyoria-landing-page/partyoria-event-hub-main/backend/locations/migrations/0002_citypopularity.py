@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CityPopularity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(max_length=100, unique=True)),
+                ('venue_count', models.IntegerField(default=0)),
+                ('event_count', models.IntegerField(default=0)),
+                ('score', models.IntegerField(default=0)),
+                ('is_stale', models.BooleanField(default=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'city_popularity',
+                'indexes': [models.Index(fields=['-score', 'city'], name='city_popularity_score_idx')],
+            },
+        ),
+    ]
@@ -9,4 +9,22 @@ class Location(models.Model):
         unique_together = ['state', 'city']
     
     def __str__(self):
-        return f"{self.city}, {self.state}"
\ No newline at end of file
+        return f"{self.city}, {self.state}"
+
+class CityPopularity(models.Model):
+    """Materialized per-city venue and event counts used to rank popular cities"""
+    city = models.CharField(max_length=100, unique=True)
+    venue_count = models.IntegerField(default=0)
+    event_count = models.IntegerField(default=0)
+    score = models.IntegerField(default=0)
+    is_stale = models.BooleanField(default=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'city_popularity'
+        indexes = [
+            models.Index(fields=['-score', 'city'], name='city_popularity_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.city} ({self.score})"
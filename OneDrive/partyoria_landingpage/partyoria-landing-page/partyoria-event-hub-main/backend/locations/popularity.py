@@ -0,0 +1,105 @@
+"""
+Popular city ranking.
+
+`CityPopularity` holds venue and event counts per catalog city. Venue and
+event writes only mark the affected cities stale; the
+`refresh_popular_cities` command recounts the stale rows (or every city with
+`--full`) and is meant to run periodically, so requests never aggregate.
+"""
+from django.db.models import Count, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .models import CityPopularity
+
+VENUE_WEIGHT = 1
+EVENT_WEIGHT = 2
+
+def match_city(text, lookup):
+    """Return the catalog city named in a free-text location such as 'Bandra West, Mumbai'"""
+    if not text:
+        return None
+    for part in reversed(text.split(',')):
+        city = lookup.get(part.strip().lower())
+        if city:
+            return city
+    return None
+
+def mark_stale(cities):
+    """Flag rollup rows for recounting, creating rows for cities seen for the first time"""
+    cities = {city for city in cities if city}
+    if not cities:
+        return
+    CityPopularity.objects.bulk_create(
+        [CityPopularity(city=city, is_stale=True) for city in cities],
+        update_conflicts=True,
+        unique_fields=['city'],
+        update_fields=['is_stale'],
+    )
+
+def count_venues(cities):
+    from events.models import Venue
+    
+    counts = (
+        Venue.objects.annotate(city_lower=Lower('city'))
+        .filter(city_lower__in=[city.lower() for city in cities])
+        .values('city_lower')
+        .annotate(total=Count('id'))
+    )
+    return {row['city_lower']: row['total'] for row in counts}
+
+def count_events(cities, lookup, full=False):
+    from events.models import Event
+    
+    events = Event.objects.all()
+    if not full:
+        condition = Q()
+        for city in cities:
+            condition |= Q(location__icontains=city)
+        events = events.filter(condition)
+    
+    wanted = {city.lower() for city in cities}
+    counts = {}
+    for location in events.values_list('location', flat=True).iterator(chunk_size=2000):
+        city = match_city(location, lookup)
+        if city and city.lower() in wanted:
+            counts[city.lower()] = counts.get(city.lower(), 0) + 1
+    return counts
+
+def refresh_popularity(full=False):
+    """Recount stale rollup rows, or every catalog city when `full`; returns the number of rows refreshed"""
+    from .catalog import location_catalog
+    
+    lookup = location_catalog.get()['city_lookup']
+    if full:
+        mark_stale(lookup.values())
+    rows = list(CityPopularity.objects.filter(is_stale=True))
+    if not rows:
+        return 0
+    
+    cities = [row.city for row in rows]
+    venue_counts = count_venues(cities)
+    event_counts = count_events(cities, lookup, full=full)
+    
+    now = timezone.now()
+    for row in rows:
+        row.venue_count = venue_counts.get(row.city.lower(), 0)
+        row.event_count = event_counts.get(row.city.lower(), 0)
+        row.score = row.venue_count * VENUE_WEIGHT + row.event_count * EVENT_WEIGHT
+        row.is_stale = False
+        row.refreshed_at = now
+    CityPopularity.objects.bulk_update(
+        rows, ['venue_count', 'event_count', 'score', 'is_stale', 'refreshed_at'], batch_size=500
+    )
+    
+    location_catalog.invalidate()
+    return len(rows)
+
+def popular_cities(known_cities, limit):
+    """Top cities by score, restricted to cities in the catalog"""
+    ranked = (
+        CityPopularity.objects.filter(city__in=known_cities, score__gt=0)
+        .order_by('-score', 'city')
+        .values_list('city', flat=True)[:limit]
+    )
+    return list(ranked)
@@ -0,0 +1,55 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models.functions import Lower
+from django.dispatch import receiver
+
+from events.models import Event, Venue
+from partyoria_backend.response_cache import invalidate_tags_on_commit
+from .catalog import location_catalog
+from .models import Location
+from .popularity import mark_stale, match_city
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_catalog(sender, **kwargs):
+    location_catalog.invalidate()
+    # Location writes can re-link venues through queryset updates, which send no signals
+    invalidate_tags_on_commit('location', 'venue:list', 'venue-details')
+
+@receiver(post_save, sender=Location)
+def link_unresolved_venues(sender, instance, created, **kwargs):
+    """Attach venues whose city was not in the catalog when they were saved"""
+    from venues.models import VenueDetails
+    
+    if not created:
+        return
+    Venue.objects.filter(city_location__isnull=True).alias(
+        city_lower=Lower('city')
+    ).filter(city_lower=instance.city.lower()).update(city_location=instance)
+    
+    lookup = {instance.city.lower(): instance.city}
+    unresolved = VenueDetails.objects.filter(city_location__isnull=True, location__icontains=instance.city)
+    matched = [pk for pk, text in unresolved.values_list('pk', 'location') if match_city(text, lookup)]
+    VenueDetails.objects.filter(pk__in=matched).update(city_location=instance)
+
+# Venue.city and Event.location feed the popularity rollup. A write marks the
+# affected cities stale (including the previous city when it changed) and
+# refresh_popular_cities recounts them later.
+
+POPULARITY_FIELDS = {Venue: 'city', Event: 'location'}
+
+@receiver(pre_save, sender=Venue)
+@receiver(pre_save, sender=Event)
+def remember_previous_city(sender, instance, **kwargs):
+    field = POPULARITY_FIELDS[sender]
+    instance._previous_city_text = None
+    if not instance._state.adding and instance.pk:
+        instance._previous_city_text = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+
+@receiver(post_save, sender=Venue)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Venue)
+@receiver(post_delete, sender=Event)
+def mark_city_popularity_stale(sender, instance, **kwargs):
+    lookup = location_catalog.get()['city_lookup']
+    texts = {getattr(instance, POPULARITY_FIELDS[sender]), getattr(instance, '_previous_city_text', None)}
+    mark_stale({match_city(text, lookup) for text in texts})
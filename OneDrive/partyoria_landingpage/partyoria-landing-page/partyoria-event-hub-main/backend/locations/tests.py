@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from events.models import Event, Venue
+from users.models import User
+from .models import CityPopularity, Location
+from .popularity import refresh_popularity
+
+class LocationsEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Location.objects.create(state='Maharashtra', city='Pune')
+        Location.objects.create(state='Maharashtra', city='Mumbai')
+        Location.objects.create(state='Kerala', city='Kochi')
+    
+    def test_steady_state_serves_without_queries(self):
+        self.client.get('/api/locations/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/locations/')
+        self.assertEqual(response.json(), {
+            'states': ['Kerala', 'Maharashtra'],
+            'cities_by_state': {'Kerala': ['Kochi'], 'Maharashtra': ['Mumbai', 'Pune']},
+            'popular_cities': ['Kochi', 'Mumbai', 'Pune'],
+        })
+    
+    def test_location_changes_rebuild_catalog(self):
+        self.client.get('/api/locations/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Location.objects.create(state='Goa', city='Goa')
+        response = self.client.get('/api/locations/')
+        self.assertEqual(response.json()['cities_by_state']['Goa'], ['Goa'])
+
+class PopularCitiesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for state, city in [('Maharashtra', 'Mumbai'), ('Maharashtra', 'Pune'), ('Kerala', 'Kochi')]:
+            Location.objects.create(state=state, city=city)
+        organizer = User.objects.create_user(username='organizer', email='organizer@example.com', password='secret123')
+        for city in ['Pune', 'Pune', 'Kochi']:
+            Venue.objects.create(name=f'{city} Hall', type='Hall', location=city, city=city, price='₹10,000', image='https://example.com/v.jpg')
+        for location in ['Koregaon Park, Pune', 'Fort Kochi, Kochi', 'Marine Drive, Kochi']:
+            Event.objects.create(
+                title='Party', description='', event_type='birthday', date=timezone.now() + timedelta(days=1),
+                location=location, organizer=organizer,
+            )
+    
+    def test_popular_cities_ranked_by_rollup(self):
+        self.assertEqual(refresh_popularity(), 2)
+        self.assertEqual(self.client.get('/api/locations/').json()['popular_cities'], ['Kochi', 'Pune'])
+        
+        pune = CityPopularity.objects.get(city='Pune')
+        self.assertEqual((pune.venue_count, pune.event_count, pune.score), (2, 1, 4))
+    
+    def test_writes_only_mark_affected_cities_stale(self):
+        refresh_popularity()
+        venue = Venue.objects.filter(city='Pune').first()
+        venue.city = 'Mumbai'
+        venue.save()
+        
+        self.assertEqual(set(CityPopularity.objects.filter(is_stale=True).values_list('city', flat=True)), {'Pune', 'Mumbai'})
+        self.assertEqual(refresh_popularity(), 2)
+        self.assertEqual(CityPopularity.objects.get(city='Mumbai').venue_count, 1)
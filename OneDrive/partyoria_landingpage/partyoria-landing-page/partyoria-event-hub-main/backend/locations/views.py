@@ -1,24 +1,16 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from .models import Location
+from partyoria_backend.response_cache import cache_response
+from .catalog import location_catalog
 
 class LocationListView(APIView):
+    """States, cities grouped by state and popular cities from the in-memory location catalog"""
+    
+    @cache_response(tags=['location'])
     def get(self, request):
-        locations = Location.objects.all()
-        
-        # Group cities by state
-        cities_by_state = {}
-        popular_cities = []
-        
-        for location in locations:
-            if location.state not in cities_by_state:
-                cities_by_state[location.state] = []
-            cities_by_state[location.state].append(location.city)
-            
-            if location.is_popular:
-                popular_cities.append(location.city)
-        
+        catalog = location_catalog.get()
         return Response({
-            'cities_by_state': cities_by_state,
-            'popular_cities': popular_cities
-        })
\ No newline at end of file
+            'states': catalog['states'],
+            'cities_by_state': catalog['cities_by_state'],
+            'popular_cities': catalog['popular_cities'],
+        })
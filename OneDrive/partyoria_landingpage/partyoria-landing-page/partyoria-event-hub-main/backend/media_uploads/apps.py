@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class MediaUploadsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'media_uploads'
\ No newline at end of file
+    name = 'media_uploads'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,70 @@
+"""
+Content-addressed media storage.
+
+Uploaded files are stored once per SHA-256 digest as a `MediaBlob`, and each
+`MediaUpload` points its `file` at the blob's path. The digest is computed
+while the upload streams in (see `upload_handlers`) or during resumable
+upload finalization, so deduplication costs no extra read of the file.
+"""
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from . import derivatives
+from .models import MediaBlob
+
+def file_sha256(file_obj):
+    """Digest recorded by the upload handlers, or computed by reading the file"""
+    digest = getattr(file_obj, 'sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in file_obj.chunks():
+        hasher.update(chunk)
+    file_obj.seek(0)
+    return hasher.hexdigest()
+
+def acquire_blob(file_obj, digest=None):
+    """Return the blob holding `file_obj`'s content, storing it if new, with its ref_count incremented"""
+    digest = digest or file_sha256(file_obj)
+    with transaction.atomic():
+        blob = MediaBlob.objects.select_for_update().filter(sha256=digest).first()
+        if blob is None:
+            blob = MediaBlob(sha256=digest, size=file_obj.size)
+            blob.file.save(file_obj.name, file_obj, save=False)
+            try:
+                with transaction.atomic():
+                    blob.save()
+            except IntegrityError:
+                # Lost a race with a concurrent upload of the same content
+                blob.file.delete(save=False)
+                blob = MediaBlob.objects.select_for_update().get(sha256=digest)
+        MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+    return blob
+
+def release_blob(blob_id):
+    """Drop one reference to a blob, deleting it and its file when none remain"""
+    with transaction.atomic():
+        blob = MediaBlob.objects.select_for_update().filter(pk=blob_id).first()
+        if blob is None:
+            return
+        if blob.ref_count > 1:
+            MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+            return
+        file_name = blob.file.name
+        storage = blob.file.storage
+        blob.delete()
+        transaction.on_commit(lambda: storage.delete(file_name))
+        transaction.on_commit(lambda: derivatives.delete_derivatives(file_name, storage))
+
+def attach_file(media_upload, file_obj, digest=None):
+    """Point `media_upload` at the blob for `file_obj`, releasing any blob it replaces"""
+    previous_blob_id = media_upload.blob_id
+    blob = acquire_blob(file_obj, digest=digest)
+    media_upload.blob = blob
+    media_upload.file.name = blob.file.name
+    media_upload.file_size = blob.size
+    if previous_blob_id:
+        transaction.on_commit(lambda: release_blob(previous_blob_id))
+    return blob
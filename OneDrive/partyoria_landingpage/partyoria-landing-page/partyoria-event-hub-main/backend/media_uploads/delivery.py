@@ -0,0 +1,153 @@
+"""
+Serving stored media files.
+
+`serve_file` answers conditional requests (ETag/Last-Modified) and single
+byte ranges (with If-Range) itself, then hands the bytes to the server:
+`FileResponse` lets a WSGI server that implements `wsgi.file_wrapper` (e.g.
+gunicorn) use zero-copy sendfile, and with MEDIA_ACCEL_MODE set the response
+carries an X-Accel-Redirect (nginx) or X-Sendfile (Apache/lighttpd) header
+so the front proxy streams the file and handles ranges.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+SERVED_PREFIXES = ('blobs/', 'uploads/', 'profiles/', 'derivatives/')
+# Content-addressed paths never change, so caches may keep them indefinitely
+IMMUTABLE_PREFIXES = ('blobs/', 'derivatives/blobs/')
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+class RangeFile:
+    """Read-only view of bytes [start, start + length) of an open file"""
+    
+    def __init__(self, file, start, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+        file.seek(start)
+    
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+    
+    def fileno(self):
+        # Positioned at the range start; sendfile stops at Content-Length
+        return self.file.fileno()
+    
+    def close(self):
+        self.file.close()
+
+def can_serve(request, name):
+    """Whether `name` (relative to MEDIA_ROOT) may be served to this request"""
+    parts = name.split('/')
+    return name.startswith(SERVED_PREFIXES) and '..' not in parts and '' not in parts
+
+def file_etag(stat):
+    return quote_etag(f'{stat.st_size:x}-{stat.st_mtime_ns:x}')
+
+def parse_range(header, size):
+    """
+    The (start, end) inclusive byte range requested by a Range header.
+
+    Returns None to serve the whole file (no header, or one we don't handle,
+    such as multiple ranges) and raises ValueError when unsatisfiable.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+def range_applies(request, etag, last_modified):
+    """If-Range: only honour Range when the client's copy is still current"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+def cache_control(name):
+    if name.startswith(IMMUTABLE_PREFIXES):
+        return 'public, max-age=31536000, immutable'
+    return 'public, max-age=3600'
+
+def accel_response(name, path):
+    mode = getattr(settings, 'MEDIA_ACCEL_MODE', None)
+    content_type, encoding = mimetypes.guess_type(name)
+    response = HttpResponse(content_type=content_type or 'application/octet-stream')
+    if mode == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/') + quote(name)
+    elif mode == 'x-sendfile':
+        response['X-Sendfile'] = path
+    else:
+        raise ValueError(f'Unknown MEDIA_ACCEL_MODE {mode!r}')
+    return response
+
+def serve_file(request, name):
+    if not can_serve(request, name):
+        raise Http404
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+    if not os.path.isfile(path):
+        raise Http404
+
+    etag = file_etag(stat)
+    last_modified = int(stat.st_mtime)
+
+    def with_validators(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = cache_control(name)
+        return response
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        return with_validators(conditional)
+
+    if getattr(settings, 'MEDIA_ACCEL_MODE', None):
+        return with_validators(accel_response(name, path))
+
+    byte_range = None
+    if range_applies(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return with_validators(response)
+
+    file = open(path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file)
+    else:
+        start, end = byte_range
+        response = FileResponse(RangeFile(file, start, end - start + 1), status=206)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Accept-Ranges'] = 'bytes'
+    return with_validators(response)
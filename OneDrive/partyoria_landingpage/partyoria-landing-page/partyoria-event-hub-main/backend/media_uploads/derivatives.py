@@ -0,0 +1,207 @@
+"""
+Resized image derivatives for media uploads and profile images.
+
+Every image gets WebP and JPEG variants at a fixed set of widths, stored next
+to the originals under `derivatives/<source name>/<width>.<format>`. Because
+the name is derived from the source file name, variants of deduplicated blobs
+are shared too.
+
+Variants are rendered in a process pool once the upload commits, so resizing
+never runs on the request path. Anything still missing is rendered on first
+access through `derivative_view`, and readiness is cached so serializers can
+link straight to the stored file without touching storage.
+"""
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_ROOT = 'derivatives'
+SOURCE_PREFIXES = ('blobs/', 'uploads/', 'profiles/')
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+READY_TIMEOUT = 60 * 60 * 24
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def widths():
+    return tuple(getattr(settings, 'MEDIA_DERIVATIVE_WIDTHS', (160, 480, 1024)))
+
+def formats():
+    return tuple(getattr(settings, 'MEDIA_DERIVATIVE_FORMATS', ('webp', 'jpeg')))
+
+def derivative_name(source_name, width, fmt):
+    stem = os.path.splitext(source_name)[0]
+    return f'{DERIVATIVE_ROOT}/{stem}/{width}.{fmt}'
+
+def is_source_name(source_name):
+    return source_name.startswith(SOURCE_PREFIXES) and '..' not in source_name.split('/')
+
+def ready_key(name):
+    return f'media:derivative:{name}'
+
+def render_variants(source, specs):
+    """
+    Decode `source` once and encode every (width, fmt) in `specs`.
+
+    Runs inside the worker processes, so it only touches Pillow. `source` is a
+    file path or the raw bytes. Images are never upscaled: widths wider than
+    the original are rendered at the original size.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as image:
+        largest = max(width for width, fmt in specs)
+        # Let the JPEG decoder downscale by a power of two while reading
+        image.draft('RGB', (largest, max(1, image.height * largest // image.width)))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+        rendered = []
+        for width, fmt in specs:
+            target = min(width, image.width)
+            height = max(1, round(image.height * target / image.width))
+            resized = image if target == image.width else image.resize((target, height), Image.LANCZOS, reducing_gap=3.0)
+            pil_format, options = FORMATS[fmt]
+            if pil_format == 'JPEG' and resized.mode != 'RGB':
+                resized = resized.convert('RGB')
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, **options)
+            rendered.append((width, fmt, buffer.getvalue()))
+        return rendered
+
+def get_executor():
+    """The shared render pool, or None when MEDIA_DERIVATIVE_WORKERS is 0 (render inline)"""
+    global _executor
+    workers = getattr(settings, 'MEDIA_DERIVATIVE_WORKERS', 2)
+    if not workers:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # spawn rather than fork: forking a threaded server can deadlock the child
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+def _source_for(source_name, storage):
+    try:
+        return storage.path(source_name)
+    except NotImplementedError:
+        with storage.open(source_name, 'rb') as f:
+            return f.read()
+
+def missing_specs(source_name, storage=None):
+    """The (width, fmt) variants of `source_name` not yet known to be stored"""
+    storage = storage or default_storage
+    specs = [(width, fmt) for width in widths() for fmt in formats()]
+    names = {spec: derivative_name(source_name, *spec) for spec in specs}
+    ready = cache.get_many([ready_key(name) for name in names.values()])
+    missing = []
+    for spec, name in names.items():
+        if ready_key(name) in ready:
+            continue
+        if storage.exists(name):
+            cache.set(ready_key(name), True, READY_TIMEOUT)
+        else:
+            missing.append(spec)
+    return missing
+
+def store_variants(source_name, rendered, storage=None):
+    storage = storage or default_storage
+    for width, fmt, data in rendered:
+        name = derivative_name(source_name, width, fmt)
+        if not storage.exists(name):
+            saved_name = storage.save(name, ContentFile(data))
+            if saved_name != name:
+                # Another worker stored it first; keep theirs
+                storage.delete(saved_name)
+        cache.set(ready_key(name), True, READY_TIMEOUT)
+
+def generate(source_name, specs=None, storage=None):
+    """Render and store variants synchronously; the pool still does the Pillow work when enabled"""
+    storage = storage or default_storage
+    specs = missing_specs(source_name, storage) if specs is None else specs
+    if not specs:
+        return
+    source = _source_for(source_name, storage)
+    executor = get_executor()
+    if executor is None:
+        rendered = render_variants(source, specs)
+    else:
+        rendered = executor.submit(render_variants, source, specs).result()
+    store_variants(source_name, rendered, storage)
+
+def schedule(source_name, storage=None):
+    """Queue rendering of any missing variants without waiting for it"""
+    storage = storage or default_storage
+    specs = missing_specs(source_name, storage)
+    if not specs:
+        return
+    executor = get_executor()
+    if executor is None:
+        try:
+            generate(source_name, specs, storage)
+        except OSError as e:
+            # Not an image, or a truncated one: nothing to render
+            logger.warning('Cannot render derivatives of %s: %s', source_name, e)
+        except Exception:
+            logger.exception('Rendering derivatives of %s failed', source_name)
+        return
+
+    def done(future):
+        try:
+            store_variants(source_name, future.result(), storage)
+        except OSError as e:
+            logger.warning('Cannot render derivatives of %s: %s', source_name, e)
+        except Exception:
+            logger.exception('Rendering derivatives of %s failed', source_name)
+
+    executor.submit(render_variants, _source_for(source_name, storage), specs).add_done_callback(done)
+
+def schedule_on_commit(field_file):
+    if field_file and is_source_name(field_file.name):
+        name, storage = field_file.name, field_file.storage
+        transaction.on_commit(lambda: schedule(name, storage))
+
+def delete_derivatives(source_name, storage=None):
+    storage = storage or default_storage
+    for width in widths():
+        for fmt in formats():
+            name = derivative_name(source_name, width, fmt)
+            storage.delete(name)
+            cache.delete(ready_key(name))
+
+def variant_urls(field_file):
+    """
+    {width: {format: url}} for an image field.
+
+    Variants known to be stored link straight to storage; the rest link to
+    `derivative_view`, which renders them on first request.
+    """
+    if not field_file or not is_source_name(field_file.name):
+        return None
+    source_name = field_file.name
+    names = {(width, fmt): derivative_name(source_name, width, fmt) for width in widths() for fmt in formats()}
+    ready = cache.get_many([ready_key(name) for name in names.values()])
+    variants = {}
+    for (width, fmt), name in names.items():
+        if ready_key(name) in ready:
+            url = field_file.storage.url(name)
+        else:
+            url = reverse('media-derivative', kwargs={'width': width, 'fmt': fmt, 'source': source_name})
+        variants.setdefault(str(width), {})[fmt] = url
+    return variants
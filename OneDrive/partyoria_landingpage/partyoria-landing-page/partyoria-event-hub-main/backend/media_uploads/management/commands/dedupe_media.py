@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from media_uploads.blobs import attach_file
+from media_uploads.models import MediaUpload
+
+class Command(BaseCommand):
+    help = 'Move media uploaded before content-addressed storage into shared blobs and delete the duplicate copies'
+
+    def handle(self, *args, **options):
+        moved = 0
+        for media_upload in MediaUpload.objects.filter(blob__isnull=True).exclude(file='').iterator(chunk_size=500):
+            storage = media_upload.file.storage
+            old_name = media_upload.file.name
+            if not storage.exists(old_name):
+                self.stdout.write(self.style.WARNING(f'Missing file for media {media_upload.pk}: {old_name}'))
+                continue
+
+            with transaction.atomic():
+                with storage.open(old_name, 'rb') as file_obj:
+                    blob = attach_file(media_upload, file_obj)
+                media_upload.save(update_fields=['blob', 'file', 'file_size'])
+
+            if blob.file.name != old_name:
+                storage.delete(old_name)
+            moved += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} uploads into blob storage'))
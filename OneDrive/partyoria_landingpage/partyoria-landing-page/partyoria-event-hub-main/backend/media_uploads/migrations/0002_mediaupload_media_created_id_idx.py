@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_uploads', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mediaupload',
+            index=models.Index(fields=['-created_at', '-id'], name='media_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import media_uploads.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_uploads', '0003_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to=media_uploads.models.blob_upload_to)),
+                ('size', models.BigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='mediaupload',
+            name='file',
+            field=models.FileField(max_length=255, upload_to='uploads/%Y/%m/%d/'),
+        ),
+        migrations.AddField(
+            model_name='mediaupload',
+            name='blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='uploads', to='media_uploads.mediablob'),
+        ),
+    ]
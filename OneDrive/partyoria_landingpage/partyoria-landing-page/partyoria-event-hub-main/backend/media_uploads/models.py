@@ -1,6 +1,30 @@
+import os
+import uuid
+
 from django.db import models
 from django.conf import settings
 
+def blob_upload_to(instance, filename):
+    # Content-addressed layout: blobs/ab/cd/abcd...<ext>
+    extension = os.path.splitext(filename)[1].lower()
+    return f'blobs/{instance.sha256[:2]}/{instance.sha256[2:4]}/{instance.sha256}{extension}'
+
+class MediaBlob(models.Model):
+    """
+    Stored file content, shared by every MediaUpload with the same SHA-256.
+    
+    `ref_count` tracks the uploads pointing at the blob; the file is deleted
+    when the last of them goes away.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=blob_upload_to, max_length=255)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.sha256
+
 class MediaUpload(models.Model):
     MEDIA_TYPES = [
         ('image', 'Image'),
@@ -10,12 +34,61 @@ class MediaUpload(models.Model):
     
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
-    file = models.FileField(upload_to='uploads/%Y/%m/%d/')
+    file = models.FileField(upload_to='uploads/%Y/%m/%d/', max_length=255)
+    blob = models.ForeignKey(MediaBlob, on_delete=models.PROTECT, related_name='uploads', null=True, blank=True, editable=False)
     media_type = models.CharField(max_length=20, choices=MEDIA_TYPES)
-    file_size = models.IntegerField(null=True, blank=True)
+    file_size = models.BigIntegerField(null=True, blank=True)
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='uploads')
     event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='media', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='media_created_id_idx'),
+        ]
+    
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+class UploadSession(models.Model):
+    """
+    A resumable upload in progress.
+    
+    Chunks are written into a preallocated part file at their byte offsets and
+    `received_ranges` records the acknowledged [start, end) ranges, so clients
+    can upload chunks in any order and resume from `received_bytes` after a
+    dropped connection.
+    """
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('completed', 'Completed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    media_type = models.CharField(max_length=20, choices=MediaUpload.MEDIA_TYPES)
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True)
+    received_ranges = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions', null=True, blank=True)
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='upload_sessions', null=True, blank=True)
+    media_upload = models.OneToOneField(MediaUpload, on_delete=models.SET_NULL, related_name='upload_session', null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+    
+    @property
+    def received_bytes(self):
+        """Length of the contiguous prefix received so far, i.e. where a restarted upload resumes"""
+        if self.received_ranges and self.received_ranges[0][0] == 0:
+            return self.received_ranges[0][1]
+        return 0
+    
+    @property
+    def is_complete(self):
+        return self.received_ranges == [[0, self.total_size]]
@@ -0,0 +1,100 @@
+"""
+Storage for resumable uploads.
+
+Each `UploadSession` owns a part file under MEDIA_ROOT/upload_sessions/ that is
+preallocated to the final size. Chunks are streamed from the request body
+straight into it with `os.pwrite` at their offsets, hashing as they go, so
+nothing is buffered in memory. The views hold the session row lock around each
+write and around finalize, which moves the part file into media storage rather
+than copying it.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files import File
+
+READ_SIZE = 64 * 1024
+
+class ChunkError(Exception):
+    pass
+
+class PartFile(File):
+    """A part file that FileSystemStorage can move into place instead of copying"""
+    
+    def __init__(self, file, name, path):
+        super().__init__(file, name=name)
+        self.path = path
+    
+    def temporary_file_path(self):
+        return self.path
+
+def part_path(session):
+    return os.path.join(settings.MEDIA_ROOT, 'upload_sessions', f'{session.id}.part')
+
+def create_part_file(session):
+    path = part_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as part:
+        part.truncate(session.total_size)
+
+def discard_part_file(session):
+    try:
+        os.remove(part_path(session))
+    except FileNotFoundError:
+        pass
+
+def parse_content_range(header, total_size):
+    """Parse 'bytes start-end/total' into a (start, end) half-open range"""
+    try:
+        unit, spec = header.split(' ', 1)
+        span, total = spec.split('/', 1)
+        start, end = (int(value) for value in span.split('-', 1))
+    except (AttributeError, ValueError):
+        raise ChunkError('Content-Range must look like "bytes <start>-<end>/<total>".')
+    if unit != 'bytes' or total not in ('*', str(total_size)):
+        raise ChunkError(f'Content-Range total must be {total_size} bytes.')
+    if not 0 <= start <= end < total_size:
+        raise ChunkError('Content-Range is outside the upload.')
+    return start, end + 1
+
+def write_chunk(session, start, end, stream):
+    """
+    Stream request bytes for [start, end) into the part file. Returns the
+    number of bytes written and their SHA-256, which may cover fewer bytes
+    than requested if the client disconnected mid-chunk.
+    """
+    digest = hashlib.sha256()
+    fd = os.open(part_path(session), os.O_WRONLY)
+    offset = start
+    try:
+        while offset < end:
+            data = stream.read(min(READ_SIZE, end - offset))
+            if not data:
+                break
+            os.pwrite(fd, data, offset)
+            digest.update(data)
+            offset += len(data)
+    finally:
+        os.close(fd)
+    return offset - start, digest.hexdigest()
+
+def merge_range(ranges, start, end):
+    """Add [start, end) to a sorted list of disjoint ranges, coalescing neighbours"""
+    merged = []
+    for range_start, range_end in sorted([*ranges, [start, end]]):
+        if merged and range_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+    return merged
+
+def file_digest(session):
+    digest = hashlib.sha256()
+    with open(part_path(session), 'rb') as part:
+        for block in iter(lambda: part.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def open_part_file(session, filename):
+    return PartFile(open(part_path(session), 'rb'), name=filename, path=part_path(session))
@@ -1,17 +1,61 @@
+from django.db import transaction
 from rest_framework import serializers
-from .models import MediaUpload
+from . import derivatives
+from .blobs import attach_file
+from .models import MediaUpload, UploadSession
 
 class MediaUploadSerializer(serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
     file_url = serializers.SerializerMethodField()
+    variants = serializers.SerializerMethodField()
     
     class Meta:
         model = MediaUpload
-        fields = ['id', 'title', 'description', 'file', 'file_url', 'media_type', 
+        fields = ['id', 'title', 'description', 'file', 'file_url', 'variants', 'media_type', 
                  'file_size', 'uploaded_by', 'uploaded_by_name', 'event', 'created_at']
         read_only_fields = ['id', 'file_size', 'created_at']
     
     def get_file_url(self, obj):
         if obj.file:
             return obj.file.url
-        return None
\ No newline at end of file
+        return None
+    
+    def get_variants(self, obj):
+        if obj.media_type != 'image':
+            return None
+        return derivatives.variant_urls(obj.file)
+    
+    def create(self, validated_data):
+        file_obj = validated_data.pop('file')
+        media_upload = MediaUpload(**validated_data)
+        with transaction.atomic():
+            attach_file(media_upload, file_obj)
+            media_upload.save()
+        return media_upload
+    
+    def update(self, instance, validated_data):
+        file_obj = validated_data.pop('file', None)
+        with transaction.atomic():
+            if file_obj is not None:
+                attach_file(instance, file_obj)
+            return super().update(instance, validated_data)
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    received_bytes = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'title', 'description', 'media_type', 'filename', 'total_size', 'sha256',
+                 'event', 'status', 'received_bytes', 'received_ranges', 'media_upload', 'created_at']
+        read_only_fields = ['id', 'status', 'received_ranges', 'media_upload', 'created_at']
+    
+    def validate_total_size(self, value):
+        if value < 1:
+            raise serializers.ValidationError('Must be at least 1 byte.')
+        return value
+    
+    def validate_sha256(self, value):
+        value = value.lower()
+        if value and (len(value) != 64 or any(c not in '0123456789abcdef' for c in value)):
+            raise serializers.ValidationError('Must be a hex-encoded SHA-256 digest.')
+        return value
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import derivatives
+from .blobs import release_blob
+from .models import MediaUpload
+
+@receiver(post_save, sender=MediaUpload)
+def render_media_derivatives(sender, instance, **kwargs):
+    if instance.media_type == 'image':
+        derivatives.schedule_on_commit(instance.file)
+
+@receiver(post_delete, sender=MediaUpload)
+def release_media_blob(sender, instance, **kwargs):
+    if instance.blob_id:
+        blob_id = instance.blob_id
+        transaction.on_commit(lambda: release_blob(blob_id))
@@ -0,0 +1,280 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from users.models import User
+from . import derivatives, resumable
+from .models import MediaBlob, MediaUpload, UploadSession
+
+class ResumableUploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='guest', email='guest@example.com', password='secret123')
+        self.client.force_authenticate(self.user)
+        self.content = bytes(range(256)) * 40
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def create_session(self, **extra):
+        data = {'title': 'Sangeet video', 'media_type': 'video', 'filename': 'sangeet.mp4', 'total_size': len(self.content), **extra}
+        response = self.client.post('/api/media/sessions/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+    
+    def put_chunk(self, session_id, start, end, **headers):
+        return self.client.generic(
+            'PUT', f'/api/media/sessions/{session_id}/', self.content[start:end],
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end - 1}/{len(self.content)}', **headers,
+        )
+    
+    def test_out_of_order_chunks_resume_and_finalize(self):
+        session_id = self.create_session(sha256=hashlib.sha256(self.content).hexdigest())
+        
+        self.assertEqual(self.put_chunk(session_id, 4096, 8192).json()['received_bytes'], 0)
+        self.assertEqual(self.put_chunk(session_id, 0, 4096).json()['received_bytes'], 8192)
+        
+        response = self.client.post(f'/api/media/sessions/{session_id}/finalize/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.get(f'/api/media/sessions/{session_id}/').json()['received_bytes'], 8192)
+        
+        self.put_chunk(session_id, 8192, len(self.content))
+        response = self.client.post(f'/api/media/sessions/{session_id}/finalize/')
+        self.assertEqual(response.status_code, 201)
+        
+        media = MediaUpload.objects.get(pk=response.json()['id'])
+        self.assertEqual(media.file_size, len(self.content))
+        with media.file.open('rb') as stored:
+            self.assertEqual(stored.read(), self.content)
+    
+    def test_chunk_checksum_mismatch_is_not_acknowledged(self):
+        session_id = self.create_session()
+        response = self.put_chunk(session_id, 0, 1024, HTTP_X_CHUNK_SHA256='0' * 64)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f'/api/media/sessions/{session_id}/').json()['received_ranges'], [])
+    
+    def test_rejects_range_outside_upload(self):
+        session_id = self.create_session()
+        response = self.client.generic(
+            'PUT', f'/api/media/sessions/{session_id}/', b'x', content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {len(self.content)}-{len(self.content)}/{len(self.content)}',
+        )
+        self.assertEqual(response.status_code, 416)
+    
+    def test_chunks_after_finalize_leave_the_blob_alone(self):
+        session_id = self.create_session()
+        self.put_chunk(session_id, 0, len(self.content))
+        response = self.client.post(f'/api/media/sessions/{session_id}/finalize/')
+        self.assertEqual(response.status_code, 201)
+        
+        self.content = bytes(len(self.content))
+        self.assertEqual(self.put_chunk(session_id, 0, 4096).status_code, 409)
+        blob = MediaUpload.objects.get(pk=response.json()['id']).blob
+        with blob.file.open('rb') as stored:
+            data = stored.read()
+        self.assertEqual(data, bytes(range(256)) * 40)
+        self.assertEqual(blob.sha256, hashlib.sha256(data).hexdigest())
+    
+    def test_chunk_without_part_file_is_a_conflict(self):
+        session_id = self.create_session()
+        self.put_chunk(session_id, 0, len(self.content))
+        resumable.discard_part_file(UploadSession.objects.get(pk=session_id))
+        self.assertEqual(self.put_chunk(session_id, 0, 4096).status_code, 409)
+        self.assertEqual(self.client.post(f'/api/media/sessions/{session_id}/finalize/').status_code, 409)
+    
+    def test_sessions_are_private_to_their_uploader(self):
+        session_id = self.create_session()
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user(username='other', email='other@example.com', password='secret123'))
+        self.assertEqual(other.get(f'/api/media/sessions/{session_id}/').status_code, 404)
+        self.assertEqual(other.post(f'/api/media/sessions/{session_id}/finalize/').status_code, 404)
+        
+        anonymous = APIClient()
+        data = {'title': 'Clip', 'media_type': 'video', 'filename': 'clip.mp4', 'total_size': 10}
+        self.assertEqual(anonymous.post('/api/media/sessions/', data, format='json').status_code, 401)
+        self.assertEqual(anonymous.get(f'/api/media/sessions/{session_id}/').status_code, 401)
+        self.assertEqual(anonymous.post(f'/api/media/sessions/{session_id}/finalize/').status_code, 401)
+
+@override_settings(MEDIA_DERIVATIVE_WORKERS=0)
+class MediaDeduplicationTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='guest', email='guest@example.com', password='secret123')
+        self.client.force_authenticate(self.user)
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def upload(self, content, name='photo.jpg'):
+        response = self.client.post('/api/media/upload/', {
+            'title': 'Haldi', 'media_type': 'image', 'uploaded_by': self.user.pk,
+            'file': SimpleUploadedFile(name, content, content_type='image/jpeg'),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 201, response.content)
+        return MediaUpload.objects.get(pk=response.json()['id'])
+    
+    def test_identical_uploads_share_one_blob(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.upload(b'same bytes', 'a.jpg')
+            second = self.upload(b'same bytes', 'b.jpg')
+            other = self.upload(b'different bytes')
+        
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(first.blob.sha256, hashlib.sha256(b'same bytes').hexdigest())
+        self.assertEqual(MediaBlob.objects.get(pk=first.blob_id).ref_count, 2)
+        self.assertNotEqual(other.blob_id, first.blob_id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(first.file.storage.exists(second.file.name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(MediaBlob.objects.filter(pk=first.blob_id).exists())
+        self.assertFalse(first.file.storage.exists(second.file.name))
+
+@override_settings(MEDIA_DERIVATIVE_WORKERS=0, MEDIA_DERIVATIVE_WIDTHS=[40, 120], MEDIA_DERIVATIVE_FORMATS=['webp', 'jpeg'])
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='guest', email='guest@example.com', password='secret123')
+        self.client.force_authenticate(self.user)
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def image_file(self, name='photo.png', size=(200, 100)):
+        buffer = io.BytesIO()
+        Image.new('RGBA', size, (200, 40, 90, 255)).save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+    
+    def test_variants_rendered_after_upload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/media/upload/', {
+                'title': 'Mehendi', 'media_type': 'image', 'uploaded_by': self.user.pk, 'file': self.image_file(),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201, response.content)
+        media = MediaUpload.objects.get(pk=response.json()['id'])
+        
+        variants = self.client.get(f'/api/media/{media.pk}/').json()['variants']
+        self.assertEqual(set(variants), {'40', '120'})
+        name = derivatives.derivative_name(media.file.name, 40, 'webp')
+        self.assertEqual(variants['40']['webp'], media.file.storage.url(name))
+        with media.file.storage.open(name) as f, Image.open(f) as image:
+            self.assertEqual((image.format, image.size), ('WEBP', (40, 20)))
+    
+    def test_missing_variant_rendered_on_first_access(self):
+        self.user.profile_image = self.image_file('avatar.png', size=(80, 80))
+        self.user.save()
+        
+        variants = self.client.get(f'/api/users/{self.user.pk}/').json()['profile_image_variants']
+        response = self.client.get(variants['120']['jpeg'])
+        self.assertEqual(response.status_code, 302)
+        name = derivatives.derivative_name(self.user.profile_image.name, 120, 'jpeg')
+        self.assertEqual(response['Location'], self.user.profile_image.storage.url(name))
+        with self.user.profile_image.storage.open(name) as f, Image.open(f) as image:
+            # Never upscaled past the original
+            self.assertEqual((image.format, image.size), ('JPEG', (80, 80)))
+        
+        refreshed = self.client.get(f'/api/users/{self.user.pk}/').json()['profile_image_variants']
+        self.assertEqual(refreshed['120']['jpeg'], response['Location'])
+    
+    def test_unknown_width_is_not_rendered(self):
+        self.user.profile_image = self.image_file('avatar.png')
+        self.user.save()
+        response = self.client.get(f'/api/media/derivatives/999/webp/{self.user.profile_image.name}')
+        self.assertEqual(response.status_code, 404)
+    
+    def test_undecodable_images_are_rejected(self):
+        truncated = self.image_file('truncated.png', size=(400, 300))
+        self.user.profile_image = SimpleUploadedFile('truncated.png', truncated.read()[:200], content_type='image/png')
+        self.user.save()
+        response = self.client.get(f'/api/media/derivatives/40/webp/{self.user.profile_image.name}')
+        self.assertEqual(response.status_code, 422)
+        
+        self.user.profile_image = self.image_file('huge.png')
+        self.user.save()
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 100):
+            response = self.client.get(f'/api/media/derivatives/40/webp/{self.user.profile_image.name}')
+        self.assertEqual(response.status_code, 422)
+
+class MediaDeliveryTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.content = bytes(range(256)) * 4
+        os.makedirs(os.path.join(self.media_root, 'uploads'))
+        with open(os.path.join(self.media_root, 'uploads', 'clip.mp4'), 'wb') as f:
+            f.write(self.content)
+        self.url = '/media/uploads/clip.mp4'
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def test_full_file_with_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+    
+    def test_byte_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.content)}')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.content[100:200])
+        
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-10:])
+        
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+    
+    def test_stale_if_range_returns_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+    
+    @override_settings(MEDIA_ACCEL_MODE='x-accel-redirect', MEDIA_ACCEL_PREFIX='/protected-media/')
+    def test_offloads_to_proxy(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/uploads/clip.mp4')
+        self.assertEqual(response.content, b'')
+    
+    def test_upload_session_parts_are_not_served(self):
+        os.makedirs(os.path.join(self.media_root, 'upload_sessions'))
+        with open(os.path.join(self.media_root, 'upload_sessions', 'x.part'), 'wb') as f:
+            f.write(b'partial')
+        self.assertEqual(self.client.get('/media/upload_sessions/x.part').status_code, 404)
+        self.assertEqual(self.client.get('/media/uploads/../upload_sessions/x.part').status_code, 404)
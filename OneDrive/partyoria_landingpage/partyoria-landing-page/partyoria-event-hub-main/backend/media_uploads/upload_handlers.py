@@ -0,0 +1,31 @@
+import hashlib
+
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+class HashingUploadMixin:
+    """Compute each uploaded file's SHA-256 as its chunks stream in and record it on the file as `sha256`"""
+    
+    def new_file(self, *args, **kwargs):
+        self.hasher = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+    
+    def receive_data_chunk(self, raw_data, start):
+        if self.hasher is not None:
+            self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+    
+    def file_complete(self, file_size):
+        file_obj = super().file_complete(file_size)
+        if file_obj is not None:
+            file_obj.sha256 = self.hasher.hexdigest()
+        return file_obj
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    def receive_data_chunk(self, raw_data, start):
+        # Only hash when this handler keeps the file; otherwise the temporary file handler does
+        if not self.activated:
+            self.hasher = None
+        return super().receive_data_chunk(raw_data, start)
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    pass
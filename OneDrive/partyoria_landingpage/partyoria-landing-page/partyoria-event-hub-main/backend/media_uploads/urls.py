@@ -5,4 +5,8 @@ urlpatterns = [
     path('', views.MediaUploadListCreateView.as_view(), name='media-list-create'),
     path('<int:pk>/', views.MediaUploadDetailView.as_view(), name='media-detail'),
     path('upload/', views.upload_file, name='file-upload'),
+    path('derivatives/<int:width>/<str:fmt>/<path:source>', views.derivative_view, name='media-derivative'),
+    path('sessions/', views.UploadSessionCreateView.as_view(), name='upload-session-create'),
+    path('sessions/<uuid:session_id>/', views.UploadSessionDetailView.as_view(), name='upload-session-detail'),
+    path('sessions/<uuid:session_id>/finalize/', views.finalize_upload_session, name='upload-session-finalize'),
 ]
\ No newline at end of file
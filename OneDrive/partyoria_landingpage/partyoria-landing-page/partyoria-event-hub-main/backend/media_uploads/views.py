@@ -1,9 +1,19 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect
+from django.views.decorators.http import require_safe
+from PIL import Image, UnidentifiedImageError
 from rest_framework import generics, status
-from rest_framework.decorators import api_view, parser_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .models import MediaUpload
-from .serializers import MediaUploadSerializer
+from rest_framework.views import APIView
+from . import delivery, derivatives, resumable
+from .blobs import attach_file
+from .models import MediaUpload, UploadSession
+from .serializers import MediaUploadSerializer, UploadSessionSerializer
 
 class MediaUploadListCreateView(generics.ListCreateAPIView):
     queryset = MediaUpload.objects.all()
@@ -35,4 +45,131 @@ def upload_file(request):
             file_size=file_size
         )
         return Response(MediaUploadSerializer(media_upload).data, status=status.HTTP_201_CREATED)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@require_safe
+def serve_media(request, path):
+    """Serve a file under MEDIA_ROOT with range, conditional and sendfile support"""
+    return delivery.serve_file(request, path)
+
+@api_view(['GET'])
+def derivative_view(request, width, fmt, source):
+    """Redirect to a resized variant of an image, rendering it first if it is missing"""
+    if width not in derivatives.widths() or fmt not in derivatives.formats() or not derivatives.is_source_name(source):
+        raise Http404
+    if not default_storage.exists(source):
+        raise Http404
+    
+    missing = derivatives.missing_specs(source)
+    if (width, fmt) in missing:
+        # Decoding dominates, so render every missing variant while the image is open
+        try:
+            derivatives.generate(source, missing)
+        except UnidentifiedImageError:
+            raise Http404
+        except (Image.DecompressionBombError, OSError):
+            # Too many pixels to decode safely, or a truncated file
+            return Response({'error': 'Image cannot be rendered'}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    return redirect(default_storage.url(derivatives.derivative_name(source, width, fmt)))
+
+# Resumable uploads: create a session, PUT byte ranges with Content-Range
+# (in any order; chunks for one session are written one at a time), GET the
+# session to find where to resume, then finalize to turn the assembled file
+# into a MediaUpload. Sessions belong to
+# the user who created them, so every step requires authentication (the
+# finished MediaUpload needs an uploader anyway).
+
+def get_upload_session(request, session_id):
+    return get_object_or_404(UploadSession.objects.filter(uploaded_by=request.user), pk=session_id)
+
+class UploadSessionCreateView(generics.CreateAPIView):
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def perform_create(self, serializer):
+        session = serializer.save(uploaded_by=self.request.user)
+        resumable.create_part_file(session)
+
+class UploadSessionDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, session_id):
+        return Response(UploadSessionSerializer(get_upload_session(request, session_id)).data)
+    
+    def put(self, request, session_id):
+        """Store one chunk; the body is the raw bytes for the Content-Range"""
+        # The row lock is held while the chunk is written, so a chunk can't
+        # land in the part file while finalize is moving it into a blob
+        with transaction.atomic():
+            session = get_object_or_404(UploadSession.objects.select_for_update().filter(uploaded_by=request.user), pk=session_id)
+            if session.status != 'active':
+                return Response({'error': 'Upload session is already finalized'}, status=status.HTTP_409_CONFLICT)
+            
+            try:
+                start, end = resumable.parse_content_range(request.META.get('HTTP_CONTENT_RANGE'), session.total_size)
+            except resumable.ChunkError as e:
+                return Response({'error': str(e)}, status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            
+            if request.stream is None:
+                return Response({'error': 'Chunk body is empty'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            try:
+                written, chunk_sha256 = resumable.write_chunk(session, start, end, request.stream)
+            except FileNotFoundError:
+                return Response({'error': 'Upload session has no part file'}, status=status.HTTP_409_CONFLICT)
+            expected_sha256 = request.META.get('HTTP_X_CHUNK_SHA256', '').lower()
+            if expected_sha256 and (written != end - start or expected_sha256 != chunk_sha256):
+                return Response({'error': 'Chunk checksum mismatch', 'chunk_sha256': chunk_sha256}, status=status.HTTP_400_BAD_REQUEST)
+            
+            if written:
+                session.received_ranges = resumable.merge_range(session.received_ranges, start, start + written)
+                session.save(update_fields=['received_ranges', 'updated_at'])
+        
+        return Response({
+            'received_bytes': session.received_bytes,
+            'received_ranges': session.received_ranges,
+            'chunk_bytes': written,
+            'chunk_sha256': chunk_sha256,
+        })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def finalize_upload_session(request, session_id):
+    """Verify the assembled file and create its MediaUpload"""
+    with transaction.atomic():
+        session = get_object_or_404(UploadSession.objects.select_for_update().filter(uploaded_by=request.user), pk=session_id)
+        if session.status != 'active':
+            return Response({'error': 'Upload session is already finalized'}, status=status.HTTP_409_CONFLICT)
+        if not session.is_complete:
+            return Response({
+                'error': 'Upload is incomplete',
+                'received_bytes': session.received_bytes,
+                'received_ranges': session.received_ranges,
+            }, status=status.HTTP_409_CONFLICT)
+        
+        try:
+            digest = resumable.file_digest(session)
+        except FileNotFoundError:
+            return Response({'error': 'Upload session has no part file'}, status=status.HTTP_409_CONFLICT)
+        if session.sha256 and session.sha256 != digest:
+            return Response({'error': 'File checksum mismatch', 'sha256': digest}, status=status.HTTP_400_BAD_REQUEST)
+        
+        media_upload = MediaUpload(
+            title=session.title,
+            description=session.description,
+            media_type=session.media_type,
+            uploaded_by=session.uploaded_by,
+            event=session.event,
+        )
+        with resumable.open_part_file(session, session.filename) as part:
+            attach_file(media_upload, part, digest=digest)
+        media_upload.save()
+        # A duplicate of an existing blob leaves the part file behind
+        resumable.discard_part_file(session)
+        
+        session.status = 'completed'
+        session.sha256 = digest
+        session.media_upload = media_upload
+        session.save(update_fields=['status', 'sha256', 'media_upload', 'updated_at'])
+    
+    return Response(MediaUploadSerializer(media_upload).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,18 @@
+"""
+URLs for ASGI deployments: the catalog endpoints go to their async views,
+everything else falls through to the regular urlconf.
+"""
+from django.urls import include, path
+
+from events import async_views as event_views
+from locations import async_views as location_views
+from venues import async_views as venue_views
+
+urlpatterns = [
+    path('api/venues/city/<str:city>/', event_views.venues_by_city, name='venues-by-city'),
+    path('api/venues/all/', event_views.all_venues, name='all-venues'),
+    path('api/cities/', event_views.cities_list, name='cities-list'),
+    path('api/locations/', location_views.location_list, name='location-list'),
+    path('api/venue-details/', venue_views.venue_details_list, name='venue-details-list'),
+    path('', include('partyoria_backend.urls')),
+]
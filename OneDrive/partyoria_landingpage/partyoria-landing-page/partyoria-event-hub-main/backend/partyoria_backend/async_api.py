@@ -0,0 +1,84 @@
+"""
+Async read path for the catalog endpoints.
+
+Under ASGI, `AsgiUrlconfMiddleware` switches requests to ASGI_URLCONF, which
+maps the catalog endpoints to async views built with `async_api_view` and
+falls through to the regular (sync DRF) urlconf for everything else. Under
+WSGI nothing changes.
+
+The async views produce the same JSON as their DRF counterparts and share
+their response cache entries. They query through Django's async ORM, so a
+worker keeps serving other requests while one waits on the database or the
+cache.
+"""
+import functools
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .response_cache import acached_response
+
+def render(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+def async_api_view(tags=None, timeout=None):
+    """
+    Decorator for async read-only API views.
+    
+    The view gets a DRF Request (for `query_params` and the shared filter
+    helpers) and returns JSON-serializable data or an HttpResponse (e.g. from
+    `render()` with an error status). APIExceptions become error
+    responses as in DRF. With `tags` (a list, or a callable taking the view's
+    arguments) 200 responses go through the response cache.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return render({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+            request = Request(request)
+    
+            async def compute():
+                try:
+                    result = await view(request, *args, **kwargs)
+                except APIException as e:
+                    detail = e.detail if isinstance(e.detail, (list, dict)) else {'detail': e.detail}
+                    return render(detail, status=e.status_code)
+                return result if isinstance(result, HttpResponse) else render(result)
+    
+            if tags is None:
+                return await compute()
+            resolved = tags(request, *args, **kwargs) if callable(tags) else tags
+            return await acached_response(request, resolved, compute, timeout=timeout)
+        return wrapper
+    return decorator
+
+class AsgiUrlconfMiddleware:
+    """Resolve ASGI requests against ASGI_URLCONF"""
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.select_urlconf(request)
+        return self.get_response(request)
+    
+    async def __acall__(self, request):
+        self.select_urlconf(request)
+        return await self.get_response(request)
+    
+    def select_urlconf(self, request):
+        urlconf = getattr(settings, 'ASGI_URLCONF', None)
+        if urlconf and isinstance(request, ASGIRequest):
+            request.urlconf = urlconf
@@ -0,0 +1,171 @@
+"""
+Read-replica routing.
+
+`ReplicaRoutingMiddleware` picks a replica for safe requests to the
+browsing endpoints (REPLICA_READ_PATHS) and `ReplicaRouter` sends that
+request's reads to it; everything else, and all writes, use `default`.
+
+DATABASE_REPLICAS maps replica aliases (which must also be in DATABASES)
+to weights. A replica that fails to connect is skipped for
+REPLICA_RETRY_SECONDS, so reads fall back to the other replicas or the
+primary.
+
+Read-your-writes: a successful unsafe request pins its client to the
+primary for REPLICA_PIN_SECONDS, via a cookie and, for bearer-token
+clients, an entry in the default cache keyed by a hash of the Authorization
+header. That cache is shared by every worker (Redis, see CACHES), so the pin
+holds whichever worker serves the next read. Set the window above the
+replicas' usual lag. Events are left out of REPLICA_READ_PATHS so
+organizers always read their latest changes, from any client.
+"""
+import hashlib
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.connection import ConnectionDoesNotExist
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+read_alias = ContextVar('read_alias', default=None)
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', {})
+
+def pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+def pin_cookie():
+    return getattr(settings, 'REPLICA_PIN_COOKIE', 'pin_primary')
+
+class ReplicaHealth:
+    """Per-process record of replicas that recently failed to connect"""
+    
+    def __init__(self):
+        self.down_until = {}
+        self.lock = threading.Lock()
+    
+    def is_up(self, alias):
+        return self.down_until.get(alias, 0) <= time.monotonic()
+    
+    def mark_down(self, alias):
+        retry = getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+        with self.lock:
+            self.down_until[alias] = time.monotonic() + retry
+    
+    def reset(self):
+        with self.lock:
+            self.down_until.clear()
+
+replica_health = ReplicaHealth()
+
+def check_replica(alias):
+    try:
+        connections[alias].ensure_connection()
+    except (DatabaseError, ConnectionDoesNotExist) as e:
+        logger.warning('Replica %s unavailable, reading from the primary: %s', alias, e)
+        return False
+    return True
+
+def choose_replica():
+    """A healthy replica picked by weight, or None to read from the primary"""
+    candidates = {alias: weight for alias, weight in replicas().items() if weight > 0 and replica_health.is_up(alias)}
+    while candidates:
+        alias = random.choices(list(candidates), weights=list(candidates.values()))[0]
+        if check_replica(alias):
+            return alias
+        replica_health.mark_down(alias)
+        del candidates[alias]
+    return None
+
+def routes_to_replica(path):
+    return any(path.startswith(prefix) for prefix in getattr(settings, 'REPLICA_READ_PATHS', ()))
+
+def pin_key(request):
+    header = request.META.get('HTTP_AUTHORIZATION')
+    if not header:
+        return None
+    return f'db:pin:{hashlib.sha256(header.encode()).hexdigest()[:32]}'
+
+def is_pinned(request):
+    if request.COOKIES.get(pin_cookie()):
+        return True
+    key = pin_key(request)
+    return key is not None and cache.get(key) is not None
+
+def pin_to_primary(request, response):
+    seconds = pin_seconds()
+    response.set_cookie(pin_cookie(), '1', max_age=seconds, httponly=True, samesite='Lax')
+    key = pin_key(request)
+    if key is not None:
+        cache.set(key, 1, seconds)
+
+def wants_replica(request):
+    return bool(replicas()) and request.method in SAFE_METHODS and routes_to_replica(request.path) and not is_pinned(request)
+
+def wrote(request, response):
+    return bool(replicas()) and request.method not in SAFE_METHODS and response.status_code < 400
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        alias = choose_replica() if wants_replica(request) else None
+        token = read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_alias.reset(token)
+        if wrote(request, response):
+            pin_to_primary(request, response)
+        return response
+    
+    async def __acall__(self, request):
+        # The connection check runs in the same thread as the request's queries
+        alias = await sync_to_async(choose_replica)() if wants_replica(request) else None
+        token = read_alias.set(alias)
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_alias.reset(token)
+        if wrote(request, response):
+            pin_to_primary(request, response)
+        return response
+
+class ReplicaRouter:
+    """Reads go to the replica chosen for the current request; writes and migrations to the primary"""
+    
+    def db_for_read(self, model, **hints):
+        alias = read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Reads inside a transaction must see its writes
+            return None
+        return alias
+    
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replicas():
+            return False
+        return None
@@ -0,0 +1,161 @@
+"""
+Geohash cells and great-circle distances for proximity search without PostGIS.
+
+Rows store the geohash of their coordinates at `CELL_PRECISION` in an indexed
+column. A radius query first selects the cells covering the search circle's
+bounding box (an indexed IN lookup) and then computes exact haversine
+distances for the candidates.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0088
+
+# Precision 5 cells are about 4.9 km x 4.9 km at the equator
+CELL_PRECISION = 5
+MAX_COVER_CELLS = 400
+
+def encode(lat, lng, precision=CELL_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (lng, lng_range) if even else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+def cell_for(lat, lng):
+    """Stored cell for a row's coordinates, blank when they are not set"""
+    if lat is None or lng is None:
+        return ''
+    return encode(lat, lng)
+
+def cell_size(precision):
+    """(lat_degrees, lng_degrees) spanned by a cell at `precision`"""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+def bounding_box(lat, lng, radius_km):
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    lng_delta = min(math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)), 180.0)
+    return (max(lat - lat_delta, -90.0), min(lat + lat_delta, 90.0), lng - lng_delta, lng + lng_delta)
+
+def covering_cells(lat, lng, radius_km, precision=CELL_PRECISION):
+    """
+    Geohash prefixes covering the circle's bounding box. Large radii use
+    shorter prefixes so the cover never exceeds MAX_COVER_CELLS entries.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    while precision > 1:
+        lat_step, lng_step = cell_size(precision)
+        rows = math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step) + 1
+        columns = math.floor(max_lng / lng_step) - math.floor(min_lng / lng_step) + 1
+        if rows * columns <= MAX_COVER_CELLS:
+            break
+        precision -= 1
+    
+    lat_step, lng_step = cell_size(precision)
+    cells = set()
+    cell_lat = min_lat
+    while True:
+        cell_lng = min_lng
+        while True:
+            wrapped_lng = (cell_lng + 180.0) % 360.0 - 180.0
+            cells.add(encode(min(cell_lat, 90.0 - 1e-9), wrapped_lng, precision))
+            if cell_lng >= max_lng:
+                break
+            cell_lng = min(cell_lng + lng_step, max_lng)
+        if cell_lat >= max_lat:
+            break
+        cell_lat = min(cell_lat + lat_step, max_lat)
+    return sorted(cells), precision
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def within_radius(lat, lng, radius_km, candidates):
+    """
+    Filter (key, lat, lng) candidates to those within `radius_km`, nearest
+    first, as (distance_km, key) pairs. The origin's trigonometry is
+    hoisted out of the loop so each candidate costs one haversine term.
+    """
+    origin_lat = math.radians(lat)
+    origin_lng = math.radians(lng)
+    cos_origin = math.cos(origin_lat)
+    # Compare haversine terms instead of distances to skip asin/sqrt for rejected rows
+    limit = math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi) / 2) ** 2
+    
+    sin, cos, radians = math.sin, math.cos, math.radians
+    matches = []
+    for key, candidate_lat, candidate_lng in candidates:
+        row_lat = radians(candidate_lat)
+        a = sin((row_lat - origin_lat) / 2) ** 2 + cos_origin * cos(row_lat) * sin((radians(candidate_lng) - origin_lng) / 2) ** 2
+        if a <= limit:
+            matches.append((2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a))), key))
+    matches.sort(key=lambda match: match[0])
+    return matches
+
+def cell_filter(cells, precision, field='geocell'):
+    """Q selecting rows whose stored cell lies in one of `cells`"""
+    from django.db.models import Q
+    
+    if precision >= CELL_PRECISION:
+        return Q(**{f'{field}__in': cells})
+    condition = Q()
+    for cell in cells:
+        condition |= Q(**{f'{field}__startswith': cell})
+    return condition
+
+def parse_coordinate(params, name, lower, upper, default=None):
+    from rest_framework.exceptions import ValidationError
+    
+    value = params.get(name)
+    if value in (None, ''):
+        if default is None:
+            raise ValidationError({name: 'This parameter is required.'})
+        return default
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be a number.'})
+    if not lower <= value <= upper or math.isnan(value):
+        raise ValidationError({name: f'Must be between {lower} and {upper}.'})
+    return value
+
+def nearby(queryset, params, max_radius_km=100, max_results=200):
+    """
+    Objects of `queryset` within ?radius_km= (default 10) of ?lat=&lng=, nearest
+    first, as (distance_km, instance) pairs. Candidates are pruned by geohash
+    cell before exact distances are computed.
+    """
+    lat = parse_coordinate(params, 'lat', -90, 90)
+    lng = parse_coordinate(params, 'lng', -180, 180)
+    radius_km = parse_coordinate(params, 'radius_km', 0.01, max_radius_km, default=10)
+    limit = int(parse_coordinate(params, 'limit', 1, max_results, default=50))
+    
+    cells, precision = covering_cells(lat, lng, radius_km)
+    candidates = queryset.filter(cell_filter(cells, precision)).values_list('pk', 'latitude', 'longitude')
+    matches = within_radius(lat, lng, radius_km, candidates.iterator(chunk_size=5000))[:limit]
+    
+    instances = queryset.in_bulk([pk for _, pk in matches])
+    return [(round(distance, 3), instances[pk]) for distance, pk in matches if pk in instances]
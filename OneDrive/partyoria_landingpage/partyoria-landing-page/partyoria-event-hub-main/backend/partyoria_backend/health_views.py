@@ -1,5 +1,16 @@
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+
+from .metrics import registry, render
 
 def health_check(request):
     """Simple health check endpoint"""
-    return JsonResponse({'status': 'healthy', 'message': 'Backend is running'})
\ No newline at end of file
+    return JsonResponse({'status': 'healthy', 'message': 'Backend is running'})
+
+def metrics(request):
+    """Request metrics for all workers in Prometheus text format, behind `Bearer METRICS_TOKEN` when set"""
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return JsonResponse({'detail': 'Invalid metrics token.'}, status=401)
+    return HttpResponse(render(registry.collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
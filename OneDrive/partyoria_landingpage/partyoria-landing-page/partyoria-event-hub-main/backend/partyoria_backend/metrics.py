@@ -0,0 +1,244 @@
+"""
+Per-endpoint request metrics in Prometheus text format.
+
+`MetricsMiddleware` records, per resolved URL name: request count by method
+and status, latency, response size and SQL query count/time. SQL is measured
+by an execute wrapper on every connection that adds to the current request's
+totals (a contextvar, so it follows async views into their ORM threads).
+
+Recording is lock-free: each thread writes to its own shard, and shards are
+only merged when /api/metrics is scraped. With several worker processes
+(gunicorn), set METRICS_MULTIPROC_DIR to a directory shared by the workers
+and emptied on deploy; each worker writes its totals there at most every
+METRICS_FLUSH_INTERVAL seconds and a scrape of any worker sums them all.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'http_requests_total': ('counter', 'Requests by view, method and status code.', None),
+    'http_request_duration_seconds': ('histogram', 'Request latency by view.', LATENCY_BUCKETS),
+    'http_response_size_bytes': ('histogram', 'Response body size by view (streaming responses excluded).', SIZE_BUCKETS),
+    'db_queries_per_request': ('histogram', 'SQL queries per request by view.', QUERY_BUCKETS),
+    'db_query_duration_seconds_total': ('counter', 'Time spent executing SQL by view.', None),
+}
+
+class MetricsRegistry:
+    """
+    Counters and histograms keyed by (metric name, label tuple).
+    
+    Histogram values are [count per bucket..., count above the last bucket, sum].
+    """
+    
+    def __init__(self):
+        self.local = threading.local()
+        self.shards = []
+        self.retired = {}
+        self.lock = threading.Lock()
+        self.next_flush = 0
+    
+    def shard(self):
+        shard = getattr(self.local, 'shard', None)
+        if shard is None:
+            shard = self.local.shard = {}
+            with self.lock:
+                # Fold in the shards of finished threads so the list stays bounded
+                alive = []
+                for thread, other in self.shards:
+                    if thread.is_alive():
+                        alive.append((thread, other))
+                    else:
+                        merge(self.retired, other)
+                alive.append((threading.current_thread(), shard))
+                self.shards = alive
+        return shard
+    
+    def inc(self, name, labels, amount=1):
+        shard = self.shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + amount
+    
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        shard = self.shard()
+        key = (name, labels)
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0] * (len(buckets) + 2)
+        values[bisect_left(buckets, value)] += 1
+        values[-1] += value
+    
+    def snapshot(self):
+        """This process's totals"""
+        with self.lock:
+            totals = {}
+            merge(totals, self.retired)
+            for _, shard in self.shards:
+                merge(totals, shard)
+        return totals
+    
+    def maybe_flush(self):
+        directory = getattr(settings, 'METRICS_MULTIPROC_DIR', None)
+        if not directory or time.monotonic() < self.next_flush:
+            return
+        self.next_flush = time.monotonic() + getattr(settings, 'METRICS_FLUSH_INTERVAL', 1)
+        self.flush(directory)
+    
+    def flush(self, directory):
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+        rows = [[name, list(labels), value] for (name, labels), value in self.snapshot().items()]
+        with open(temporary, 'w') as f:
+            json.dump(rows, f)
+        os.replace(temporary, path)
+    
+    def collect(self):
+        """Totals across every process writing to METRICS_MULTIPROC_DIR (or just this one)"""
+        totals = self.snapshot()
+        directory = getattr(settings, 'METRICS_MULTIPROC_DIR', None)
+        if not directory:
+            return totals
+        own = f'{os.getpid()}.json'
+        for filename in os.listdir(directory):
+            if filename == own or not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    rows = json.load(f)
+            except (OSError, ValueError):
+                continue
+            merge(totals, {(name, tuple(tuple(pair) for pair in labels)): value for name, labels, value in rows})
+        return totals
+    
+    def reset(self):
+        with self.lock:
+            self.retired = {}
+            for _, shard in self.shards:
+                shard.clear()
+
+def merge(totals, shard):
+    # dict() copies a shard in one step even while its thread writes to it
+    for key, value in dict(shard).items():
+        if isinstance(value, list):
+            current = totals.get(key)
+            totals[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+        else:
+            totals[key] = totals.get(key, 0) + value
+
+registry = MetricsRegistry()
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(labels):
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels) + '}' if labels else ''
+
+def format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render(totals):
+    """Prometheus text exposition (version 0.0.4) of `totals`"""
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = sorted((labels, value) for (metric, labels), value in totals.items() if metric == name)
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in series:
+            if kind == 'counter':
+                lines.append(f'{name}{format_labels(labels)} {format_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), value[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(labels + (("le", bound),))} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {format_number(value[-1])}')
+            lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+# SQL timing
+
+query_stats = ContextVar('query_stats', default=None)
+
+def record_query(execute, sql, params, many, context):
+    stats = query_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats[0] += 1
+        stats[1] += time.perf_counter() - start
+
+def install_query_recorder(connection, **kwargs):
+    # Connection objects are reused across reconnects
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+connection_created.connect(install_query_recorder)
+
+# Middleware
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else '<unresolved>'
+
+def record(request, response, elapsed, stats):
+    view = view_label(request)
+    labels = (('view', view),)
+    registry.inc('http_requests_total', (('view', view), ('method', request.method), ('status', str(response.status_code))))
+    registry.observe('http_request_duration_seconds', labels, elapsed)
+    if not response.streaming:
+        registry.observe('http_response_size_bytes', labels, len(response.content))
+    registry.observe('db_queries_per_request', labels, stats[0])
+    if stats[1]:
+        registry.inc('db_query_duration_seconds_total', labels, stats[1])
+    registry.maybe_flush()
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = [0, 0.0]
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            query_stats.reset(token)
+        record(request, response, time.perf_counter() - start, stats)
+        return response
+    
+    async def __acall__(self, request):
+        stats = [0, 0.0]
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            query_stats.reset(token)
+        record(request, response, time.perf_counter() - start, stats)
+        return response
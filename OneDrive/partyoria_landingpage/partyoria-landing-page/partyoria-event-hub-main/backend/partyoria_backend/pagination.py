@@ -0,0 +1,22 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Opaque-cursor keyset pagination over (created_at, id).
+
+    Each page is fetched with a ``WHERE created_at < <cursor>`` predicate
+    against the composite (created_at, id) index instead of an OFFSET, so
+    deep pages cost the same as the first one.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    
+    def get_ordering(self, request, queryset, view):
+        # Views with user-selectable sorting supply their own keyset ordering
+        if hasattr(view, 'get_cursor_ordering'):
+            ordering = view.get_cursor_ordering()
+            if ordering:
+                return ordering
+        return super().get_ordering(request, queryset, view)
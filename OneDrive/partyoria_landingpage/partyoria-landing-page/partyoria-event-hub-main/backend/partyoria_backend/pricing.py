@@ -0,0 +1,89 @@
+"""
+Parsing of display price strings and budget filtering.
+
+Venue prices are stored as display strings such as '₹50,000 - ₹1,20,000',
+'Rs 1.5 - 2 Lakh' or '25k onwards'. `parse_price_range` turns them into
+whole-rupee (min, max) bounds for the indexed price_min/price_max columns.
+"""
+import re
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+UNITS = {
+    'k': 1_000,
+    'thousand': 1_000,
+    'l': 1_00_000,
+    'lac': 1_00_000,
+    'lacs': 1_00_000,
+    'lakh': 1_00_000,
+    'lakhs': 1_00_000,
+    'cr': 1_00_00_000,
+    'crore': 1_00_00_000,
+    'crores': 1_00_00_000,
+}
+
+# A number with Indian (1,20,000) or western (120,000) digit grouping, and an optional unit
+AMOUNT_RE = re.compile(r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(' + '|'.join(sorted(UNITS, key=len, reverse=True)) + r')?\b', re.IGNORECASE)
+UPPER_BOUND_RE = re.compile(r'\b(?:up\s*to|upto|under|below|max(?:imum)?)\b', re.IGNORECASE)
+LOWER_BOUND_RE = re.compile(r'\b(?:onwards|starting|from|above|min(?:imum)?)\b|\+', re.IGNORECASE)
+
+def parse_price_range(text):
+    """
+    Return (price_min, price_max) in rupees for a display price.
+    
+    Open-ended prices ('25k onwards', '₹1,00,000+') have no price_max and
+    strings without an amount give (None, None).
+    """
+    if not text:
+        return None, None
+    
+    amounts = []
+    for number, unit in AMOUNT_RE.findall(text):
+        amounts.append([float(number.replace(',', '')), unit.lower() if unit else None])
+    if not amounts:
+        return None, None
+    
+    # '1.5 - 2 Lakh': a bare lower bound takes the unit of the upper bound
+    if len(amounts) >= 2 and amounts[0][1] is None and amounts[1][1] is not None:
+        amounts[0][1] = amounts[1][1]
+    
+    values = [round(number * UNITS.get(unit, 1)) for number, unit in amounts[:2]]
+    if len(values) == 1:
+        if UPPER_BOUND_RE.search(text):
+            return 0, values[0]
+        if LOWER_BOUND_RE.search(text):
+            return values[0], None
+        return values[0], values[0]
+    return min(values), max(values)
+
+def parse_budget_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be a whole number of rupees.'})
+    if value < 0:
+        raise ValidationError({name: 'Must not be negative.'})
+    return value
+
+def budget_filter(params):
+    """
+    Q matching prices that overlap ?budget_min= / ?budget_max=, or None when
+    neither is given. Raises ValidationError (HTTP 400) for malformed values.
+    """
+    budget_min = parse_budget_param(params, 'budget_min')
+    budget_max = parse_budget_param(params, 'budget_max')
+    if budget_min is None and budget_max is None:
+        return None
+    if budget_min is not None and budget_max is not None and budget_min > budget_max:
+        raise ValidationError({'budget_min': 'Must not exceed budget_max.'})
+    
+    condition = Q(price_min__isnull=False)
+    if budget_max is not None:
+        condition &= Q(price_min__lte=budget_max)
+    if budget_min is not None:
+        condition &= Q(price_max__gte=budget_min) | Q(price_max__isnull=True)
+    return condition
@@ -0,0 +1,302 @@
+"""
+On-demand profiling of live requests.
+
+A request is profiled when it carries a valid signed `X-Profile` header
+(from POST /api/admin/profiles/token/) or is picked by PROFILE_SAMPLE_RATE.
+A profiled request runs under cProfile and a stack sampler, and its SQL
+statements are captured and EXPLAINed afterwards. The results are written
+to PROFILE_DIR:
+
+- `<id>.json`: a summary with the slowest functions and the SQL with plans.
+- `<id>.folded`: collapsed stacks, for flamegraph.pl or speedscope.
+
+The directory is a ring buffer of the newest PROFILE_MAX_ENTRIES profiles.
+When a request is not profiled, the cost is a header lookup and one
+comparison.
+"""
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'X-Profile'
+TOKEN_SALT = 'partyoria_backend.profiling'
+ENTRY_ID = re.compile(r'^\d+-\d+$')
+
+def profile_dir():
+    return str(getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+def token_max_age():
+    return getattr(settings, 'PROFILE_TOKEN_MAX_AGE', 60 * 60)
+
+def issue_token():
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+def valid_token(token):
+    try:
+        return signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=token_max_age()) == 'profile'
+    except signing.BadSignature:
+        return False
+
+def profile_trigger(request):
+    """'header' or 'sample' when this request should be profiled, else None"""
+    token = request.META.get('HTTP_X_PROFILE')
+    if token:
+        return 'header' if valid_token(token) else None
+    rate = getattr(settings, 'PROFILE_SAMPLE_RATE', 0)
+    if rate and random.random() < rate:
+        return 'sample'
+    return None
+
+# SQL capture
+
+captured_sql = ContextVar('captured_sql', default=None)
+
+def capture_query(execute, sql, params, many, context):
+    statements = captured_sql.get()
+    if statements is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        statements.append((context['connection'].alias, sql, None if many else params, time.perf_counter() - start))
+
+def install_query_capture(connection, **kwargs):
+    if capture_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(capture_query)
+
+connection_created.connect(install_query_capture)
+
+def explain(alias, sql, params):
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+        rows = cursor.fetchall()
+    return '\n'.join(str(row[0]) if len(row) == 1 else ' '.join(str(value) for value in row) for row in rows)
+
+def summarize_sql(statements):
+    """Group identical statements, slowest first, with plans for the slowest SELECTs"""
+    grouped = {}
+    for alias, sql, params, duration in statements:
+        entry = grouped.get((alias, sql))
+        if entry is None:
+            entry = grouped[(alias, sql)] = {'alias': alias, 'sql': sql, 'params': params, 'count': 0, 'duration_ms': 0.0}
+        entry['count'] += 1
+        entry['duration_ms'] += duration * 1000
+    
+    entries = sorted(grouped.values(), key=lambda entry: entry['duration_ms'], reverse=True)
+    max_explain = getattr(settings, 'PROFILE_MAX_EXPLAIN', 20)
+    for position, entry in enumerate(entries):
+        params = entry['params']
+        if position < max_explain and params is not None and entry['sql'].lstrip().upper().startswith('SELECT'):
+            try:
+                entry['explain'] = explain(entry['alias'], entry['sql'], params)
+            except Exception as e:
+                entry['explain_error'] = str(e)
+        entry['params'] = repr(params)
+        entry['duration_ms'] = round(entry['duration_ms'], 3)
+    return entries
+
+# Stack sampling
+
+def frame_label(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+class StackSampler(threading.Thread):
+    """Counts collapsed stacks of the given threads (all other threads when None) every `interval` seconds"""
+    
+    def __init__(self, thread_ids=None, interval=0.001):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.thread_ids = thread_ids
+        self.interval = interval
+        self.stacks = Counter()
+        self.finished = threading.Event()
+    
+    def run(self):
+        own = threading.get_ident()
+        while not self.finished.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (self.thread_ids is not None and ident not in self.thread_ids):
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(labels))] += 1
+    
+    def stop(self):
+        self.finished.set()
+        self.join()
+
+def top_functions(profile, limit=30):
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, line, name), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f'{name} ({os.path.basename(filename)}:{line})',
+            'calls': calls,
+            'own_ms': round(total * 1000, 3),
+            'cumulative_ms': round(cumulative * 1000, 3),
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:limit]
+
+def top_sampled_functions(stacks, limit=30):
+    leaves = Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(';', 1)[-1]] += count
+    return [{'function': function, 'samples': count} for function, count in leaves.most_common(limit)]
+
+# Ring buffer
+
+def write_entry(summary, stacks):
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, summary['id'])
+    with open(f'{base}.folded', 'w') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+    with open(f'{base}.json', 'w') as f:
+        json.dump(summary, f, indent=1)
+    
+    ids = entry_ids()
+    for stale in ids[getattr(settings, 'PROFILE_MAX_ENTRIES', 50):]:
+        for extension in ('json', 'folded'):
+            try:
+                os.remove(os.path.join(directory, f'{stale}.{extension}'))
+            except FileNotFoundError:
+                pass
+
+def entry_ids():
+    """Profile ids, newest first"""
+    try:
+        names = os.listdir(profile_dir())
+    except FileNotFoundError:
+        return []
+    ids = [name[:-5] for name in names if name.endswith('.json') and ENTRY_ID.match(name[:-5])]
+    return sorted(ids, key=lambda entry_id: int(entry_id.split('-')[0]), reverse=True)
+
+def entry_path(entry_id, extension):
+    if not ENTRY_ID.match(entry_id):
+        return None
+    path = os.path.join(profile_dir(), f'{entry_id}.{extension}')
+    return path if os.path.exists(path) else None
+
+def read_summary(entry_id):
+    path = entry_path(entry_id, 'json')
+    if path is None:
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+# Middleware
+
+class ProfileSession:
+    def __init__(self, request, trigger, profile_thread):
+        self.request = request
+        self.trigger = trigger
+        self.statements = []
+        self.profile = cProfile.Profile() if profile_thread else None
+        thread_ids = {threading.get_ident()} if profile_thread else None
+        self.sampler = StackSampler(thread_ids, getattr(settings, 'PROFILE_SAMPLE_INTERVAL', 0.001))
+    
+    def start(self):
+        self.token = captured_sql.set(self.statements)
+        self.started_at = time.time()
+        self.start_time = time.perf_counter()
+        self.sampler.start()
+        if self.profile is not None:
+            self.profile.enable()
+    
+    def stop(self):
+        if self.profile is not None:
+            self.profile.disable()
+        self.duration = time.perf_counter() - self.start_time
+        self.sampler.stop()
+        captured_sql.reset(self.token)
+    
+    def save(self, response):
+        request = self.request
+        match = getattr(request, 'resolver_match', None)
+        summary = {
+            'id': f'{time.time_ns()}-{os.getpid()}',
+            'trigger': self.trigger,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': match.view_name if match is not None else None,
+            'status': response.status_code,
+            'started_at': self.started_at,
+            'duration_ms': round(self.duration * 1000, 3),
+            'samples': sum(self.sampler.stacks.values()),
+            'sql_count': len(self.statements),
+            'sql_ms': round(sum(duration for *_, duration in self.statements) * 1000, 3),
+            'top_functions': top_functions(self.profile) if self.profile is not None else top_sampled_functions(self.sampler.stacks),
+            'sql': summarize_sql(self.statements),
+        }
+        try:
+            write_entry(summary, self.sampler.stacks)
+        except OSError:
+            logger.exception('Could not write profile %s', summary['id'])
+
+class ProfilingMiddleware:
+    """
+    Profiles requests picked by `profile_trigger()`.
+    
+    Under ASGI the request's work is spread over threads, so the sampler
+    records every thread of the worker and cProfile is skipped.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_query_capture(connection)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        trigger = profile_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        session = ProfileSession(request, trigger, profile_thread=True)
+        session.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            session.stop()
+        session.save(response)
+        return response
+    
+    async def __acall__(self, request):
+        trigger = profile_trigger(request)
+        if trigger is None:
+            return await self.get_response(request)
+        session = ProfileSession(request, trigger, profile_thread=False)
+        session.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            session.stop()
+        await sync_to_async(session.save)(response)
+        return response
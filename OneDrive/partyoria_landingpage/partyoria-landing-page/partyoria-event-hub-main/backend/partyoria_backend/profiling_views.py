@@ -0,0 +1,47 @@
+from django.http import FileResponse, Http404
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from . import profiling
+
+SUMMARY_FIELDS = ['id', 'trigger', 'method', 'path', 'view', 'status', 'started_at', 'duration_ms', 'sql_count', 'sql_ms']
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_list(request):
+    """Recorded profiles, newest first"""
+    profiles = []
+    for entry_id in profiling.entry_ids():
+        summary = profiling.read_summary(entry_id)
+        if summary is not None:
+            profiles.append({field: summary.get(field) for field in SUMMARY_FIELDS})
+    return Response({'results': profiles})
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_detail(request, entry_id):
+    """Summary of one profile: slowest functions and SQL with EXPLAIN plans"""
+    summary = profiling.read_summary(entry_id)
+    if summary is None:
+        raise Http404
+    return Response(summary)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_stacks(request, entry_id):
+    """Collapsed stacks of one profile, for flamegraph.pl or speedscope"""
+    path = profiling.entry_path(entry_id, 'folded')
+    if path is None:
+        raise Http404
+    return FileResponse(open(path, 'rb'), content_type='text/plain; charset=utf-8')
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def profile_token(request):
+    """A signed token; send it as the X-Profile header to profile a request"""
+    return Response({
+        'header': profiling.HEADER,
+        'token': profiling.issue_token(),
+        'expires_in': profiling.token_max_age(),
+    })
@@ -0,0 +1,223 @@
+"""
+Tag-based response cache for read-heavy DRF views.
+
+Responses are cached per path, normalized query string and auth scope, and
+stored rendered, so a hit skips the database, the serializer and the
+renderer. Every entry records the version of each of its tags (e.g.
+'venue:list', 'venue:city:mumbai'); `invalidate_tags()` bumps a tag's
+version, which makes every entry carrying it stale without tracking keys.
+Model signals call it through `invalidate_tags_on_commit()`: invalidating
+before the write commits would let a concurrent request cache the old rows
+again under the new version.
+
+Stampede protection: one request per key recomputes a missing or stale
+entry under a short lock. Meanwhile other requests get the stale entry if
+there is one, or wait briefly for the fresh one.
+
+The backend is the RESPONSE_CACHE_ALIAS cache (the shared Redis default
+cache; tests use locmem). Django 4.2's async cache methods are thread-hopping
+wrappers around the sync ones, so the async path batches its cache reads
+into one call and runs in-process backends inline.
+"""
+import asyncio
+import functools
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+KEY_PREFIX = 'rc'
+
+# Backends that never block, so async code can call them without a thread
+IN_PROCESS_CACHES = (LocMemCache, DummyCache)
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+def cache_timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+def tag_key(tag):
+    return f'{KEY_PREFIX}:tag:{tag}'
+
+def tag_versions(tags):
+    """Current version of each tag, creating versions for tags not seen yet"""
+    backend = get_cache()
+    keys = {tag: tag_key(tag) for tag in tags}
+    found = backend.get_many(list(keys.values()))
+    versions = {}
+    for tag, key in keys.items():
+        if key not in found:
+            # Seeded from the clock so a version lost to eviction is never reused
+            backend.add(key, time.time_ns(), timeout=None)
+            found[key] = backend.get(key)
+        versions[tag] = found[key]
+    return versions
+
+async def run_cache(backend, function, *args, **kwargs):
+    """Call a sync cache operation from async code, in the sync thread unless the backend is in-process"""
+    if isinstance(backend, IN_PROCESS_CACHES):
+        return function(*args, **kwargs)
+    return await sync_to_async(function)(*args, **kwargs)
+
+def invalidate_tags(*tags):
+    backend = get_cache()
+    for tag in set(tags):
+        try:
+            backend.incr(tag_key(tag))
+        except ValueError:
+            backend.add(tag_key(tag), time.time_ns(), timeout=None)
+
+def invalidate_tags_on_commit(*tags):
+    """`invalidate_tags()` once the current transaction commits, or right away outside one"""
+    transaction.on_commit(functools.partial(invalidate_tags, *tags))
+
+def auth_scope(request, per_user=False):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return 'anon'
+    return f'user:{user.pk}' if per_user else 'auth'
+
+def response_key(request, per_user=False):
+    params = sorted((name, value) for name in request.GET for value in request.GET.getlist(name))
+    raw = '\n'.join([request.path, repr(params), auth_scope(request, per_user)])
+    return f'{KEY_PREFIX}:resp:{hashlib.sha256(raw.encode()).hexdigest()}'
+
+def to_http_response(entry, status):
+    response = HttpResponse(entry['content'], status=entry['status'], content_type=entry['content_type'])
+    response['X-Cache'] = status
+    return response
+
+def is_fresh(entry, versions):
+    return entry is not None and entry['tags'] == versions
+
+def lookup(key, tags):
+    """(tag versions, cached entry) for a response key"""
+    return tag_versions(tags), get_cache().get(key)
+
+def cached_response(request, tags, compute, timeout=None, per_user=False):
+    """Return a cached response for `request`, or call `compute()` and cache its 200 response"""
+    if request.method != 'GET':
+        return compute()
+    backend = get_cache()
+    key = response_key(request, per_user)
+    versions, entry = lookup(key, tags)
+    if is_fresh(entry, versions):
+        return to_http_response(entry, 'HIT')
+    
+    lock_key = f'{key}:lock'
+    lock_timeout = getattr(settings, 'RESPONSE_CACHE_LOCK_TIMEOUT', 10)
+    if not backend.add(lock_key, 1, timeout=lock_timeout):
+        # Someone else is rebuilding this entry
+        if entry is not None:
+            return to_http_response(entry, 'STALE')
+        deadline = time.monotonic() + getattr(settings, 'RESPONSE_CACHE_WAIT', 2)
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = backend.get(key)
+            if is_fresh(entry, versions):
+                return to_http_response(entry, 'HIT')
+        return compute()
+    
+    try:
+        response = compute()
+        if response.status_code != 200:
+            return response
+        content = JSONRenderer().render(response.data)
+        entry = {
+            'tags': versions,
+            'status': response.status_code,
+            'content': content,
+            'content_type': 'application/json',
+        }
+        backend.set(key, entry, timeout if timeout is not None else cache_timeout())
+        return to_http_response(entry, 'MISS')
+    finally:
+        backend.delete(lock_key)
+
+async def acached_response(request, tags, compute, timeout=None, per_user=False):
+    """
+    `cached_response()` for async views, sharing its entries.
+    
+    `compute` is a coroutine function returning a rendered HttpResponse.
+    """
+    if request.method != 'GET':
+        return await compute()
+    backend = get_cache()
+    key = response_key(request, per_user)
+    versions, entry = await run_cache(backend, lookup, key, tags)
+    if is_fresh(entry, versions):
+        return to_http_response(entry, 'HIT')
+    
+    lock_key = f'{key}:lock'
+    if not await run_cache(backend, backend.add, lock_key, 1, timeout=getattr(settings, 'RESPONSE_CACHE_LOCK_TIMEOUT', 10)):
+        if entry is not None:
+            return to_http_response(entry, 'STALE')
+        deadline = time.monotonic() + getattr(settings, 'RESPONSE_CACHE_WAIT', 2)
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            entry = await run_cache(backend, backend.get, key)
+            if is_fresh(entry, versions):
+                return to_http_response(entry, 'HIT')
+        return await compute()
+    
+    try:
+        response = await compute()
+        if response.status_code != 200:
+            return response
+        entry = {
+            'tags': versions,
+            'status': response.status_code,
+            'content': response.content,
+            'content_type': response['Content-Type'],
+        }
+        await run_cache(backend, backend.set, key, entry, timeout if timeout is not None else cache_timeout())
+        return to_http_response(entry, 'MISS')
+    finally:
+        await run_cache(backend, backend.delete, lock_key)
+
+def cache_response(tags, timeout=None, per_user=False):
+    """
+    Decorator for function views (under @api_view) and view methods.
+    
+    `tags` is a list of tags or a callable taking the view's arguments
+    (request, *args, **kwargs) and returning one.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            # Methods get (self, request, ...), function views (request, ...)
+            index = 0 if hasattr(args[0], 'query_params') else 1
+            request = args[index]
+            resolved = tags(*args[index:], **kwargs) if callable(tags) else tags
+            return cached_response(request, resolved, lambda: view(*args, **kwargs), timeout=timeout, per_user=per_user)
+        return wrapper
+    return decorator
+
+class CachedResponseMixin:
+    """
+    Caches the `cached_actions` (default: list) of a generic view or viewset
+    under `cache_tags` (or get_cache_tags()).
+    """
+    cache_tags = ()
+    cache_timeout = None
+    cache_per_user = False
+    cached_actions = ('list',)
+    
+    def get_cache_tags(self):
+        return list(self.cache_tags)
+    
+    def list(self, request, *args, **kwargs):
+        if getattr(self, 'action', 'list') not in self.cached_actions:
+            return super().list(request, *args, **kwargs)
+        return cached_response(
+            request, self.get_cache_tags(), lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs),
+            timeout=self.cache_timeout, per_user=self.cache_per_user,
+        )
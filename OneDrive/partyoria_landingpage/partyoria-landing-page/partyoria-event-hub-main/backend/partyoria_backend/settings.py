@@ -23,20 +23,27 @@ INSTALLED_APPS = [
     'media_uploads',
     'venues',
     'locations',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
+    'partyoria_backend.profiling.ProfilingMiddleware',
+    'partyoria_backend.metrics.MetricsMiddleware',
+    'partyoria_backend.async_api.AsgiUrlconfMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'partyoria_backend.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'partyoria_backend.urls'
+# Under ASGI the catalog endpoints are served by async views (partyoria_backend.async_api)
+ASGI_URLCONF = 'partyoria_backend.asgi_urls'
 
 TEMPLATES = [
     {
@@ -67,8 +74,38 @@ DATABASES = {
     }
 }
 
+# Read replicas: add each replica to DATABASES and weight it here, e.g.
+# DATABASES['replica1'] = {..., 'HOST': 'replica1.internal'}
+# DATABASE_REPLICAS = {'replica1': 2, 'replica2': 1}
+DATABASE_REPLICAS = {}
+DATABASE_ROUTERS = ['partyoria_backend.db_router.ReplicaRouter']
+REPLICA_READ_PATHS = ['/api/venues/', '/api/venue-details/', '/api/venue-search/', '/api/locations/', '/api/cities/']
+REPLICA_PIN_SECONDS = 10
+REPLICA_RETRY_SECONDS = 30
+
+# The default cache must be shared by every worker process: it holds the versions of
+# the in-memory snapshots (location catalog, facet index), the response cache and its
+# tag versions, and the replica pins. A per-process cache (LocMemCache) would leave the
+# other workers serving stale data, so it is only used by test_settings.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    }
+}
+
 AUTH_USER_MODEL = 'users.User'
 
+AUTHENTICATION_BACKENDS = [
+    'users.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Signed bearer tokens issued by /api/users/login/ (lifetimes in seconds)
+ACCESS_TOKEN_TTL = 15 * 60
+REFRESH_TOKEN_TTL = 14 * 24 * 60 * 60
+TOKEN_USER_CACHE_TTL = 30
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -95,15 +132,59 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media is served by media_uploads.views.serve_media. Set MEDIA_ACCEL_MODE to
+# 'x-accel-redirect' (nginx, internal location at MEDIA_ACCEL_PREFIX aliased to
+# MEDIA_ROOT) or 'x-sendfile' (Apache/lighttpd) to let the proxy send the bytes.
+MEDIA_ACCEL_MODE = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+# Hash uploads as they stream in so media storage can deduplicate by content
+FILE_UPLOAD_HANDLERS = [
+    'media_uploads.upload_handlers.HashingMemoryFileUploadHandler',
+    'media_uploads.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+
+# Resized variants of uploaded images; 0 workers renders inline instead of in a process pool
+MEDIA_DERIVATIVE_WIDTHS = [160, 480, 1024]
+MEDIA_DERIVATIVE_FORMATS = ['webp', 'jpeg']
+MEDIA_DERIVATIVE_WORKERS = 2
+
+# Request metrics at /api/metrics (partyoria_backend.metrics). With several worker
+# processes, point METRICS_MULTIPROC_DIR at a directory they share, emptied on deploy.
+METRICS_MULTIPROC_DIR = None
+METRICS_FLUSH_INTERVAL = 1
+METRICS_TOKEN = None
+
+# On-demand request profiling (partyoria_backend.profiling): requests with a signed
+# X-Profile header, plus a PROFILE_SAMPLE_RATE fraction of all requests
+PROFILE_SAMPLE_RATE = 0
+PROFILE_DIR = BASE_DIR / 'profiles'
+PROFILE_MAX_ENTRIES = 50
+
+# Tagged response cache for venue/location reads (partyoria_backend.response_cache).
+# The alias must be shared by all workers so invalidations reach every one of them.
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Venue facet filters (events.facets) pass up to this many matching ids to the
+# database; broader selections are filtered with SQL predicates instead
+FACET_ID_LIMIT = 1000
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'users.authentication.SignedTokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'partyoria_backend.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': 50,
 }
 
 CORS_ALLOWED_ORIGINS = [
@@ -0,0 +1,59 @@
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from .response_cache import run_cache
+
+
+class VersionedSnapshot:
+    """
+    Process-local copy of data derived from the database.
+    
+    The data is built once per process and kept in memory alongside the
+    version it was built from. The version counter lives in the default cache,
+    which every worker shares (Redis, see CACHES in settings), so `invalidate()`
+    in any process makes every process rebuild on its next `get()`; in steady
+    state a read costs a cache lookup and no DB queries.
+    """
+    
+    def __init__(self, key, builder):
+        self.key = key
+        self.builder = builder
+        self._version = None
+        self._value = None
+        self._lock = threading.Lock()
+    
+    def version(self):
+        version = cache.get(self.key)
+        if version is None:
+            # Seed from the clock rather than 1 so a counter lost to eviction
+            # or a cache flush never reappears with a version already seen
+            cache.add(self.key, time.time_ns(), timeout=None)
+            version = cache.get(self.key)
+        return version
+    
+    def get(self):
+        version = self.version()
+        if version != self._version:
+            self.rebuild(version)
+        return self._value
+    
+    async def aget(self):
+        """`get()` for async views; an in-process cache is read inline and only a rebuild needs a thread"""
+        version = await run_cache(cache, self.version)
+        if version != self._version:
+            await sync_to_async(self.rebuild)(version)
+        return self._value
+    
+    def rebuild(self, version):
+        with self._lock:
+            if version != self._version:
+                self._value = self.builder()
+                self._version = version
+    
+    def invalidate(self):
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            cache.add(self.key, time.time_ns(), timeout=None)
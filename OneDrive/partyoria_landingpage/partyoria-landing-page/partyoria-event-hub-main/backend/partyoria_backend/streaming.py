@@ -0,0 +1,107 @@
+"""
+Streaming CSV/NDJSON exports.
+
+Rows are read with `QuerySet.values_list(...).iterator(chunk_size=...)` and
+encoded as they arrive, so memory stays flat however large the table is.
+Encoded rows are coalesced into ~64 KB chunks before being handed to the
+server, and can be gzipped on the fly.
+"""
+import csv
+import datetime
+import decimal
+import json
+import zlib
+
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+class Echo:
+    """File-like object whose write() returns the line, for csv.writer"""
+    
+    def write(self, value):
+        return value
+
+def export_options(params):
+    """(fmt, compress) from ?fmt=csv|ndjson (default csv) and ?gzip=true"""
+    fmt = params.get('fmt', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        raise ValidationError({'fmt': f'Must be one of: {", ".join(EXPORT_FORMATS)}.'})
+    return fmt, params.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+def to_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+def to_json(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+def iter_rows(queryset, columns, chunk_size=CHUNK_SIZE):
+    """Tuples of column values, fetched in chunks (server-side cursor on PostgreSQL)"""
+    return queryset.values_list(*columns).iterator(chunk_size=chunk_size)
+
+def iter_csv(rows, columns):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([to_text(value) for value in row])
+
+def iter_ndjson(rows, columns):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, map(to_json, row))), ensure_ascii=False, separators=(',', ':')) + '\n'
+
+def iter_encoded(lines, buffer_size=BUFFER_SIZE):
+    """Encode text lines as UTF-8 and coalesce them into chunks of about `buffer_size` bytes"""
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        buffer.append(data)
+        size += len(data)
+        if size >= buffer_size:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+def iter_gzip(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def iter_export(queryset, columns, fmt, compress=False, chunk_size=CHUNK_SIZE):
+    """Byte chunks of `queryset` exported as `fmt`"""
+    rows = iter_rows(queryset, columns, chunk_size=chunk_size)
+    lines = iter_csv(rows, columns) if fmt == 'csv' else iter_ndjson(rows, columns)
+    chunks = iter_encoded(lines)
+    return iter_gzip(chunks) if compress else chunks
+
+def export_response(queryset, columns, fmt, filename, compress=False):
+    """StreamingHttpResponse that downloads `queryset` as <filename>.<fmt>[.gz]"""
+    filename = f'{filename}.{fmt}'
+    content_type = EXPORT_FORMATS[fmt]
+    if compress:
+        filename += '.gz'
+        content_type = 'application/gzip'
+    response = StreamingHttpResponse(iter_export(queryset, columns, fmt, compress=compress), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,12 @@
+"""
+Settings for the test suite: `python manage.py test --settings=partyoria_backend.test_settings`.
+
+Tests run in one process, so a per-process cache stands in for Redis.
+"""
+from .settings import *  # noqa: F401,F403
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
@@ -1,18 +1,22 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
-from .health_views import health_check
+from media_uploads.views import serve_media
+from .health_views import health_check, metrics
+from . import profiling_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/health/', health_check, name='health_check'),
+    path('api/metrics', metrics, name='metrics'),
+    path('api/admin/profiles/', profiling_views.profile_list, name='profile-list'),
+    path('api/admin/profiles/token/', profiling_views.profile_token, name='profile-token'),
+    path('api/admin/profiles/<str:entry_id>/', profiling_views.profile_detail, name='profile-detail'),
+    path('api/admin/profiles/<str:entry_id>/stacks/', profiling_views.profile_stacks, name='profile-stacks'),
     path('api/users/', include('users.urls')),
     path('', include('events.urls')),
     path('api/media/', include('media_uploads.urls')),
     path('', include('venues.urls')),
     path('', include('locations.urls')),
-]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", serve_media, name='media-file'),
+]
\ No newline at end of file
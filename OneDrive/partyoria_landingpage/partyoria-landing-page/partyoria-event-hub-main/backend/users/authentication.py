@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework import authentication, exceptions
+
+from .models import User
+from .tokens import TokenError, verify_access_token
+
+class UserCache:
+    """
+    Small per-process LRU of User objects with a TTL.
+    
+    User saves and deletes evict their entry in this process (see signals);
+    other processes see a change within `ttl` seconds.
+    """
+    
+    def __init__(self, ttl=30, max_size=1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, user_id):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(user_id)
+                return entry[1]
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        with self.lock:
+            self.entries[user_id] = (now + self.ttl, user)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return user
+    
+    def evict(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+user_cache = UserCache(ttl=getattr(settings, 'TOKEN_USER_CACHE_TTL', 30))
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    """
+    `Authorization: Bearer <access token>` from /api/users/login/.
+    
+    The signature and expiry are checked in-process and the user comes from
+    `user_cache`, so an authenticated request costs no session or user query.
+    """
+    keyword = 'Bearer'
+    
+    def authenticate(self, request):
+        header = authentication.get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(header) != 2:
+            raise exceptions.AuthenticationFailed('Invalid Authorization header.')
+    
+        try:
+            user_id = verify_access_token(header[1].decode())
+        except (TokenError, UnicodeDecodeError) as e:
+            raise exceptions.AuthenticationFailed(str(e))
+    
+        user = user_cache.get(user_id)
+        if user is None:
+            raise exceptions.AuthenticationFailed('User not found or inactive.')
+        return user, None
+    
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,25 @@
+from django.contrib.auth.backends import ModelBackend
+from django.db.models.functions import Lower
+
+from .models import User
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate with email and password.
+    
+    The lookup goes through the lower(email) expression index
+    (user_email_lower_idx), so it is case-insensitive and never scans.
+    """
+    
+    def authenticate(self, request, username=None, password=None, email=None, **kwargs):
+        email = email or username
+        if not email or password is None or '@' not in email:
+            return None
+        candidates = User.objects.alias(email_lower=Lower('email')).filter(email_lower=email.strip().lower()).order_by('pk')
+        for user in candidates:
+            if user.check_password(password) and self.user_can_authenticate(user):
+                return user
+        if not candidates:
+            # Run the hasher anyway so response time doesn't reveal unknown emails
+            User().set_password(password)
+        return None
@@ -1,12 +1,19 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from media_uploads import derivatives
 from .models import User
 
 class UserSerializer(serializers.ModelSerializer):
+    profile_image_variants = serializers.SerializerMethodField()
+    
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'role', 'phone', 'profile_image', 'created_at']
+        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'role', 'phone', 'profile_image',
+                 'profile_image_variants', 'created_at']
         read_only_fields = ['id', 'created_at']
+    
+    def get_profile_image_variants(self, obj):
+        return derivatives.variant_urls(obj.profile_image)
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -31,8 +38,11 @@ class LoginSerializer(serializers.Serializer):
         password = data.get('password')
         
         if email and password:
-            user = authenticate(username=email, password=password)
+            user = authenticate(self.context.get('request'), email=email, password=password)
             if not user:
                 raise serializers.ValidationError('Invalid credentials')
             data['user'] = user
-        return data
\ No newline at end of file
+        return data
+
+class TokenRefreshSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
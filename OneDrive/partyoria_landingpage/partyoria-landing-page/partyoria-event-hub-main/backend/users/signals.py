@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from media_uploads import derivatives
+from .authentication import user_cache
+from .models import User
+
+@receiver(post_save, sender=User)
+def render_profile_image_derivatives(sender, instance, **kwargs):
+    derivatives.schedule_on_commit(instance.profile_image)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    user_cache.evict(instance.pk)
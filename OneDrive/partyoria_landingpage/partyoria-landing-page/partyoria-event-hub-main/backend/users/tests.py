@@ -0,0 +1,52 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .authentication import user_cache
+from .models import User
+
+class TokenAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='asha', email='Asha@Example.com', password='secret123')
+    
+    def login(self, email='asha@example.com', password='secret123'):
+        return self.client.post('/api/users/login/', {'email': email, 'password': password}, format='json')
+    
+    def test_login_by_email_is_case_insensitive(self):
+        response = self.login('ASHA@example.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['id'], self.user.pk)
+        self.assertNotIn('sessionid', response.cookies)
+        self.assertEqual(self.login(password='wrong').status_code, 400)
+    
+    def test_access_token_skips_session_and_user_queries(self):
+        access = self.login().json()['tokens']['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        
+        # First request loads the user into the cache
+        self.assertEqual(self.client.get(f'/api/users/{self.user.pk}/').status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/users/{self.user.pk}/')
+        self.assertEqual(response.wsgi_request.user, self.user)
+    
+    def test_invalid_and_expired_tokens_are_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(self.client.get('/api/users/').status_code, 401)
+        
+        self.client.credentials()
+        access = self.login().json()['tokens']['access']
+        with override_settings(ACCESS_TOKEN_TTL=-1):
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+            self.assertEqual(self.client.get('/api/users/').status_code, 401)
+    
+    def test_refresh_rotates_tokens_until_password_changes(self):
+        refresh = self.login().json()['tokens']['refresh']
+        response = self.client.post('/api/users/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json()['tokens'])
+        
+        self.user.set_password('new-secret-456')
+        self.user.save()
+        response = self.client.post('/api/users/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
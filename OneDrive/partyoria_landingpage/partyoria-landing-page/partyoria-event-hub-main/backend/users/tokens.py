@@ -0,0 +1,55 @@
+"""
+Signed access and refresh tokens.
+
+Tokens are `django.core.signing` payloads (HMAC-SHA256 with SECRET_KEY and a
+per-type salt) carrying the user id and a timestamp. Access tokens are
+short-lived and verified without touching the database. Refresh tokens live
+longer, are checked against the user row when redeemed, and embed a
+fingerprint of the password hash so changing the password revokes them.
+"""
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+ACCESS_SALT = 'users.tokens.access'
+REFRESH_SALT = 'users.tokens.refresh'
+
+class TokenError(Exception):
+    pass
+
+def access_token_ttl():
+    return getattr(settings, 'ACCESS_TOKEN_TTL', 15 * 60)
+
+def refresh_token_ttl():
+    return getattr(settings, 'REFRESH_TOKEN_TTL', 14 * 24 * 60 * 60)
+
+def password_fingerprint(user):
+    return salted_hmac(REFRESH_SALT, user.password, algorithm='sha256').hexdigest()[:16]
+
+def issue_tokens(user):
+    return {
+        'access': signing.dumps({'uid': user.pk}, salt=ACCESS_SALT),
+        'refresh': signing.dumps({'uid': user.pk, 'pwd': password_fingerprint(user)}, salt=REFRESH_SALT),
+        'token_type': 'Bearer',
+        'expires_in': access_token_ttl(),
+    }
+
+def load(token, salt, max_age):
+    try:
+        return signing.loads(token, salt=salt, max_age=max_age)
+    except signing.SignatureExpired:
+        raise TokenError('Token has expired.')
+    except signing.BadSignature:
+        raise TokenError('Invalid token.')
+
+def verify_access_token(token):
+    """Return the user id an access token was issued for"""
+    return load(token, ACCESS_SALT, access_token_ttl())['uid']
+
+def redeem_refresh_token(token, users):
+    """Return the active user a refresh token belongs to, checked against `users` (a queryset)"""
+    payload = load(token, REFRESH_SALT, refresh_token_ttl())
+    user = users.filter(pk=payload['uid'], is_active=True).first()
+    if user is None or not constant_time_compare(payload.get('pwd', ''), password_fingerprint(user)):
+        raise TokenError('Invalid token.')
+    return user
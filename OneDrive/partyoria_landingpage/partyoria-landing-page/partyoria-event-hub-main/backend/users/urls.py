@@ -6,4 +6,5 @@ urlpatterns = [
     path('<int:pk>/', views.UserDetailView.as_view(), name='user-detail'),
     path('register/', views.register_user, name='user-register'),
     path('login/', views.login_user, name='user-login'),
+    path('token/refresh/', views.refresh_token, name='token-refresh'),
 ]
\ No newline at end of file
@@ -1,9 +1,9 @@
 from rest_framework import status, generics
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from django.contrib.auth import login
 from .models import User
-from .serializers import UserSerializer, UserRegistrationSerializer, LoginSerializer
+from .serializers import UserSerializer, UserRegistrationSerializer, LoginSerializer, TokenRefreshSerializer
+from .tokens import TokenError, issue_tokens, redeem_refresh_token
 
 class UserListCreateView(generics.ListCreateAPIView):
     queryset = User.objects.all()
@@ -26,12 +26,23 @@ def register_user(request):
 
 @api_view(['POST'])
 def login_user(request):
-    serializer = LoginSerializer(data=request.data)
+    serializer = LoginSerializer(data=request.data, context={'request': request})
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        login(request, user)
         return Response({
             'user': UserSerializer(user).data,
+            'tokens': issue_tokens(user),
             'message': 'Login successful'
         }, status=status.HTTP_200_OK)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['POST'])
+def refresh_token(request):
+    """Exchange a refresh token for a new access/refresh token pair"""
+    serializer = TokenRefreshSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        user = redeem_refresh_token(serializer.validated_data['refresh'], User.objects.all())
+    except TokenError as e:
+        return Response({'error': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+    return Response({'tokens': issue_tokens(user)})
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""Async version of the venue details list, served under ASGI (see partyoria_backend.async_api)"""
+from asgiref.sync import sync_to_async
+
+from locations.catalog import alocation_ids_for_city
+from partyoria_backend.async_api import async_api_view
+from partyoria_backend.pagination import KeysetCursorPagination
+from .models import VenueDetails
+from .serializers import VenueDetailsSerializer
+from .views import filter_venue_details, venue_details_ordering
+
+@async_api_view(tags=['venue-details', 'location'])
+async def venue_details_list(request):
+    location_ids = await alocation_ids_for_city(request.query_params.get('city'))
+    queryset = filter_venue_details(request, VenueDetails.objects.all(), location_ids)
+    
+    paginator = KeysetCursorPagination()
+    ordering = venue_details_ordering(request)
+    if ordering:
+        paginator.ordering = ordering
+    # DRF pagination is synchronous: fetch the page in one trip to the ORM thread
+    page = await sync_to_async(paginator.paginate_queryset)(queryset, request)
+    return paginator.get_paginated_response(VenueDetailsSerializer(page, many=True).data).data
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from venues.search import rebuild_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the venue search index from events.Venue and VenueDetails'
+
+    def handle(self, *args, **options):
+        total = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} venues'))
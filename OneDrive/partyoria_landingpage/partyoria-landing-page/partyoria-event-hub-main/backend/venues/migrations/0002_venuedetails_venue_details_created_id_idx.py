@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venuedetails',
+            index=models.Index(fields=['-created_at', '-id'], name='venue_details_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0002_venuedetails_venue_details_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueSearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('venue', 'Venue'), ('venue_details', 'Venue details')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('name', models.TextField()),
+                ('location', models.TextField(blank=True)),
+                ('venue_type', models.TextField(blank=True)),
+                ('description', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': 'venue_search',
+                'unique_together': {('source', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,101 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE venue_search ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(venue_type, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX venue_search_vector_idx ON venue_search USING GIN (search_vector)",
+    "CREATE INDEX venue_search_name_trgm_idx ON venue_search USING GIN (name gin_trgm_ops)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS venue_search_name_trgm_idx",
+    "DROP INDEX IF EXISTS venue_search_vector_idx",
+    "ALTER TABLE venue_search DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE venue_search_fts USING fts5(
+        name, location, venue_type, description,
+        content='venue_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER venue_search_ai AFTER INSERT ON venue_search BEGIN
+        INSERT INTO venue_search_fts(rowid, name, location, venue_type, description)
+        VALUES (new.id, new.name, new.location, new.venue_type, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER venue_search_ad AFTER DELETE ON venue_search BEGIN
+        INSERT INTO venue_search_fts(venue_search_fts, rowid, name, location, venue_type, description)
+        VALUES ('delete', old.id, old.name, old.location, old.venue_type, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER venue_search_au AFTER UPDATE ON venue_search BEGIN
+        INSERT INTO venue_search_fts(venue_search_fts, rowid, name, location, venue_type, description)
+        VALUES ('delete', old.id, old.name, old.location, old.venue_type, old.description);
+        INSERT INTO venue_search_fts(rowid, name, location, venue_type, description)
+        VALUES (new.id, new.name, new.location, new.venue_type, new.description);
+    END
+    """,
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS venue_search_au",
+    "DROP TRIGGER IF EXISTS venue_search_ad",
+    "DROP TRIGGER IF EXISTS venue_search_ai",
+    "DROP TABLE IF EXISTS venue_search_fts",
+]
+
+def run_for_vendor(postgres, sqlite):
+    def run(apps, schema_editor):
+        statements = {'postgresql': postgres, 'sqlite': sqlite}.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+def populate_search_entries(apps, schema_editor):
+    Venue = apps.get_model('events', 'Venue')
+    VenueDetails = apps.get_model('venues', 'VenueDetails')
+    VenueSearchEntry = apps.get_model('venues', 'VenueSearchEntry')
+    
+    entries = [
+        VenueSearchEntry(
+            source='venue', object_id=venue.pk, name=venue.name,
+            location=f'{venue.location}, {venue.city}', venue_type=venue.type,
+            description=' '.join([*venue.suitability, *venue.badges]),
+        )
+        for venue in Venue.objects.all()
+    ] + [
+        VenueSearchEntry(
+            source='venue_details', object_id=details.pk, name=details.venue_name,
+            location=details.location, venue_type='', description=details.description,
+        )
+        for details in VenueDetails.objects.all()
+    ]
+    VenueSearchEntry.objects.bulk_create(entries, batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_event_created_id_idx_and_more'),
+        ('venues', '0003_venuesearchentry'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRES_REVERSE, SQLITE_REVERSE),
+        ),
+        migrations.RunPython(populate_search_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def link_venue_details_locations(apps, schema_editor):
+    Location = apps.get_model('locations', 'Location')
+    VenueDetails = apps.get_model('venues', 'VenueDetails')
+    
+    location_ids = {}
+    for location_id, city in Location.objects.order_by('state', 'city').values_list('id', 'city'):
+        location_ids.setdefault(city.lower(), location_id)
+    
+    for details in VenueDetails.objects.only('id', 'location'):
+        # Free-text locations such as 'Bandra West, Mumbai' name the city in one of their parts
+        for part in reversed(details.location.split(',')):
+            location_id = location_ids.get(part.strip().lower())
+            if location_id:
+                VenueDetails.objects.filter(pk=details.pk).update(city_location_id=location_id)
+                break
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_citypopularity'),
+        ('venues', '0004_venue_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venuedetails',
+            name='city_location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='venue_details', to='locations.location'),
+        ),
+        migrations.RunPython(link_venue_details_locations, migrations.RunPython.noop),
+    ]
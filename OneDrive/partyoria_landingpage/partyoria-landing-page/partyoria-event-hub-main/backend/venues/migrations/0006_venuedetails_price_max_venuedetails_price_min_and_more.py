@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0005_venuedetails_city_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venuedetails',
+            name='price_max',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='venuedetails',
+            name='price_min',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='venuedetails',
+            index=models.Index(fields=['price_min', 'price_max'], name='venue_details_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venuedetails',
+            index=models.Index(fields=['city_location', 'price_min'], name='venue_details_city_price_idx'),
+        ),
+    ]
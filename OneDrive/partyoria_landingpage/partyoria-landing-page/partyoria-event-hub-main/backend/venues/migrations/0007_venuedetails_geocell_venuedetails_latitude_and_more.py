@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0006_venuedetails_price_max_venuedetails_price_min_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venuedetails',
+            name='geocell',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='venuedetails',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='venuedetails',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -1,16 +1,65 @@
 from django.db import models
+from partyoria_backend import geo
+from partyoria_backend.pricing import parse_price_range
 
 class VenueDetails(models.Model):
     venue_name = models.TextField()
     location = models.TextField()
     capacity = models.IntegerField()
     price_range = models.TextField()
+    price_min = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    price_max = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geocell = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     image_url = models.TextField()
     description = models.TextField()
+    city_location = models.ForeignKey(
+        'locations.Location', on_delete=models.SET_NULL, null=True, blank=True, related_name='venue_details'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         db_table = 'venue_details'
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='venue_details_created_id_idx'),
+            models.Index(fields=['price_min', 'price_max'], name='venue_details_price_idx'),
+            models.Index(fields=['city_location', 'price_min'], name='venue_details_city_price_idx'),
+        ]
     
     def __str__(self):
-        return self.venue_name
\ No newline at end of file
+        return self.venue_name
+    
+    def save(self, *args, **kwargs):
+        from locations.catalog import resolve_location_text
+        self.city_location_id = resolve_location_text(self.location)
+        self.price_min, self.price_max = parse_price_range(self.price_range)
+        self.geocell = geo.cell_for(self.latitude, self.longitude)
+        super().save(*args, **kwargs)
+
+class VenueSearchEntry(models.Model):
+    """
+    Denormalized search document for an `events.Venue` or `VenueDetails` row.
+    
+    The full-text index over this table is backend specific and created in
+    migrations: a generated tsvector column with GIN and trigram indexes on
+    PostgreSQL, an FTS5 external-content table on SQLite.
+    """
+    SOURCE_CHOICES = [
+        ('venue', 'Venue'),
+        ('venue_details', 'Venue details'),
+    ]
+    
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    object_id = models.BigIntegerField()
+    name = models.TextField()
+    location = models.TextField(blank=True)
+    venue_type = models.TextField(blank=True)
+    description = models.TextField(blank=True)
+    
+    class Meta:
+        db_table = 'venue_search'
+        unique_together = ['source', 'object_id']
+    
+    def __str__(self):
+        return self.name
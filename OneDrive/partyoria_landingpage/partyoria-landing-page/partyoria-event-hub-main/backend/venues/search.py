@@ -0,0 +1,179 @@
+"""
+Venue search over `events.Venue` and `VenueDetails`.
+
+Both sources are denormalized into `VenueSearchEntry` rows, kept in sync by
+signals, and queried through a backend picked from the database vendor:
+PostgreSQL uses the weighted tsvector column with a trigram fallback for
+misspelled names, SQLite uses the FTS5 table, and anything else falls back
+to substring matching.
+"""
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import VenueDetails, VenueSearchEntry
+
+MAX_TERMS = 8
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+def venue_entry_fields(venue):
+    return {
+        'name': venue.name,
+        'location': f'{venue.location}, {venue.city}',
+        'venue_type': venue.type,
+        'description': ' '.join([*venue.suitability, *venue.badges]),
+    }
+
+def venue_details_entry_fields(details):
+    return {
+        'name': details.venue_name,
+        'location': details.location,
+        'venue_type': '',
+        'description': details.description,
+    }
+
+def index_object(source, instance):
+    fields = venue_entry_fields(instance) if source == 'venue' else venue_details_entry_fields(instance)
+    VenueSearchEntry.objects.update_or_create(source=source, object_id=instance.pk, defaults=fields)
+
+def unindex_object(source, pk):
+    VenueSearchEntry.objects.filter(source=source, object_id=pk).delete()
+
+def rebuild_index(batch_size=1000):
+    """
+    Recreate every search entry from the source tables; returns the number of entries.
+    
+    Runs in one transaction, so searches keep seeing the old index until the
+    new one is complete and a failure part-way leaves the old index in place.
+    """
+    from events.models import Venue
+    
+    total = 0
+    with transaction.atomic():
+        VenueSearchEntry.objects.all().delete()
+        for source, queryset, entry_fields in [
+            ('venue', Venue.objects.all(), venue_entry_fields),
+            ('venue_details', VenueDetails.objects.all(), venue_details_entry_fields),
+        ]:
+            batch = []
+            for instance in queryset.iterator(chunk_size=batch_size):
+                batch.append(VenueSearchEntry(source=source, object_id=instance.pk, **entry_fields(instance)))
+                if len(batch) >= batch_size:
+                    VenueSearchEntry.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            VenueSearchEntry.objects.bulk_create(batch)
+            total += len(batch)
+    return total
+
+def tokenize(query):
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+class SearchBackend:
+    """Substring matching for databases without a full-text index"""
+    
+    def search(self, terms, limit, prefix_all):
+        queryset = VenueSearchEntry.objects.all()
+        for term in terms:
+            queryset = queryset.filter(Q(name__icontains=term) | Q(location__icontains=term))
+        return [self.result(entry, None, None) for entry in queryset[:limit]]
+    
+    def result(self, entry, rank, snippet):
+        return {
+            'source': entry.source,
+            'id': entry.object_id,
+            'name': entry.name,
+            'location': entry.location,
+            'type': entry.venue_type,
+            'rank': rank,
+            'snippet': snippet,
+        }
+    
+    def fetch(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+class PostgresSearchBackend(SearchBackend):
+    SEARCH_SQL = f"""
+        SELECT s.id, s.source, s.object_id, s.name, s.location, s.venue_type, m.rank,
+               ts_headline('simple', s.name || ' ' || s.location || ' ' || s.description, m.query,
+                           'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=20, MinWords=8')
+        FROM (
+            SELECT id, query, ts_rank_cd(search_vector, query) AS rank
+            FROM venue_search, to_tsquery('simple', %s) AS query
+            WHERE search_vector @@ query
+            ORDER BY rank DESC, id
+            LIMIT %s
+        ) AS m
+        JOIN venue_search s ON s.id = m.id
+        ORDER BY m.rank DESC, s.id
+    """
+    
+    TRIGRAM_SQL = """
+        SELECT id, source, object_id, name, location, venue_type, similarity(name, %s) AS rank, NULL
+        FROM venue_search
+        WHERE name %% %s
+        ORDER BY rank DESC, id
+        LIMIT %s
+    """
+    
+    def search(self, terms, limit, prefix_all):
+        parts = [f'{term}:*' if prefix_all or i == len(terms) - 1 else term for i, term in enumerate(terms)]
+        rows = self.fetch(self.SEARCH_SQL, [' & '.join(parts), limit])
+        if not rows:
+            # Nothing matched the lexemes; fall back to fuzzy name matching for typos
+            text = ' '.join(terms)
+            rows = self.fetch(self.TRIGRAM_SQL, [text, text, limit])
+        return [self.row_result(row) for row in rows]
+    
+    def row_result(self, row):
+        _, source, object_id, name, location, venue_type, rank, snippet = row
+        return {
+            'source': source,
+            'id': object_id,
+            'name': name,
+            'location': location,
+            'type': venue_type,
+            'rank': float(rank),
+            'snippet': snippet,
+        }
+
+class SQLiteSearchBackend(PostgresSearchBackend):
+    # bm25() weights follow the column order: name, location, venue_type, description
+    SEARCH_SQL = f"""
+        SELECT s.id, s.source, s.object_id, s.name, s.location, s.venue_type,
+               -bm25(venue_search_fts, 10.0, 4.0, 4.0, 1.0) AS rank,
+               snippet(venue_search_fts, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', 12)
+        FROM venue_search_fts
+        JOIN venue_search s ON s.id = venue_search_fts.rowid
+        WHERE venue_search_fts MATCH %s
+        ORDER BY bm25(venue_search_fts, 10.0, 4.0, 4.0, 1.0), s.id
+        LIMIT %s
+    """
+    
+    def search(self, terms, limit, prefix_all):
+        parts = [f'"{term}"*' if prefix_all or i == len(terms) - 1 else f'"{term}"' for i, term in enumerate(terms)]
+        return [self.row_result(row) for row in self.fetch(self.SEARCH_SQL, [' '.join(parts), limit])]
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    if connection.vendor == 'sqlite':
+        return SQLiteSearchBackend()
+    return SearchBackend()
+
+def search_venues(query, limit=20, typeahead=False):
+    """
+    Ranked venues matching `query`, best first.
+    
+    Every term must match; the last term matches as a prefix, and with
+    `typeahead` every term does. Results carry a highlighted snippet
+    except for typo-tolerant trigram matches.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return []
+    return get_backend().search(terms, limit, prefix_all=typeahead)
@@ -4,4 +4,5 @@ from .models import VenueDetails
 class VenueDetailsSerializer(serializers.ModelSerializer):
     class Meta:
         model = VenueDetails
-        fields = ['id', 'venue_name', 'location', 'capacity', 'price_range', 'image_url', 'description', 'created_at']
\ No newline at end of file
+        fields = ['id', 'venue_name', 'location', 'capacity', 'price_range', 'price_min', 'price_max',
+                  'latitude', 'longitude', 'image_url', 'description', 'created_at']
\ No newline at end of file
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from events.models import Venue
+from partyoria_backend.response_cache import invalidate_tags_on_commit
+from .models import VenueDetails
+from .search import index_object, unindex_object
+
+SEARCH_SOURCES = {Venue: 'venue', VenueDetails: 'venue_details'}
+
+@receiver(post_save, sender=Venue)
+@receiver(post_save, sender=VenueDetails)
+def index_venue(sender, instance, **kwargs):
+    index_object(SEARCH_SOURCES[sender], instance)
+
+@receiver(post_delete, sender=Venue)
+@receiver(post_delete, sender=VenueDetails)
+def unindex_venue(sender, instance, **kwargs):
+    unindex_object(SEARCH_SOURCES[sender], instance.pk)
+
+@receiver(post_save, sender=VenueDetails)
+@receiver(post_delete, sender=VenueDetails)
+def invalidate_venue_details_responses(sender, **kwargs):
+    invalidate_tags_on_commit('venue-details')
@@ -1,3 +1,109 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from events.models import Venue
+from partyoria_backend.db_router import ReplicaRoutingMiddleware, replica_health
+from .models import VenueDetails, VenueSearchEntry
+from .search import rebuild_index
+
+class VenueSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Venue.objects.create(
+            name='Grand Ballroom Palace', type='Banquet Hall', location='Downtown', city='Mumbai',
+            price='₹50,000 - ₹80,000', image='https://example.com/a.jpg', suitability=['Weddings'], badges=['Premium'],
+        )
+        Venue.objects.create(
+            name='Sunset Garden Resort', type='Garden Venue', location='Bandra West', city='Mumbai',
+            price='₹30,000 - ₹60,000', image='https://example.com/b.jpg', suitability=['Birthday Parties'], badges=['Garden'],
+        )
+        VenueDetails.objects.create(
+            venue_name='Lakeside Pavilion', location='Kochi', capacity=300, price_range='₹40,000',
+            image_url='https://example.com/c.jpg', description='Open air garden pavilion by the lake',
+        )
+    
+    def test_search_ranks_and_highlights(self):
+        response = self.client.get('/api/venue-search/?q=garden')
+        results = response.json()['results']
+        self.assertEqual([result['name'] for result in results], ['Sunset Garden Resort', 'Lakeside Pavilion'])
+        self.assertIn('<mark>', results[0]['snippet'])
+    
+    def test_typeahead_matches_prefixes(self):
+        response = self.client.get('/api/venue-search/suggest/?q=gra ball')
+        self.assertEqual([s['name'] for s in response.json()['suggestions']], ['Grand Ballroom Palace'])
+    
+    def test_index_follows_writes(self):
+        venue = Venue.objects.get(name='Grand Ballroom Palace')
+        venue.name = 'Royal Ballroom'
+        venue.save()
+        self.assertEqual(self.client.get('/api/venue-search/?q=grand').json()['results'], [])
+        
+        venue.delete()
+        self.assertFalse(VenueSearchEntry.objects.filter(source='venue', object_id=venue.pk).exists())
+        self.assertEqual(self.client.get('/api/venue-search/?q=royal').json()['results'], [])
+    
+    def test_failed_rebuild_keeps_the_index(self):
+        with mock.patch('venues.search.venue_details_entry_fields', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                rebuild_index()
+        self.assertEqual(VenueSearchEntry.objects.count(), 3)
+        self.assertEqual(rebuild_index(), 3)
+
+@override_settings(DATABASE_REPLICAS={'replica_a': 1, 'replica_b': 3})
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        replica_health.reset()
+        self.factory = RequestFactory()
+        self.seen = []
+        self.middleware = ReplicaRoutingMiddleware(self.record_read_database)
+    
+    def record_read_database(self, request):
+        self.seen.append(Venue.objects.all().db)
+        return HttpResponse()
+    
+    def healthy(self, *aliases):
+        return mock.patch('partyoria_backend.db_router.check_replica', side_effect=lambda alias: alias in aliases)
+    
+    def test_browsing_reads_are_spread_by_weight(self):
+        with self.healthy('replica_a', 'replica_b'):
+            for _ in range(400):
+                self.middleware(self.factory.get('/api/venues/'))
+        self.assertEqual(set(self.seen), {'replica_a', 'replica_b'})
+        self.assertGreater(self.seen.count('replica_b'), self.seen.count('replica_a'))
+    
+    def test_other_paths_and_writes_use_the_primary(self):
+        with self.healthy('replica_a', 'replica_b'):
+            self.middleware(self.factory.get('/api/users/'))
+            # Organizers read back their own events, so events stay on the primary
+            self.middleware(self.factory.get('/api/events/'))
+            self.middleware(self.factory.post('/api/venues/'))
+        self.assertEqual(self.seen, ['default', 'default', 'default'])
+    
+    def test_writer_is_pinned_to_the_primary(self):
+        with self.healthy('replica_a', 'replica_b'):
+            response = self.middleware(self.factory.post('/api/venues/', HTTP_AUTHORIZATION='Bearer abc'))
+            self.assertIn('pin_primary', response.cookies)
+            
+            self.middleware(self.factory.get('/api/venues/', HTTP_AUTHORIZATION='Bearer abc'))
+            browser = self.factory.get('/api/venues/')
+            browser.COOKIES['pin_primary'] = '1'
+            self.middleware(browser)
+            self.middleware(self.factory.get('/api/venues/', HTTP_AUTHORIZATION='Bearer other'))
+        self.assertEqual(self.seen[1:3], ['default', 'default'])
+        self.assertIn(self.seen[3], ('replica_a', 'replica_b'))
+    
+    def test_unhealthy_replica_is_skipped(self):
+        with self.healthy('replica_a'):
+            for _ in range(20):
+                self.middleware(self.factory.get('/api/locations/'))
+        self.assertEqual(set(self.seen), {'replica_a'})
+        
+        with self.healthy():
+            self.middleware(self.factory.get('/api/locations/'))
+        self.assertEqual(self.seen[-1], 'default')
@@ -1,6 +1,9 @@
 from django.urls import path
-from .views import VenueListView
+from .views import VenueListView, venue_details_nearby, venue_search, venue_suggest
 
 urlpatterns = [
     path('api/venue-details/', VenueListView.as_view(), name='venue-details-list'),
+    path('api/venue-details/nearby/', venue_details_nearby, name='venue-details-nearby'),
+    path('api/venue-search/', venue_search, name='venue-search'),
+    path('api/venue-search/suggest/', venue_suggest, name='venue-suggest'),
 ]
\ No newline at end of file
@@ -1,15 +1,86 @@
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from django.db.models import Q
+from locations.catalog import location_ids_for_city
+from partyoria_backend import geo
+from partyoria_backend.pricing import budget_filter
+from partyoria_backend.response_cache import CachedResponseMixin
 from .models import VenueDetails
+from .search import search_venues
 from .serializers import VenueDetailsSerializer
 
-class VenueListView(generics.ListAPIView):
+def venue_details_ordering(request):
+    sort = request.query_params.get('sort')
+    if not sort:
+        return None
+    if sort != 'price':
+        raise ValidationError({'sort': 'Must be: price.'})
+    return ('price_min', 'id')
+
+def filter_venue_details(request, queryset, location_ids):
+    """Apply ?budget_min=/?budget_max=, ?sort=price and ?city= (whose Location ids are `location_ids`)"""
+    condition = budget_filter(request.query_params)
+    if condition is not None:
+        queryset = queryset.filter(condition)
+    if venue_details_ordering(request):
+        queryset = queryset.filter(price_min__isnull=False)
+    city = request.query_params.get('city', None)
+    if city:
+        if location_ids:
+            # Rows whose free-text location did not resolve to a catalog city still match by text
+            queryset = queryset.filter(
+                Q(city_location_id__in=location_ids) | Q(city_location__isnull=True, location__icontains=city)
+            )
+        else:
+            queryset = queryset.filter(location__icontains=city)
+    return queryset
+
+class VenueListView(CachedResponseMixin, generics.ListAPIView):
+    """Venue details, filterable by ?city=, ?budget_min=/?budget_max= and sortable by ?sort=price"""
     serializer_class = VenueDetailsSerializer
+    cache_tags = ['venue-details', 'location']
+    
+    def get_cursor_ordering(self):
+        return venue_details_ordering(self.request)
     
     def get_queryset(self):
-        queryset = VenueDetails.objects.all()
-        city = self.request.query_params.get('city', None)
-        if city:
-            queryset = queryset.filter(location__icontains=city)
-        return queryset
+        location_ids = location_ids_for_city(self.request.query_params.get('city'))
+        return filter_venue_details(self.request, VenueDetails.objects.all(), location_ids)
+
+@api_view(['GET'])
+def venue_details_nearby(request):
+    """Venue details within ?radius_km= (default 10) of ?lat=&lng=, nearest first"""
+    results = []
+    for distance, details in geo.nearby(VenueDetails.objects.all(), request.query_params):
+        data = VenueDetailsSerializer(details).data
+        data['distance_km'] = distance
+        results.append(data)
+    return Response({'results': results})
+
+def search_limit(request, default, maximum):
+    try:
+        return min(max(int(request.query_params.get('limit', default)), 1), maximum)
+    except ValueError:
+        return default
+
+@api_view(['GET'])
+def venue_search(request):
+    """Ranked full-text search over venues with highlighted snippets"""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'results': search_venues(query, limit=search_limit(request, 20, 100))})
+
+@api_view(['GET'])
+def venue_suggest(request):
+    """Prefix typeahead suggestions for the venue search box"""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'suggestions': []})
+    results = search_venues(query, limit=search_limit(request, 8, 20), typeahead=True)
+    return Response({'suggestions': [
+        {'source': result['source'], 'id': result['id'], 'name': result['name'], 'location': result['location']}
+        for result in results
+    ]})
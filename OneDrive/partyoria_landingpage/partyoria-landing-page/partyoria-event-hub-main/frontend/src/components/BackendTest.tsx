@@ -27,7 +27,7 @@ export const BackendTest = () => {
       if (response.ok) {
         setMessage('✅ Backend connection successful!');
         const data = await response.json();
-        setEvents(data);
+        setEvents(data.results);
       } else {
         setMessage('❌ Backend connection failed');
       }
@@ -60,6 +60,37 @@ export interface ApiVenueDetails {
   created_at: string;
 }
 
+export interface ApiTokens {
+  access: string;
+  refresh: string;
+  token_type: 'Bearer';
+  expires_in: number;
+}
+
+const TOKENS_KEY = 'partyoria_tokens';
+
+function loadTokens(): ApiTokens | null {
+  try {
+    return JSON.parse(localStorage.getItem(TOKENS_KEY) || 'null');
+  } catch {
+    return null;
+  }
+}
+
+function saveTokens(tokens: ApiTokens | null) {
+  if (tokens) {
+    localStorage.setItem(TOKENS_KEY, JSON.stringify(tokens));
+  } else {
+    localStorage.removeItem(TOKENS_KEY);
+  }
+}
+
+export interface Paginated<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 export interface ApiMediaUpload {
   id: number;
   title: string;
@@ -75,25 +106,32 @@ export interface ApiMediaUpload {
 }
 
 class ApiService {
-  private async request(endpoint: string, options: RequestInit = {}) {
+  private async request(endpoint: string, options: RequestInit = {}, retried = false): Promise<any> {
     // Check backend availability first
     if (!backendAvailable) {
       throw new Error('Backend not available');
     }
 
     const url = `${API_BASE_URL}${endpoint}`;
+    const tokens = loadTokens();
     const config = {
+      ...options,
       headers: {
         'Content-Type': 'application/json',
+        ...(tokens ? { Authorization: `Bearer ${tokens.access}` } : {}),
         ...options.headers,
       },
       signal: AbortSignal.timeout(10000), // 10 second timeout
-      ...options,
     };
 
     try {
       const response = await fetch(url, config);
       
+      // Access tokens are short-lived; swap the refresh token for a new pair once
+      if (response.status === 401 && tokens && !retried && await this.refreshTokens(tokens.refresh)) {
+        return this.request(endpoint, options, true);
+      }
+      
       if (!response.ok) {
         throw new Error(`API Error: ${response.status}`);
       }
@@ -108,6 +146,24 @@ class ApiService {
     }
   }
 
+  private async refreshTokens(refresh: string): Promise<boolean> {
+    const response = await fetch(`${API_BASE_URL}/users/token/refresh/`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh }),
+    });
+    if (!response.ok) {
+      saveTokens(null);
+      return false;
+    }
+    saveTokens((await response.json()).tokens);
+    return true;
+  }
+
+  logout() {
+    saveTokens(null);
+  }
+
   // User endpoints
   async registerUser(userData: any): Promise<{ user: ApiUser; message: string }> {
     return this.request('/users/register/', {
@@ -116,15 +172,18 @@ class ApiService {
     });
   }
 
-  async loginUser(credentials: { email: string; password: string }): Promise<{ user: ApiUser; message: string }> {
-    return this.request('/users/login/', {
+  async loginUser(credentials: { email: string; password: string }): Promise<{ user: ApiUser; tokens: ApiTokens; message: string }> {
+    const response = await this.request('/users/login/', {
       method: 'POST',
       body: JSON.stringify(credentials),
     });
+    saveTokens(response.tokens);
+    return response;
   }
 
   async getUsers(): Promise<ApiUser[]> {
-    return this.request('/users/');
+    const page: Paginated<ApiUser> = await this.request('/users/');
+    return page.results;
   }
 
   async getUser(userId: number): Promise<ApiUser> {
@@ -140,7 +199,8 @@ class ApiService {
   }
 
   async getEvents(): Promise<ApiEvent[]> {
-    return this.request('/events/');
+    const page: Paginated<ApiEvent> = await this.request('/events/');
+    return page.results;
   }
 
   async getEvent(eventId: number): Promise<ApiEvent> {
@@ -167,7 +227,8 @@ class ApiService {
   // Venue endpoints
   async getVenues(city?: string): Promise<ApiVenue[]> {
     const endpoint = city ? `/events/venues/?city=${encodeURIComponent(city)}` : '/events/venues/';
-    return this.request(endpoint);
+    const page: Paginated<ApiVenue> = await this.request(endpoint);
+    return page.results;
   }
 
   async getVenue(venueId: number): Promise<ApiVenue> {
@@ -177,7 +238,8 @@ class ApiService {
   // Venue Details endpoints
   async getVenueDetails(city?: string): Promise<ApiVenueDetails[]> {
     const endpoint = city ? `/venue-details/?city=${encodeURIComponent(city)}` : '/venue-details/';
-    return this.request(endpoint);
+    const page: Paginated<ApiVenueDetails> = await this.request(endpoint);
+    return page.results;
   }
 
   // Location endpoints
@@ -220,7 +282,8 @@ class ApiService {
   }
 
   async getMediaUploads(): Promise<ApiMediaUpload[]> {
-    return this.request('/media/');
+    const page: Paginated<ApiMediaUpload> = await this.request('/media/');
+    return page.results;
   }
 
   async getMediaUpload(mediaId: number): Promise<ApiMediaUpload> {